@@ -19,8 +19,10 @@ import uuid
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+import config
 from game_simulator.game_state import GameState
 from game_simulator.entities.summit_battle import SummitBattle
+from game_simulator.simulation.outcome_table import NPC_LEVELS
 
 app = Flask(__name__)
 CORS(app)
@@ -38,7 +40,8 @@ battle_subscriptions: Dict[str, List[str]] = {}  # session_id -> battle_ids
 def init_game():
     """Initialize a new game instance"""
     global game_state
-    game_state = GameState()
+    game_state = GameState(battle_backend=config.BATTLE_BACKEND, deferred_battles=config.DEFERRED_BATTLES,
+                           precompute_npc_outcomes=config.PRECOMPUTE_NPC_OUTCOMES)
     return game_state
 
 def game_loop():
@@ -177,32 +180,22 @@ def get_alliance_state(alliance_id: int):
     # Get controlled strongholds
     controlled_strongholds = []
     for stronghold_id in alliance.controlled_strongholds:
-        stronghold = game_state.get_stronghold(stronghold_id)
-        if stronghold:
+        if stronghold_id in game_state.strongholds:
+            # Summaries are cached until the stronghold changes
+            summary = game_state.get_stronghold_summary(stronghold_id)
             controlled_strongholds.append({
-                'id': stronghold.id,
-                'level': stronghold.level,
-                'position': {'x': stronghold.x, 'y': stronghold.y},
-                'is_protected': stronghold.is_protected,
-                'garrison_count': len(stronghold.garrisoned_hero_sets),
-                'max_garrison': stronghold.max_garrison_size
+                key: summary[key]
+                for key in ('id', 'level', 'position', 'is_protected', 'garrison_count', 'max_garrison')
             })
     
     # Get attackable targets
-    from game_simulator.map_layout import get_adjacent_strongholds
-    adjacent = get_adjacent_strongholds(game_state.strongholds, alliance.controlled_strongholds)
     attackable_targets = []
-    for stronghold_id in adjacent:
-        stronghold = game_state.get_stronghold(stronghold_id)
-        if stronghold and stronghold.can_be_attacked():
-            attackable_targets.append({
-                'id': stronghold.id,
-                'level': stronghold.level,
-                'controlling_alliance': stronghold.controlling_alliance,
-                'active_npcs': len(stronghold.get_active_npc_teams()),
-                'max_npcs': stronghold.max_npc_teams,
-                'garrison_count': len(stronghold.garrisoned_hero_sets)
-            })
+    for stronghold_id in game_state.get_attackable_strongholds(alliance_id):
+        summary = game_state.get_stronghold_summary(stronghold_id)
+        attackable_targets.append({
+            key: summary[key]
+            for key in ('id', 'level', 'controlling_alliance', 'active_npcs', 'max_npcs', 'garrison_count')
+        })
     
     return jsonify({
         'alliance_id': alliance_id,
@@ -224,12 +217,25 @@ def get_alliance_hero_sets(alliance_id: int):
         return jsonify({'error': 'Alliance not found'}), 404
     
     alliance = game_state.alliances[alliance_id]
-    available_sets = alliance.get_all_available_hero_sets()
+    top = request.args.get('top', type=int)
+    npc_level = request.args.get('npc_level', type=int)
+    if npc_level is not None and npc_level not in NPC_LEVELS:
+        return jsonify({'error': f'npc_level must be one of {list(NPC_LEVELS)}'}), 400
+    if npc_level is not None:
+        # Most likely to beat a full-HP NPC team of that level first
+        available_sets = game_state.rank_npc_attacks(alliance_id, npc_level)
+        if top is not None:
+            available_sets = available_sets[:max(top, 0)]
+    elif top is not None:
+        # Only the strongest sets, highest power rating first
+        available_sets = alliance.get_strongest_available_sets(max(top, 0))
+    else:
+        available_sets = alliance.get_all_available_hero_sets()
     
     hero_sets_data = []
     for hero_set in available_sets:
         living_heroes = hero_set.get_living_heroes()
-        hero_sets_data.append({
+        hero_set_data = {
             'id': hero_set.id,
             'owner_id': hero_set.owner_id,
             'living_heroes': len(living_heroes),
@@ -239,12 +245,16 @@ def get_alliance_hero_sets(alliance_id: int):
             'max_hp': hero_set.get_max_hp(),
             'can_attack': hero_set.can_attack(),
             'is_garrisoned': hero_set.is_garrisoned
-        })
+        }
+        if npc_level is not None:
+            hero_set_data['npc_outcome'] = game_state.npc_outcomes.lookup(hero_set, npc_level)
+        hero_sets_data.append(hero_set_data)
     
     return jsonify({
         'alliance_id': alliance_id,
         'available_hero_sets': hero_sets_data,
-        'total_count': len(hero_sets_data)
+        'total_count': len(hero_sets_data),
+        'available_count': alliance.get_available_hero_sets_count()
     })
 
 @app.route('/api/alliances/<int:alliance_id>/attack', methods=['POST'])
@@ -263,13 +273,8 @@ def launch_attack(alliance_id: int):
     alliance = game_state.alliances[alliance_id]
     
     # Find the hero set
-    attacking_set = None
-    for hero_set in alliance.get_all_available_hero_sets():
-        if hero_set.id == hero_set_id:
-            attacking_set = hero_set
-            break
-    
-    if not attacking_set:
+    attacking_set = alliance.get_hero_set(hero_set_id)
+    if not attacking_set or not attacking_set.can_attack():
         return jsonify({'error': 'Hero set not found or not available'}), 404
     
     # Validate target
@@ -281,9 +286,7 @@ def launch_attack(alliance_id: int):
         return jsonify({'error': 'Target stronghold cannot be attacked (protected or invalid)'}), 400
     
     # Check adjacency
-    from game_simulator.map_layout import get_adjacent_strongholds
-    adjacent = get_adjacent_strongholds(game_state.strongholds, alliance.controlled_strongholds)
-    if target_stronghold_id not in adjacent:
+    if target_stronghold_id not in game_state.get_frontier(alliance_id):
         return jsonify({'error': 'Target stronghold is not adjacent to your controlled territory'}), 400
     
     # Start the battle
@@ -317,7 +320,7 @@ def get_battles():
     
     battles_data = []
     for battle in game_state.active_battles:
-        status = battle.get_battle_status()
+        status = game_state.get_battle_status(battle)
         battles_data.append({
             'battle_id': battle.id,
             'stronghold': battle.stronghold_id,
@@ -341,11 +344,8 @@ def get_battle_details(battle_id: str):
     if not game_state:
         return jsonify({'error': 'No active game'}), 404
     
-    battle = None
-    for b in game_state.active_battles:
-        if b.id == battle_id:
-            battle = b
-            break
+    # Finished battles are replayed from their tapes
+    battle = game_state.get_battle(battle_id)
     
     if not battle:
         return jsonify({'error': 'Battle not found'}), 404
@@ -388,7 +388,7 @@ def get_strongholds():
             'is_alliance_home': stronghold.is_alliance_home,
             'is_protected': stronghold.is_protected,
             'can_be_attacked': stronghold.can_be_attacked(),
-            'active_npcs': len(stronghold.get_active_npc_teams()),
+            'active_npcs': stronghold.count_active_npc_teams(),
             'max_npcs': stronghold.max_npc_teams,
             'garrison_count': len(stronghold.garrisoned_hero_sets),
             'max_garrison': stronghold.max_garrison_size,
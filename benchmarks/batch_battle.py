@@ -0,0 +1,56 @@
+# benchmarks/batch_battle.py
+"""Time playing battles one at a time with simulate_to_completion() against simulate_battles().
+
+Both play fresh copies of the same taped matchups; the batch plays each
+matchup BATCH_COPIES times so its per-turn NumPy calls run over a batch the
+size of a planning cycle's. Run from the project root:
+
+    python benchmarks/batch_battle.py
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_simulator.entities.battle_log import LOG_FULL, LOG_NONE
+from game_simulator.simulation.backend_harness import matchup_tapes
+from game_simulator.simulation.batch_battle import simulate_battles
+
+MATCHUPS = 300
+BATCH_COPIES = 67  # About 20,000 battles
+REPEATS = 3
+
+
+def looped(tapes, log_level):
+    """Seconds per battle playing each tape with simulate_to_completion()"""
+    battles = [tape.new_battle(log_level) for tape in tapes]
+    start = time.perf_counter()
+    for battle in battles:
+        battle.simulate_to_completion()
+    return (time.perf_counter() - start) / len(battles)
+
+
+def batched(tapes, seed):
+    """Seconds per battle playing BATCH_COPIES of every tape with simulate_battles()"""
+    battles = [tape.new_battle(LOG_NONE) for tape in tapes] * BATCH_COPIES
+    attacking_sets = [battle.attacking_set for battle in battles]
+    defending_sets = [battle.defending_set for battle in battles]
+    start = time.perf_counter()
+    simulate_battles(attacking_sets, defending_sets, rng=seed)
+    return (time.perf_counter() - start) / len(battles)
+
+
+if __name__ == "__main__":
+    tapes = matchup_tapes(MATCHUPS, seed=1)
+    # Interleaved so drift in machine speed hits every path alike
+    times = {"no log": [], "full log": [], "batch": []}
+    for seed in range(REPEATS):
+        times["no log"].append(looped(tapes, LOG_NONE))
+        times["full log"].append(looped(tapes, LOG_FULL))
+        times["batch"].append(batched(tapes, seed))
+    best = {name: min(values) for name, values in times.items()}
+    print(f"simulate_to_completion, no log:   {1e6 * best['no log']:8.1f} us/battle")
+    print(f"simulate_to_completion, full log: {1e6 * best['full log']:8.1f} us/battle")
+    print(f"simulate_battles:                 {1e6 * best['batch']:8.1f} us/battle "
+          f"({best['no log'] / best['batch']:.0f}x, {best['full log'] / best['batch']:.0f}x)")
@@ -0,0 +1,90 @@
+# benchmarks/memory.py
+"""Measure the memory a played match keeps alive.
+
+Plays MATCHES seeded matches with random attacks, keeps them all, and
+reports the traced bytes per match and the bytes per instance of each
+entity class (the object plus its __dict__, when it has one), next to the
+figures measured before the entities were slotted. Run from the project
+root:
+
+    python benchmarks/memory.py
+"""
+import gc
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_simulator.entities.hero import Hero
+from game_simulator.entities.hero_set import HeroSet
+from game_simulator.entities.player import Player
+from game_simulator.entities.stronghold import Stronghold
+from game_simulator.entities.summit_battle import SummitBattle
+from game_simulator.game_state import GameState
+
+MATCHES = 3
+UPDATES = 400
+ENTITIES = (Hero, HeroSet, Player, Stronghold, SummitBattle)
+
+# Measured with instance dicts and formatted string ids, before __slots__
+BASELINE_BYTES_PER_MATCH = 3_017_669
+BASELINE_INSTANCE_BYTES = {"HeroSet": 184, "Player": 192, "Stronghold": 248, "SummitBattle": 336}
+
+
+def play_match(seed):
+    """A match with random attacks through both halves"""
+    game_state = GameState(seed=seed)
+    rng = random.Random(seed)
+    for update in range(UPDATES):
+        if update == UPDATES // 2:
+            game_state.advance_to_second_half()
+        if rng.random() < 0.5:
+            alliance_id = rng.choice(list(game_state.alliances))
+            hero_sets = game_state.get_alliance(alliance_id).get_all_available_hero_sets()
+            targets = [stronghold_id for stronghold_id, stronghold in game_state.strongholds.items()
+                       if game_state.can_alliance_attack_stronghold(alliance_id, stronghold_id)
+                       and stronghold.can_be_attacked()]
+            if hero_sets and targets:
+                game_state.start_battle(rng.choice(hero_sets), rng.choice(targets))
+        game_state.update_battles()
+    return game_state
+
+
+def instance_bytes(obj):
+    """Size of an object and of its instance dict"""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def entity_sizes():
+    """(count, bytes per instance) of each entity class among live objects"""
+    sizes = {cls.__name__: [0, 0] for cls in ENTITIES}
+    for obj in gc.get_objects():
+        if isinstance(obj, ENTITIES):
+            entry = sizes[type(obj).__name__]
+            entry[0] += 1
+            entry[1] += instance_bytes(obj)
+    return {name: (count, total / count if count else 0) for name, (count, total) in sizes.items()}
+
+
+if __name__ == "__main__":
+    play_match(0)  # Warm caches and lazy imports outside the trace
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    matches = [play_match(seed) for seed in range(1, MATCHES + 1)]
+    gc.collect()
+    per_match = (tracemalloc.get_traced_memory()[0] - before) / len(matches)
+    tracemalloc.stop()
+
+    change = per_match - BASELINE_BYTES_PER_MATCH
+    print(f"bytes per match: {per_match:12,.0f} (baseline {BASELINE_BYTES_PER_MATCH:,}, {change:+,.0f},"
+          f" {100 * change / BASELINE_BYTES_PER_MATCH:+.1f}%)")
+    for name, (count, size) in entity_sizes().items():
+        baseline = BASELINE_INSTANCE_BYTES.get(name)
+        was = f" (baseline {baseline})" if baseline else ""
+        print(f"  {name:<13} {count / len(matches):8,.0f} per match, {size:6.0f} bytes each{was}")
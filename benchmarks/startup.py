@@ -0,0 +1,63 @@
+# benchmarks/startup.py
+"""Time building a match's rosters and a whole GameState, with and without its NPC outcome table filled.
+
+The per-hero roster is built the way GameState used to build it: one Hero
+object, and three random draws, per generated hero. Run from the project
+root:
+
+    python benchmarks/startup.py
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_simulator.entities.alliance import Alliance
+from game_simulator.entities.hero import Hero
+from game_simulator.entities.hero_set import HeroSet
+from game_simulator.game_state import GameState
+from game_simulator.rng import roster_rng
+
+ALLIANCES = 4
+PLAYERS = 50
+POOL = 50
+REPEATS = 5
+
+
+def per_hero_rosters(seed):
+    """Every alliance's heroes as individual Hero objects, 50 per player"""
+    rosters = []
+    for alliance_id in range(1, ALLIANCES + 1):
+        rng = roster_rng(seed, alliance_id)
+        for player in range(PLAYERS):
+            pool = [Hero(f"PA{alliance_id}_P{player + 1}_H{i + 1}", rng=rng) for i in range(POOL)]
+            rosters.append([HeroSet(f"Set{s + 1}", player, pool[s * 5:(s + 1) * 5]) for s in range(6)])
+    return rosters
+
+
+def vectorized_rosters(seed):
+    """Every alliance as GameState builds it now"""
+    return [Alliance(alliance_id, f"Alliance {alliance_id}", rng=roster_rng(seed, alliance_id))
+            for alliance_id in range(1, ALLIANCES + 1)]
+
+
+def best_time(build):
+    """Fastest of REPEATS builds, in seconds"""
+    times = []
+    for seed in range(REPEATS):
+        start = time.perf_counter()
+        build(seed)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    per_hero = best_time(per_hero_rosters)
+    vectorized = best_time(vectorized_rosters)
+    game_state = best_time(lambda seed: GameState(seed=seed))
+    print(f"rosters, hero per draw: {1000 * per_hero:8.1f} ms")
+    print(f"rosters, vectorized:    {1000 * vectorized:8.1f} ms ({per_hero / vectorized:.1f}x)")
+    precomputed = best_time(lambda seed: GameState(seed=seed, precompute_npc_outcomes=True))
+    print(f"GameState():            {1000 * game_state:8.1f} ms")
+    print(f"with NPC outcomes:      {1000 * precomputed:8.1f} ms")
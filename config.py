@@ -13,6 +13,9 @@ CONNECTION_COLOR = (100, 100, 100)
 
 # Battle settings
 BATTLE_SCREEN_BACKGROUND = (30, 30, 30)
+BATTLE_BACKEND = "reference"  # "reference", "vectorized" or "expected"
+DEFERRED_BATTLES = False  # Play battles out when they start; resolve them when they would have ended
+PRECOMPUTE_NPC_OUTCOMES = True  # Simulate every set against each NPC level when a game is created
 
 # Time dilation
 INITIAL_TIME_SCALE = 1.0 # 1.0 = real-time, >1.0 faster, <1.0 slower
\ No newline at end of file
@@ -19,7 +19,8 @@ class GameEngine:
             self.battle_renderer = BattleRenderer()
             self.ui_elements = UIElements()
 
-        self.game_state = GameState()
+        self.game_state = GameState(battle_backend=config.BATTLE_BACKEND, deferred_battles=config.DEFERRED_BATTLES,
+                                precompute_npc_outcomes=config.PRECOMPUTE_NPC_OUTCOMES)
         self.game_state.engine = self  # Reference for renderer to access scrubber mode
 
         self.running = False
@@ -125,17 +126,19 @@ class GameEngine:
             return
         
         # Find attackable strongholds
-        from .map_layout import get_adjacent_strongholds
-        attackable = get_adjacent_strongholds(self.game_state.strongholds, alliance.controlled_strongholds)
-        valid_targets = [sid for sid in attackable if self.game_state.get_stronghold(sid).can_be_attacked()]
+        valid_targets = self.game_state.get_attackable_strongholds(alliance_id)
         
         if not valid_targets:
             print(f"Alliance {alliance_id} has no valid targets to attack")
             return
         
-        # Pick random attacking set and target
-        attacking_set = random.choice(available_sets)
+        # Pick a random target; against NPCs send the set most likely to win
         target_stronghold_id = random.choice(valid_targets)
+        target = self.game_state.get_stronghold(target_stronghold_id)
+        if target.count_active_npc_teams():
+            attacking_set = self.game_state.rank_npc_attacks(alliance_id, target.level)[0]
+        else:
+            attacking_set = random.choice(available_sets)
         
         # Start the battle
         battle = self.game_state.start_battle(attacking_set, target_stronghold_id)
@@ -298,7 +301,7 @@ class GameEngine:
             alliance_control = stronghold.controlling_alliance if stronghold.controlling_alliance else 0
             
             # NPC count (normalized)
-            npc_count_norm = len(stronghold.get_active_npc_teams()) / stronghold.max_npc_teams
+            npc_count_norm = stronghold.count_active_npc_teams() / stronghold.max_npc_teams
             
             obs_list.extend([x_norm, y_norm, alliance_control, npc_count_norm])
         
@@ -326,7 +329,8 @@ class GameEngine:
 
     def reset_game(self):
         """Reset game state"""
-        self.game_state = GameState()
+        self.game_state = GameState(battle_backend=config.BATTLE_BACKEND, deferred_battles=config.DEFERRED_BATTLES,
+                                precompute_npc_outcomes=config.PRECOMPUTE_NPC_OUTCOMES)
         self.time_scale = config.INITIAL_TIME_SCALE
         self.current_view = "map"
         self.active_battle_to_view = None
@@ -1,12 +1,20 @@
 # game_simulator/entities/alliance.py
-from .player import Player
+import numpy as np
+
+from .player import Player, POOL_SIZE, POOL_DTYPE
+from .hero import draw_player_stats
+from .available_set_pool import AvailableSetPool
 
 class Alliance:
-    def __init__(self, alliance_id, name, color=(255, 255, 255)):
+    def __init__(self, alliance_id, name, color=(255, 255, 255), rng=None):
         self.id = alliance_id
         self.name = name
         self.color = color
+        self.revision = 0  # Bumped when the score or the controlled strongholds change
         self.players = []
+        self.players_by_id = {}
+        self._hero_sets_by_id = None  # Set id -> HeroSet, built on the first lookup by id
+        self.available_sets = AvailableSetPool()  # Sets that can attack, kept current by the sets
         
         # Stronghold control
         self.controlled_strongholds = []
@@ -19,17 +27,34 @@ class Alliance:
         # Scoring
         self.summit_showdown_points = 0
         
+        # Running totals over every player's selected sets, kept current by the players
+        self.total_attack = 0
+        self.total_hp = 0.0
+        
         # Generate 50 players for this alliance
-        self._generate_players()
+        self._generate_players(rng)
+    
+    @property
+    def summit_showdown_points(self):
+        return self._summit_showdown_points
     
-    def _generate_players(self):
+    @summit_showdown_points.setter
+    def summit_showdown_points(self, value):
+        self._summit_showdown_points = value
+        self.revision += 1
+    
+    def _generate_players(self, rng=None):
         """Generate 50 players for this alliance"""
+        # Every player's pool in one draw, in the order players would draw them
+        pools = draw_player_stats(50 * POOL_SIZE, rng).astype(POOL_DTYPE).reshape(50, POOL_SIZE, -1)
         self.players = []
         for i in range(50):
             player_id = f"A{self.id}_P{i+1}"
-            player = Player(player_id, self.id)
+            player = Player(player_id, self.id, hero_pool=pools[i])
+            player.alliance = self
             player.select_hero_sets()  # Auto-select first 30 heroes
             self.players.append(player)
+            self.players_by_id[player_id] = player
         
         # Set first player as leader, second as co-leader
         if self.players:
@@ -39,21 +64,36 @@ class Alliance:
     
     def get_player(self, player_id):
         """Get a specific player by ID"""
-        for player in self.players:
-            if player.id == player_id:
-                return player
-        return None
+        return self.players_by_id.get(player_id)
+    
+    def get_hero_set(self, set_id):
+        """Get a player's selected hero set by ID"""
+        if self._hero_sets_by_id is None:
+            self._hero_sets_by_id = {hero_set.id: hero_set
+                                     for player in self.players for hero_set in player.selected_hero_sets}
+        return self._hero_sets_by_id.get(set_id)
+    
+    def reindex_hero_sets(self, removed, added):
+        """Keep the set indexes current when a player reselects sets"""
+        self.available_sets.replace(removed, added)
+        if self._hero_sets_by_id is None:
+            return
+        for hero_set in removed:
+            self._hero_sets_by_id.pop(hero_set.id, None)
+        for hero_set in added:
+            self._hero_sets_by_id[hero_set.id] = hero_set
     
     def get_all_available_hero_sets(self):
         """Get all hero sets available for attacks across all players"""
-        available_sets = []
-        for player in self.players:
-            available_sets.extend(player.get_available_sets_for_attack())
-        return available_sets
+        return self.available_sets.sets()
     
     def get_available_hero_sets_count(self):
         """Get count of hero sets available for attacks"""
-        return len(self.get_all_available_hero_sets())
+        return len(self.available_sets)
+    
+    def get_strongest_available_sets(self, count):
+        """Get up to count available hero sets, highest power rating first"""
+        return self.available_sets.strongest(count)
     
     def get_all_garrisoned_hero_sets(self):
         """Get all hero sets currently garrisoning strongholds"""
@@ -62,15 +102,22 @@ class Alliance:
             garrisoned_sets.extend(player.get_garrisoned_sets())
         return garrisoned_sets
     
+    def add_totals(self, attack, hp):
+        """Add a change in a player's attack and HP to the running totals"""
+        self.total_attack += attack
+        self.total_hp += hp
+    
     def add_stronghold(self, stronghold_id):
         """Add a stronghold to alliance control"""
         if stronghold_id not in self.controlled_strongholds:
             self.controlled_strongholds.append(stronghold_id)
+            self.revision += 1
     
     def remove_stronghold(self, stronghold_id):
         """Remove a stronghold from alliance control"""
         if stronghold_id in self.controlled_strongholds:
             self.controlled_strongholds.remove(stronghold_id)
+            self.revision += 1
     
     def set_home_stronghold(self, stronghold_id):
         """Set the alliance home stronghold"""
@@ -79,7 +126,11 @@ class Alliance:
     
     def get_total_power_rating(self):
         """Calculate total power rating of all players"""
-        return sum(player.get_total_power_rating() for player in self.players)
+        return self.total_attack + self.total_hp
+    
+    def get_hero_rows(self):
+        """HeroStore rows of every player's selected heroes"""
+        return np.concatenate([player.hero_rows for player in self.players])
     
     def get_active_players(self):
         """Get players who can still attack (have stamina and available sets)"""
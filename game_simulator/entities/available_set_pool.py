@@ -0,0 +1,112 @@
+# game_simulator/entities/available_set_pool.py
+import heapq
+from array import array
+from itertools import compress
+
+import numpy as np
+
+
+class AvailableSetPool:
+    """An alliance's hero sets that can attack, kept current as sets change.
+
+    Sets keep their roster position, so listing the pool gives the order a
+    scan over players and their sets would. HeroSet reports being consumed,
+    defeated, revived or reset, and the pool moves the set in or out.
+
+    Availability and power ratings are arrays by roster position, and a
+    sorted index of the ratings answers the strongest-sets query. Damage
+    only lowers a rating, so stored ratings may be stale and too high;
+    strongest() re-rates sets as it walks the index and re-sorts only after
+    a rating moved. Rises are stored as they happen.
+    """
+
+    def __init__(self):
+        self.positions = {}  # HeroSet -> roster position
+        self._sets = []  # HeroSet at each roster position
+        self._available = bytearray()  # 1 at the roster position of each available set
+        self._ratings = array("d")  # Power rating last stored for each roster position
+        self._order = None  # Roster positions by stored rating, best first; None after a change
+        self._count = 0
+
+    def replace(self, removed, added):
+        """Swap a player's sets; added sets take the removed sets' positions"""
+        positions = []
+        for hero_set in removed:
+            position = self.positions.pop(hero_set)
+            self._remove(position)
+            self._sets[position] = None
+            positions.append(position)
+        grow = len(added) - len(positions)
+        if grow > 0:
+            self._sets.extend([None] * grow)
+            self._available.extend(bytes(grow))
+            self._ratings.extend([0.0] * grow)
+            positions.extend(range(len(self._sets) - grow, len(self._sets)))
+        for hero_set in added:
+            position = positions.pop(0)
+            self._sets[position] = hero_set
+            self.positions[hero_set] = position
+            self.update(hero_set)
+
+    def update(self, hero_set):
+        """Move a set in or out of the pool after its status changed"""
+        position = self.positions.get(hero_set)
+        if position is None:
+            return
+        if not hero_set.can_attack():
+            self._remove(position)
+        elif not self._available[position]:
+            self._available[position] = 1
+            self._count += 1
+            self._rate(position, hero_set.get_power_rating())
+
+    def power_raised(self, hero_set):
+        """Store a set's higher power rating"""
+        position = self.positions.get(hero_set)
+        if position is not None and self._available[position]:
+            self._rate(position, hero_set.get_power_rating())
+
+    def _remove(self, position):
+        if self._available[position]:
+            self._available[position] = 0
+            self._count -= 1
+
+    def _rate(self, position, power):
+        self._ratings[position] = power
+        self._order = None
+
+    def sets(self):
+        """Available sets in roster order"""
+        return list(compress(self._sets, self._available))
+
+    def strongest(self, count):
+        """Up to count available sets, highest power rating first"""
+        if self._order is None:
+            positions = np.arange(len(self._ratings))
+            self._order = np.lexsort((positions, -np.frombuffer(self._ratings))).tolist()
+        # Stored ratings bound current ones from above, so a re-rated set is
+        # final once it beats the stored rating of every set not reached yet
+        found = []
+        reached = []  # (-current rating, roster position) of sets walked past
+        for position in self._order:
+            if len(found) >= count:
+                break
+            if not self._available[position]:
+                continue
+            stored = self._ratings[position]
+            while reached and -reached[0][0] > stored and len(found) < count:
+                found.append(heapq.heappop(reached)[1])
+            power = self._sets[position].get_power_rating()
+            if power < stored:
+                self._rate(position, power)  # Damaged since it was stored
+            heapq.heappush(reached, (-power, position))
+        while reached and len(found) < count:
+            found.append(heapq.heappop(reached)[1])
+        return [self._sets[position] for position in found]
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, hero_set):
+        position = self.positions.get(hero_set)
+        return position is not None and self._available[position] == 1
@@ -0,0 +1,122 @@
+# game_simulator/entities/battle_log.py
+
+# Verbosity levels
+LOG_NONE = 0      # Keep nothing
+LOG_OUTCOME = 1   # Battle start, result and end
+LOG_TURNS = 2     # Plus one record per turn
+LOG_FULL = 3      # Plus one record per defender per hit
+
+# Record kinds
+START = 0
+ATTACK = 1
+INEFFECTIVE = 2
+HIT = 3
+ALL_DEFEATED = 4
+WIN_BY_DAMAGE = 5
+END = 6
+MESSAGE = 7
+EXPECTED_ATTACK = 8
+NO_DAMAGE = 9
+
+# Minimum verbosity that keeps each record kind
+KIND_LEVELS = {
+    START: LOG_OUTCOME,
+    ATTACK: LOG_TURNS,
+    INEFFECTIVE: LOG_TURNS,
+    HIT: LOG_FULL,
+    ALL_DEFEATED: LOG_OUTCOME,
+    WIN_BY_DAMAGE: LOG_OUTCOME,
+    END: LOG_OUTCOME,
+    MESSAGE: LOG_OUTCOME,
+    EXPECTED_ATTACK: LOG_TURNS,
+    NO_DAMAGE: LOG_TURNS,
+}
+
+SIDE_NAMES = ("Attacker", "Defender")
+
+
+class BattleLog:
+    """Structured battle log formatted to text only when read.
+
+    Records are (kind, time, step, side, slot, a, b) tuples kept in a
+    preallocated list that doubles when full. side and slot locate a hero in
+    the battle; a and b hold the numbers each kind needs.
+    """
+
+    def __init__(self, battle, level=LOG_FULL, capacity=256):
+        self.battle = battle
+        self.level = level
+        self.records = [None] * capacity
+        self.count = 0
+
+    def wants(self, kind):
+        """Check whether records of this kind are kept at the current level"""
+        return self.level >= KIND_LEVELS[kind]
+
+    def record(self, kind, time, side=0, slot=0, a=0, b=0):
+        """Append one record"""
+        if self.count == len(self.records):
+            self.records.extend([None] * len(self.records))
+        self.records[self.count] = (kind, time, self.battle.current_step, side, slot, a, b)
+        self.count += 1
+
+    def wants_turns(self):
+        """Check whether any per-turn records are kept"""
+        return self.level >= LOG_TURNS
+
+    def __len__(self):
+        return self.count
+
+    def recent(self, count=10):
+        """Get the last count entries as text"""
+        start = max(0, self.count - count)
+        return [self.format(self.records[i]) for i in range(start, self.count)]
+
+    def to_list(self):
+        """Get every entry as text"""
+        return self.recent(self.count)
+
+    def format(self, record):
+        """Format one record as a log line"""
+        kind, time, step, side, slot, a, b = record
+        battle = self.battle
+        hero_sets = (battle.attacking_set, battle.defending_set)
+
+        if kind == START:
+            message = f"Battle started at {battle.stronghold_id}: {battle.attacking_set.id} vs {battle.defending_set.id}"
+        elif kind == ATTACK:
+            message = f"{SIDE_NAMES[side]} {hero_sets[side].heroes[slot].id} attacks with {a} hits"
+        elif kind == INEFFECTIVE:
+            message = f"Attack ineffective! (ATK:{hero_sets[side].heroes[slot].attack} vs AVG_DEF:{a:.1f})"
+        elif kind == HIT:
+            hero = hero_sets[side].heroes[slot]
+            if b <= 0:
+                message = f"  {hero.id} defeated! (took {a:.1f} damage)"
+            else:
+                message = f"  {hero.id} takes {a:.1f} damage (HP: {b:.1f}/{hero.max_hp})"
+        elif kind == ALL_DEFEATED:
+            message = {
+                "attacker": "Attackers win! All defenders defeated.",
+                "defender": "Defenders win! All attackers defeated.",
+                "draw": "Draw! All heroes defeated.",
+            }[a]
+        elif kind == WIN_BY_DAMAGE:
+            if a > b:
+                message = f"Attackers win by damage! (ATK:{a:.1f} vs DEF:{b:.1f})"
+            elif b > a:
+                message = f"Defenders win by damage! (DEF:{b:.1f} vs ATK:{a:.1f})"
+            else:
+                message = f"Tie in damage - Defenders win! (Both dealt {a:.1f} damage)"
+        elif kind == EXPECTED_ATTACK:
+            message = f"{SIDE_NAMES[side]} deals expected {a:.1f} damage per hit"
+        elif kind == NO_DAMAGE:
+            if a == 2:
+                message = "Neither side can deal damage - skipping to the step limit"
+            else:
+                message = f"{SIDE_NAMES[a]}s can no longer deal damage - skipping their turns"
+        elif kind == END:
+            message = f"Battle ended after {step} steps ({a:.1f}s)"
+        else:
+            message = a
+
+        return f"[{time:.1f}s] {message}"
@@ -0,0 +1,107 @@
+# game_simulator/entities/battle_tape.py
+import numpy as np
+
+from ..rng import battle_rng
+from .hero import Hero, format_hero_id
+from .hero_set import HeroSet
+from .battle_log import LOG_FULL
+from .summit_battle import SummitBattle, EXPECTED, SAMPLED
+
+# Columns of BattleTape.stats
+ATTACK = 0
+DEFENSE = 1
+MAX_HP = 2
+HP = 3
+
+
+class BattleTape:
+    """Compact recording of a battle: its random stream key and starting heroes.
+
+    Battle turns draw only from the battle's own stream, so the stream key and
+    the heroes' stats at the start are enough to play the battle again exactly
+    and rebuild its full log when someone looks at it. exact is cleared when
+    another battle changed these sets' heroes mid-battle, which the replay
+    cannot know about.
+    """
+
+    def __init__(self, battle_id, stronghold_id, set_info, hero_keys, stats, match_seed, battle_number, mode=SAMPLED):
+        self.battle_id = battle_id
+        self.stronghold_id = stronghold_id
+        self.set_info = set_info  # (set_id, owner_id, is_npc) per side
+        self.hero_keys = hero_keys  # Hero (owner id, number) keys per side; see Hero.key
+        self.stats = stats  # [side, slot, ATTACK/DEFENSE/MAX_HP/HP]
+        self.match_seed = match_seed
+        self.battle_number = battle_number
+        self.mode = mode
+        self.exact = True
+        self._replay = None  # Last replay, advanced in place while it is being viewed
+
+    @classmethod
+    def record(cls, battle, match_seed, battle_number, mode=SAMPLED):
+        """Record a battle before its first turn"""
+        hero_sets = (battle.attacking_set, battle.defending_set)
+        stats = np.array([
+            [[hero.attack, hero.defense, hero.max_hp, hero.current_hp if hero.is_alive else 0] for hero in hero_set.heroes]
+            for hero_set in hero_sets
+        ], dtype=np.float64)
+        return cls(
+            battle.id,
+            battle.stronghold_id,
+            tuple((hero_set.id, hero_set.owner_id, hero_set.is_npc) for hero_set in hero_sets),
+            tuple(tuple(hero.key for hero in hero_set.heroes) for hero_set in hero_sets),
+            stats,
+            match_seed,
+            battle_number,
+            mode,
+        )
+
+    @property
+    def hero_ids(self):
+        """Hero ids per side"""
+        return tuple(tuple(format_hero_id(*key) for key in keys) for keys in self.hero_keys)
+    
+    def _build_set(self, side):
+        """Rebuild one side's hero set at its starting stats"""
+        set_id, owner_id, is_npc = self.set_info[side]
+        heroes = []
+        for (owner_id, number), (attack, defense, max_hp, hp) in zip(self.hero_keys[side], self.stats[side].tolist()):
+            # NPC construction draws no random numbers; every stat is overwritten
+            hero = Hero(owner_id, is_npc=True, number=number)
+            hero.is_npc = is_npc
+            hero.attack = int(attack)
+            hero.defense = int(defense)
+            hero.max_hp = int(max_hp)
+            hero.current_hp = hp
+            hero.is_alive = hp > 0
+            heroes.append(hero)
+        return HeroSet(set_id, owner_id, heroes=heroes, is_npc=is_npc)
+
+    def new_battle(self, log_level=LOG_FULL):
+        """Build a fresh copy of the battle at its first turn"""
+        return SummitBattle(self.battle_id, self._build_set(0), self._build_set(1), self.stronghold_id,
+                            rng=battle_rng(self.match_seed, self.battle_number), log_level=log_level)
+
+    def replay(self, until=None, log_level=LOG_FULL):
+        """Replay the battle and get the replayed SummitBattle.
+
+        With until, another SummitBattle, the replay stops at the same turn as
+        it; otherwise it runs to the end. A full-log replay that follows a
+        live battle is kept and continued by the next call that asks for the
+        same turn or a later one. A replay to the end is not kept, so viewing
+        a finished battle holds no copy of it afterwards.
+        """
+        battle = self._replay
+        target = until.turn_index() if until is not None else None
+        if (battle is None or battle.log.level != log_level
+                or (target is not None and battle.turn_index() > target)):
+            battle = self.new_battle(log_level)
+        self._replay = battle if log_level == LOG_FULL and until is not None else None
+
+        turn = battle.execute_expected_turn if self.mode == EXPECTED else battle.execute_turn
+        while battle.is_active and (target is None or battle.turn_index() < target):
+            turn()
+        return battle
+
+    def release(self):
+        """Drop the cached replay"""
+        self._replay = None
@@ -2,57 +2,192 @@
 import random
 import numpy as np
 
+from .hero_store import HERO_STORE
+
+# Player hero (attack, defense, max_hp) distributions from the game rules
+PLAYER_STATS = ((4627, 432), (4195, 346), (8088, 783))
+
+
+def draw_player_stats(count, rng=None):
+    """Draw count player heroes' (attack, defense, max_hp) as a [count, 3] int array.
+
+    One draw covers every hero, taken hero by hero and stat by stat, so it
+    consumes rng exactly as count Hero constructions would.
+    """
+    rng = rng if rng is not None else np.random
+    means = np.array([mean for mean, _ in PLAYER_STATS], dtype=np.float64)
+    stds = np.array([std for _, std in PLAYER_STATS], dtype=np.float64)
+    return np.maximum(1, np.trunc(means + stds * rng.normal(size=(count, len(PLAYER_STATS))))).astype(np.int64)
+
+
+def npc_stats(stronghold_level):
+    """(attack, defense, max_hp) of every NPC hero at a stronghold level"""
+    # Base player averages
+    base_attack = 4627
+    base_defense = 4195
+    base_hp = 8088
+    
+    # Level multipliers
+    multipliers = {1: 0.8, 2: 1.0, 3: 1.2}
+    multiplier = multipliers.get(stronghold_level, 1.0)
+    
+    return int(base_attack * multiplier), int(base_defense * multiplier), int(base_hp * multiplier)
+
+
+def format_hero_id(owner_id, number):
+    """Id of a hero kept as its owner's id and a number; number None means owner_id is the id"""
+    if number is None:
+        return owner_id
+    return f"{owner_id}_H{number}"
+
+
 class Hero:
-    def __init__(self, hero_id, is_npc=False, stronghold_level=1):
-        self.id = hero_id
+    """A hero: a view over one row of a HeroStore.
+    
+    attack, defense, max_hp, current_hp and is_alive read and write the
+    store's columns; the row is given back when the hero is dropped. Heroes
+    built with a number keep their owner's id and the number, and only
+    format "<owner>_H<number>" when id is read. Every write is passed on to
+    hero_set, the set whose running totals include this hero.
+    """
+    
+    __slots__ = ("_id", "number", "is_npc", "store", "row", "hero_set")
+    
+    def __init__(self, hero_id, is_npc=False, stronghold_level=1, rng=None, store=None, number=None):
+        self._id = hero_id
+        self.number = number
         self.is_npc = is_npc
-        self.attack = 0
-        self.defense = 0
-        self.max_hp = 0
-        self.current_hp = 0
+        self.store = store if store is not None else HERO_STORE
+        self.row = self.store.allocate()
+        self.hero_set = None
         self.is_alive = True
         
         # Generate stats based on type
         if is_npc:
             self._generate_npc_stats(stronghold_level)
         else:
-            self._generate_player_stats()
+            self._generate_player_stats(rng)
+    
+    @classmethod
+    def view(cls, hero_id, is_npc, store, row, number=None):
+        """Make a hero over a row the caller has allocated and filled in"""
+        hero = cls.__new__(cls)
+        hero._id = hero_id
+        hero.number = number
+        hero.is_npc = is_npc
+        hero.store = store
+        hero.row = row
+        hero.hero_set = None
+        return hero
+    
+    @property
+    def id(self):
+        return format_hero_id(self._id, self.number)
     
-    def _generate_player_stats(self):
+    @property
+    def key(self):
+        """(owner id, number) the id is formatted from"""
+        return self._id, self.number
+    
+    @id.setter
+    def id(self, value):
+        self._id = value
+        self.number = None
+    
+    def _generate_player_stats(self, rng):
         """Generate stats for player heroes using normal distribution"""
-        # Stats from game rules
-        self.attack = max(1, int(np.random.normal(4627, 432)))
-        self.defense = max(1, int(np.random.normal(4195, 346))) 
-        self.max_hp = max(1, int(np.random.normal(8088, 783)))
+        self.attack, self.defense, self.max_hp = draw_player_stats(1, rng)[0].tolist()
         self.current_hp = self.max_hp
     
     def _generate_npc_stats(self, stronghold_level):
         """Generate stats for NPC heroes based on stronghold level"""
-        # Base player averages
-        base_attack = 4627
-        base_defense = 4195
-        base_hp = 8088
-        
-        # Level multipliers
-        multipliers = {1: 0.8, 2: 1.0, 3: 1.2}
-        multiplier = multipliers.get(stronghold_level, 1.0)
-        
-        self.attack = int(base_attack * multiplier)
-        self.defense = int(base_defense * multiplier)
-        self.max_hp = int(base_hp * multiplier)
+        self.attack, self.defense, self.max_hp = npc_stats(stronghold_level)
         self.current_hp = self.max_hp
     
+    def __del__(self):
+        try:
+            self.store.release(self.row)
+        except AttributeError:  # __init__ did not get as far as a row
+            pass
+    
+    def _write(self, column, value):
+        """Write one of the store's columns at this hero's row"""
+        hero_set = self.hero_set
+        if hero_set is None:
+            column[self.row] = value
+            return
+        before = self.totals()
+        column[self.row] = value
+        hero_set.hero_changed(before, self.totals())
+    
+    def totals(self):
+        """What this hero adds to its set's totals, in HeroSet.TOTALS order"""
+        store, row = self.store, self.row
+        alive = store.alive.item(row)
+        attack = store.attack.item(row)
+        max_hp = store.max_hp.item(row)
+        hp_lost = max_hp - store.current_hp.item(row)
+        return (int(alive), 0 if alive else attack, store.defense.item(row) if alive else 0,
+                attack, hp_lost if hp_lost else 0, max_hp)
+    
+    @property
+    def attack(self):
+        return self.store.attack.item(self.row)
+    
+    @attack.setter
+    def attack(self, value):
+        self._write(self.store.attack, value)
+    
+    @property
+    def defense(self):
+        return self.store.defense.item(self.row)
+    
+    @defense.setter
+    def defense(self, value):
+        self._write(self.store.defense, value)
+    
+    @property
+    def max_hp(self):
+        return self.store.max_hp.item(self.row)
+    
+    @max_hp.setter
+    def max_hp(self, value):
+        self._write(self.store.max_hp, value)
+    
+    @property
+    def current_hp(self):
+        return self.store.current_hp.item(self.row)
+    
+    @current_hp.setter
+    def current_hp(self, value):
+        self._write(self.store.current_hp, value)
+    
+    @property
+    def is_alive(self):
+        return self.store.alive.item(self.row)
+    
+    @is_alive.setter
+    def is_alive(self, value):
+        self._write(self.store.alive, value)
+    
     def take_damage(self, damage):
         """Apply damage to the hero"""
-        if not self.is_alive:
+        # Battles call this for every hit, so it works on the columns directly
+        store, row = self.store, self.row
+        if not store.alive.item(row):
             return 0
             
         actual_damage = max(0, damage)
-        self.current_hp = max(0, self.current_hp - actual_damage)
+        old_hp = store.current_hp.item(row)
+        current_hp = old_hp - actual_damage
         
-        if self.current_hp <= 0:
-            self.is_alive = False
-            self.current_hp = 0
+        died = current_hp <= 0
+        if died:
+            store.alive[row] = False
+            current_hp = 0
+        store.current_hp[row] = current_hp
+        if self.hero_set is not None:
+            self.hero_set.hero_damaged(self, current_hp - old_hp, died)
             
         return actual_damage
     
@@ -70,4 +205,4 @@ class Hero:
     def __repr__(self):
         status = "Alive" if self.is_alive else "Dead"
         npc_str = "NPC" if self.is_npc else "Player"
-        return f"Hero({self.id}, {npc_str}, ATK:{self.attack}, DEF:{self.defense}, HP:{self.current_hp}/{self.max_hp}, {status})"
\ No newline at end of file
+        return f"Hero({self.id}, {npc_str}, ATK:{self.attack}, DEF:{self.defense}, HP:{self.current_hp:g}/{self.max_hp}, {status})"
\ No newline at end of file
@@ -1,31 +1,136 @@
 # game_simulator/entities/hero_set.py
+import numpy as np
+
 from .hero import Hero
 
 class HeroSet:
-    def __init__(self, set_id, owner_id, heroes=None, is_npc=False, stronghold_level=1):
-        self.id = set_id
+    """Five heroes that attack or defend together.
+    
+    The set keeps running totals over its heroes, which the heroes update
+    as they are written, so the HP, defense and living queries do not scan
+    heroes. Attack and HP changes are passed on to the owning player, and
+    changes to whether the set can attack to its alliance's AvailableSetPool.
+    """
+    
+    # Running totals kept per set, in the order of Hero.totals(). Dead heroes'
+    # attack and the HP lost are kept rather than living attack and HP left:
+    # they are 0, a shared int, for every set that has not been hurt
+    TOTALS = ("living_count", "dead_attack", "living_defense", "total_attack", "hp_lost", "total_max_hp")
+    
+    __slots__ = ("_id", "number", "owner_id", "is_npc", "_consumed_for_attack", "is_garrisoned",
+                 "garrisoned_stronghold", "heroes", "player") + TOTALS
+    
+    def __init__(self, set_id, owner_id, heroes=None, is_npc=False, stronghold_level=1, store=None, number=None):
+        # With a number, set_id is the owner's prefix and the id reads "<prefix>_Set<number>"
+        self._id = set_id
+        self.number = number
         self.owner_id = owner_id  # Player ID or "NPC"
         self.is_npc = is_npc
         
         # Game mechanics status
-        self.consumed_for_attack = False  # Per game half
+        self._consumed_for_attack = False  # Per game half
         self.is_garrisoned = False
         self.garrisoned_stronghold = None
         
         # Create 5 heroes for this set
+        hero_prefix = self.id  # Shared by the heroes made here
         if heroes:
             self.heroes = heroes[:5]  # Ensure exactly 5 heroes
             # Ensure we have exactly 5 heroes
             while len(self.heroes) < 5:
-                hero_id = f"{set_id}_H{len(self.heroes)+1}"
-                hero = Hero(hero_id, is_npc, stronghold_level)
+                hero = Hero(hero_prefix, is_npc, stronghold_level, store=store, number=len(self.heroes)+1)
                 self.heroes.append(hero)
         else:
             self.heroes = []
             for i in range(5):
-                hero_id = f"{set_id}_H{i+1}"
-                hero = Hero(hero_id, is_npc, stronghold_level)
+                hero = Hero(hero_prefix, is_npc, stronghold_level, store=store, number=i+1)
                 self.heroes.append(hero)
+        
+        self.player = None  # Player whose totals include this set
+        self._recount()
+    
+    @property
+    def id(self):
+        if self.number is None:
+            return self._id
+        return f"{self._id}_Set{self.number}"
+    
+    @id.setter
+    def id(self, value):
+        self._id = value
+        self.number = None
+    
+    def _recount(self):
+        """Total the heroes from scratch and link them to this set"""
+        totals = [0, 0, 0, 0, 0, 0]
+        for hero in self.heroes:
+            hero.hero_set = self
+            for i, value in enumerate(hero.totals()):
+                totals[i] += value
+        for name, value in zip(self.TOTALS, totals):
+            setattr(self, name, value)
+    
+    def _available_pool(self):
+        """AvailableSetPool that lists this set, if any"""
+        player = self.player
+        if player is None or player.alliance is None:
+            return None
+        return player.alliance.available_sets
+    
+    def hero_changed(self, before, after):
+        """Move the totals from a hero's before to its after Hero.totals()"""
+        was_defeated = self.living_count == 0
+        self.living_count += after[0] - before[0]
+        self.dead_attack += after[1] - before[1]
+        self.living_defense += after[2] - before[2]
+        self.total_attack += after[3] - before[3]
+        self.hp_lost += after[4] - before[4]
+        self.total_max_hp += after[5] - before[5]
+        if self.player is not None:
+            attack_change = after[3] - before[3]
+            hp_change = (after[5] - before[5]) - (after[4] - before[4])
+            self.player.add_totals(attack_change, hp_change)
+            pool = self._available_pool()
+            if pool is not None:
+                if was_defeated != (self.living_count == 0):
+                    pool.update(self)
+                elif attack_change + hp_change > 0:
+                    pool.power_raised(self)
+    
+    def hero_damaged(self, hero, hp_change, died):
+        """Take a hit on a hero into the totals; Hero.take_damage's fast path"""
+        self.hp_lost -= hp_change
+        if died:
+            self.living_count -= 1
+            self.dead_attack += hero.attack
+            self.living_defense -= hero.defense
+        if self.player is not None:
+            self.player.add_totals(0, hp_change)
+            if died and self.living_count == 0:
+                pool = self._available_pool()
+                if pool is not None:
+                    pool.update(self)
+    
+    @property
+    def consumed_for_attack(self):
+        return self._consumed_for_attack
+    
+    @consumed_for_attack.setter
+    def consumed_for_attack(self, value):
+        self._consumed_for_attack = value
+        pool = self._available_pool()
+        if pool is not None:
+            pool.update(self)
+    
+    @property
+    def store(self):
+        """HeroStore holding this set's heroes"""
+        return self.heroes[0].store
+    
+    @property
+    def rows(self):
+        """Store rows of the set's heroes, in slot order"""
+        return np.array([hero.row for hero in self.heroes], dtype=np.intp)
     
     def get_living_heroes(self):
         """Get all living heroes in this set"""
@@ -33,31 +138,42 @@ class HeroSet:
     
     def get_average_defense(self):
         """Get average defense of all living heroes"""
-        living_heroes = self.get_living_heroes()
-        if not living_heroes:
+        if not self.living_count:
             return 0
-        return sum(hero.defense for hero in living_heroes) / len(living_heroes)
+        return self.living_defense / self.living_count
     
     def is_defeated(self):
         """Check if all heroes in this set are defeated"""
-        return len(self.get_living_heroes()) == 0
+        return self.living_count == 0
     
     def heal_all_heroes(self):
         """Restore all heroes to full health"""
         for hero in self.heroes:
             hero.heal_full()
     
+    @property
+    def living_attack(self):
+        return self.total_attack - self.dead_attack
+    
+    @property
+    def total_hp(self):
+        return self.total_max_hp - self.hp_lost
+    
     def get_total_damage_potential(self):
         """Calculate total damage potential of living heroes"""
-        return sum(hero.attack for hero in self.get_living_heroes())
+        return self.living_attack
     
     def get_total_hp(self):
         """Get total current HP of all heroes"""
-        return sum(hero.current_hp for hero in self.heroes)
+        return float(self.total_hp)
     
     def get_max_hp(self):
         """Get total max HP of all heroes"""
-        return sum(hero.max_hp for hero in self.heroes)
+        return self.total_max_hp
+    
+    def get_power_rating(self):
+        """Total attack plus current HP, as Player.get_total_power_rating counts it"""
+        return self.total_attack + self.total_hp
     
     def reset_for_new_half(self):
         """Reset status for new game half"""
@@ -83,7 +199,7 @@ class HeroSet:
         self.consumed_for_attack = True
     
     def __repr__(self):
-        living_count = len(self.get_living_heroes())
+        living_count = self.living_count
         status_parts = []
         if self.consumed_for_attack:
             status_parts.append("Consumed")
@@ -0,0 +1,92 @@
+# game_simulator/entities/hero_store.py
+import numpy as np
+
+
+class HeroStore:
+    """Hero stats in NumPy columns, one row per hero.
+
+    Hero objects are views over a row, so a whole roster can be read or
+    changed with single array operations on the columns. Rows of heroes
+    that are no longer referenced go back to a free list and are reused,
+    so the store grows with the heroes alive at once rather than with every
+    hero ever made. Columns are replaced when the store grows; hold the
+    store, not a column.
+    """
+
+    def __init__(self, capacity=1024):
+        self.attack = np.zeros(capacity, dtype=np.int64)
+        self.defense = np.zeros(capacity, dtype=np.int64)
+        self.max_hp = np.zeros(capacity, dtype=np.int64)
+        self.current_hp = np.zeros(capacity, dtype=np.float64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.size = 0  # Rows handed out so far, free or not
+        self._free = []
+
+    @property
+    def capacity(self):
+        return len(self.attack)
+
+    def _grow(self, needed):
+        """Make room for at least needed rows"""
+        capacity = max(self.capacity, 1)
+        while capacity < needed:
+            capacity *= 2
+        for name in ("attack", "defense", "max_hp", "current_hp", "alive"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def allocate(self):
+        """Get a zeroed row for a new hero"""
+        if self._free:
+            return self._free.pop()
+        if self.size == self.capacity:
+            self._grow(self.size + 1)
+        self.size += 1
+        return self.size - 1
+
+    def allocate_many(self, count):
+        """Get count zeroed rows as an array, reusing free rows first"""
+        reused = [self._free.pop() for _ in range(min(count, len(self._free)))]
+        fresh = count - len(reused)
+        if self.size + fresh > self.capacity:
+            self._grow(self.size + fresh)
+        rows = np.concatenate([np.array(reused, dtype=np.intp), np.arange(self.size, self.size + fresh, dtype=np.intp)])
+        self.size += fresh
+        return rows
+
+    def fill(self, rows, stats):
+        """Set rows to full-HP living heroes with [row, 3] (attack, defense, max_hp) stats"""
+        self.attack[rows] = stats[:, 0]
+        self.defense[rows] = stats[:, 1]
+        self.max_hp[rows] = stats[:, 2]
+        self.current_hp[rows] = stats[:, 2]
+        self.alive[rows] = True
+
+    def release(self, row):
+        """Give back the row of a hero that is gone"""
+        self.attack[row] = 0
+        self.defense[row] = 0
+        self.max_hp[row] = 0
+        self.current_hp[row] = 0
+        self.alive[row] = False
+        self._free.append(row)
+
+    def __len__(self):
+        """Rows in use"""
+        return self.size - len(self._free)
+
+    def totals(self, rows):
+        """Sums over rows: attack, living attack, current HP, max HP and living heroes"""
+        alive = self.alive[rows]
+        return {
+            "attack": int(self.attack[rows].sum()),
+            "living_attack": int(self.attack[rows][alive].sum()),
+            "current_hp": float(self.current_hp[rows].sum()),
+            "max_hp": int(self.max_hp[rows].sum()),
+            "living": int(alive.sum()),
+        }
+
+
+HERO_STORE = HeroStore()  # Store of heroes created without one
@@ -0,0 +1,84 @@
+# game_simulator/entities/npc_team_pool.py
+import numpy as np
+
+from .hero import Hero, npc_stats
+from .hero_set import HeroSet
+from .hero_store import HERO_STORE
+
+
+class NpcTeamPool:
+    """A stronghold's NPC teams, made into HeroSets only when they are needed.
+
+    NPC heroes all share their level's stats, so teams no battle has touched
+    are just a count. materialize() turns the next one into a HeroSet, and
+    Stronghold.get_all_defending_sets does so when it has no engaged team
+    left to offer. The pool still reads as the list of teams: len() counts
+    every team, and indexing or iterating materializes the teams it reaches.
+    """
+
+    def __init__(self, stronghold_id, level, count, store=None):
+        self.stronghold_id = stronghold_id
+        self.level = level
+        self.store = store if store is not None else HERO_STORE
+        self.teams = []  # Materialized teams still at the stronghold, in number order
+        self.untouched = count  # Teams that are only counted
+        self._created = 0  # Teams materialized so far; numbers the next one
+        self._template = np.tile(npc_stats(level), (5, 1))  # [hero, (attack, defense, max_hp)]
+
+    def materialize(self):
+        """Make the next untouched team a HeroSet and get it"""
+        team = self._build()
+        self._created += 1
+        self.untouched -= 1
+        self.teams.append(team)
+        return team
+
+    def preview(self):
+        """A HeroSet like the next untouched team, left out of the pool.
+
+        The pool is unchanged; the preview's store rows go when it does.
+        """
+        return self._build()
+
+    def _build(self):
+        """The next untouched team as a HeroSet"""
+        team_id = f"{self.stronghold_id}_NPC_{self._created + 1}"
+        rows = self.store.allocate_many(5)
+        self.store.fill(rows, self._template)
+        heroes = [Hero.view(team_id, True, self.store, row, number=i+1) for i, row in enumerate(rows.tolist())]
+        return HeroSet(team_id, "NPC", heroes=heroes, is_npc=True, stronghold_level=self.level)
+
+    def engaged_teams(self):
+        """Materialized teams that are not defeated"""
+        return [team for team in self.teams if not team.is_defeated()]
+
+    def active_count(self):
+        """Teams not defeated, materialized or not"""
+        return len(self.engaged_teams()) + self.untouched
+
+    def remove(self, team):
+        """Take a materialized team out of the pool"""
+        self.teams.remove(team)
+
+    def __len__(self):
+        return len(self.teams) + self.untouched
+
+    def __contains__(self, team):
+        return any(own is team for own in self.teams)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("NPC team index out of range")
+        while index >= len(self.teams):
+            self.materialize()
+        return self.teams[index]
+
+    def __iter__(self):
+        while self.untouched:
+            self.materialize()
+        return iter(list(self.teams))
+
+    def __repr__(self):
+        return f"NpcTeamPool({self.stronghold_id}, {len(self.teams)} materialized, {self.untouched} untouched)"
@@ -1,28 +1,64 @@
 # game_simulator/entities/player.py
+import numpy as np
+
 from .hero_set import HeroSet
-from .hero import Hero
+from .hero import Hero, draw_player_stats
+from .hero_store import HERO_STORE
+
+POOL_SIZE = 50  # Heroes generated per player
+POOL_DTYPE = np.int32  # Hero stats are well inside int32; halves the pools
 
 class Player:
-    def __init__(self, player_id, alliance_id):
+    __slots__ = ("id", "alliance_id", "stamina", "store", "hero_pool", "selected_indices", "selected_hero_sets",
+                 "hero_rows", "_hero_prefix", "alliance", "total_attack", "total_hp")
+    
+    def __init__(self, player_id, alliance_id, rng=None, hero_pool=None, store=None):
         self.id = player_id
         self.alliance_id = alliance_id
         self.stamina = 4  # Summit Stamina per half
+        self.store = store if store is not None else HERO_STORE
+        self._hero_prefix = f"P{player_id}"  # Shared by the ids of this player's heroes and sets
         
-        # Hero management
-        self.initial_hero_pool = []  # 50 initially generated heroes
+        # Hero management: the pool is kept as stats, and only the selected
+        # heroes become Hero objects
+        self.hero_pool = None  # [50, 3] (attack, defense, max_hp) of the initially generated heroes
+        self.selected_indices = []  # Pool indices of the 30 selected heroes, in set order
         self.selected_hero_sets = []  # 6 sets of 5 heroes each (30 total)
-        self.discarded_heroes = []   # 20 heroes not selected
+        self.hero_rows = np.zeros(0, dtype=np.intp)  # HeroStore rows of the selected heroes
+        self.alliance = None  # Alliance that owns this player and indexes its sets
+        
+        # Running totals over the selected sets, kept current by the sets
+        self.total_attack = 0
+        self.total_hp = 0.0
         
         # Generate initial hero pool
-        self._generate_initial_heroes()
+        if hero_pool is not None:
+            self.hero_pool = np.asarray(hero_pool, dtype=POOL_DTYPE)
+        else:
+            self._generate_initial_heroes(rng)
         
-    def _generate_initial_heroes(self):
+    def _generate_initial_heroes(self, rng=None):
         """Generate 50 random heroes for this player"""
-        self.initial_hero_pool = []
-        for i in range(50):
-            hero_id = f"P{self.id}_H{i+1}"
-            hero = Hero(hero_id, is_npc=False)
-            self.initial_hero_pool.append(hero)
+        self.hero_pool = draw_player_stats(POOL_SIZE, rng).astype(POOL_DTYPE)
+    
+    def _detached_hero(self, index):
+        """A Hero with the starting stats of a pool hero that was not selected"""
+        row = self.store.allocate_many(1)
+        self.store.fill(row, self.hero_pool[index:index + 1])
+        return Hero.view(self._hero_prefix, False, self.store, int(row[0]), number=index+1)
+    
+    @property
+    def initial_hero_pool(self):
+        """The 50 generated heroes; unselected ones are built fresh on each call"""
+        selected = dict(zip(self.selected_indices,
+                            (hero for hero_set in self.selected_hero_sets for hero in hero_set.heroes)))
+        return [selected[i] if i in selected else self._detached_hero(i) for i in range(len(self.hero_pool))]
+    
+    @property
+    def discarded_heroes(self):
+        """The 20 heroes not selected, built fresh on each call"""
+        selected = set(self.selected_indices)
+        return [self._detached_hero(i) for i in range(len(self.hero_pool)) if i not in selected]
     
     def select_hero_sets(self, hero_indices=None):
         """Select 30 heroes (6 sets of 5) from the 50 initial heroes"""
@@ -33,18 +69,34 @@ class Player:
         if len(hero_indices) != 30:
             raise ValueError("Must select exactly 30 heroes")
         
-        # Create 6 hero sets
-        selected_heroes = [self.initial_hero_pool[i] for i in hero_indices]
+        # Create the selected heroes in one block of store rows
+        self.selected_indices = list(hero_indices)
+        rows = self.store.allocate_many(30)
+        self.store.fill(rows, self.hero_pool[self.selected_indices])
+        selected_heroes = [Hero.view(self._hero_prefix, False, self.store, row, number=i+1)
+                           for i, row in zip(self.selected_indices, rows.tolist())]
+        removed = self.selected_hero_sets
+        for hero_set in removed:
+            hero_set.player = None
         self.selected_hero_sets = []
         
         for set_idx in range(6):
-            set_id = f"P{self.id}_Set{set_idx+1}"
             heroes_for_set = selected_heroes[set_idx*5:(set_idx+1)*5]
-            hero_set = HeroSet(set_id, self.id, heroes_for_set, is_npc=False)
+            hero_set = HeroSet(self._hero_prefix, self.id, heroes_for_set, is_npc=False, number=set_idx+1)
+            hero_set.player = self
             self.selected_hero_sets.append(hero_set)
-        
-        # Store discarded heroes
-        self.discarded_heroes = [self.initial_hero_pool[i] for i in range(50) if i not in hero_indices]
+        self.hero_rows = rows
+        if self.alliance is not None:
+            self.alliance.reindex_hero_sets(removed, self.selected_hero_sets)
+        self.add_totals(sum(hero_set.total_attack for hero_set in self.selected_hero_sets) - self.total_attack,
+                        sum(hero_set.total_hp for hero_set in self.selected_hero_sets) - self.total_hp)
+    
+    def add_totals(self, attack, hp):
+        """Add a change in a selected set's attack and HP to the running totals"""
+        self.total_attack += attack
+        self.total_hp += hp
+        if self.alliance is not None:
+            self.alliance.add_totals(attack, hp)
     
     def get_available_sets_for_attack(self):
         """Get hero sets that can be used for attacks"""
@@ -76,13 +128,9 @@ class Player:
     
     def get_total_power_rating(self):
         """Calculate total power rating of all selected hero sets"""
-        total_attack = 0
-        total_hp = 0
-        for hero_set in self.selected_hero_sets:
-            for hero in hero_set.heroes:
-                total_attack += hero.attack
-                total_hp += hero.current_hp
-        return total_attack + total_hp
+        if not self.selected_hero_sets:
+            return 0
+        return self.total_attack + self.total_hp
     
     def __repr__(self):
         available_sets = len(self.get_available_sets_for_attack())
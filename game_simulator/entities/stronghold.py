@@ -1,14 +1,19 @@
 # game_simulator/entities/stronghold.py
 import time
-from .hero_set import HeroSet
+from .npc_team_pool import NpcTeamPool
 
 class Stronghold:
+    __slots__ = ("id", "level", "x", "y", "connections", "controlling_alliance", "is_alliance_home",
+                 "home_alliance_id", "protection_end_time", "is_protected", "npc_defense_teams", "max_npc_teams",
+                 "npc_teams_defeated_by_alliance", "garrisoned_hero_sets", "max_garrison_size", "revision")
+    
     def __init__(self, stronghold_id, level, x, y, connections=None):
         self.id = stronghold_id
         self.level = level  # 1, 2, or 3
         self.x = x
         self.y = y
         self.connections = connections or []
+        self.revision = 0  # Bumped by every change below, so views of the stronghold can be cached
         
         # Control and status
         self.controlling_alliance = None
@@ -20,7 +25,7 @@ class Stronghold:
         self.is_protected = False
         
         # NPC Defense Teams
-        self.npc_defense_teams = []
+        self.npc_defense_teams = NpcTeamPool(self.id, self.level, 0)
         self.max_npc_teams = self._get_max_npc_teams()
         self.npc_teams_defeated_by_alliance = {}  # Track which alliance defeated which NPCs
         
@@ -42,12 +47,9 @@ class Stronghold:
         return garrison_limits.get(self.level, 9)
     
     def _generate_npc_teams(self):
-        """Generate initial NPC defense teams"""
-        self.npc_defense_teams = []
-        for i in range(self.max_npc_teams):
-            team_id = f"{self.id}_NPC_{i+1}"
-            npc_team = HeroSet(team_id, "NPC", is_npc=True, stronghold_level=self.level)
-            self.npc_defense_teams.append(npc_team)
+        """Generate initial NPC defense teams; they become HeroSets when first fought"""
+        self.npc_defense_teams = NpcTeamPool(self.id, self.level, self.max_npc_teams)
+        self.revision += 1
     
     def is_neutral(self):
         """Check if stronghold is neutral (no alliance control)"""
@@ -58,9 +60,13 @@ class Stronghold:
         return len(self.npc_defense_teams) > 0
     
     def get_active_npc_teams(self):
-        """Get NPC teams that are still alive"""
+        """Get NPC teams that are still alive; materializes every team"""
         return [team for team in self.npc_defense_teams if not team.is_defeated()]
     
+    def count_active_npc_teams(self):
+        """Count NPC teams that are still alive without materializing any"""
+        return self.npc_defense_teams.active_count()
+    
     def remove_defeated_npc_team(self, npc_team, defeating_alliance_id):
         """Remove a defeated NPC team and track which alliance defeated it"""
         if npc_team in self.npc_defense_teams:
@@ -70,10 +76,11 @@ class Stronghold:
             if defeating_alliance_id not in self.npc_teams_defeated_by_alliance:
                 self.npc_teams_defeated_by_alliance[defeating_alliance_id] = 0
             self.npc_teams_defeated_by_alliance[defeating_alliance_id] += 1
+            self.revision += 1
     
     def check_capturable(self):
         """Check if stronghold can be captured (all NPCs defeated)"""
-        return len(self.get_active_npc_teams()) == 0 and not self.is_alliance_home
+        return self.count_active_npc_teams() == 0 and not self.is_alliance_home
     
     def capture_by_alliance(self, alliance_id, protection_duration_minutes=20):
         """Capture stronghold by alliance - returns the ID of alliance that actually captures"""
@@ -100,6 +107,7 @@ class Stronghold:
         
         # Clear NPC defeat tracking for future captures
         self.npc_teams_defeated_by_alliance = {}
+        self.revision += 1
         
         return capturing_alliance_id  # Return the ID of the alliance that actually captured
     
@@ -107,6 +115,7 @@ class Stronghold:
         """Start protection period"""
         self.protection_end_time = time.time() + (duration_minutes * 60)
         self.is_protected = True
+        self.revision += 1
     
     def update_protection_status(self):
         """Update protection status based on current time"""
@@ -124,6 +133,7 @@ class Stronghold:
             if hero_set not in self.garrisoned_hero_sets:
                 self.garrisoned_hero_sets.append(hero_set)
                 hero_set.assign_to_garrison(self.id)
+                self.revision += 1
                 return True
         return False
     
@@ -132,17 +142,40 @@ class Stronghold:
         if hero_set in self.garrisoned_hero_sets:
             self.garrisoned_hero_sets.remove(hero_set)
             hero_set.remove_from_garrison()
+            self.revision += 1
             return True
         return False
     
     def get_all_defending_sets(self):
-        """Get all defending sets (NPCs + garrisoned players)"""
-        defending_sets = list(self.get_active_npc_teams())
+        """Get all defending sets (NPCs + garrisoned players).
+        
+        NPC teams already in a fight come first. If there are none, the next
+        untouched team is materialized; the others stay counts.
+        """
+        defending_sets = self.npc_defense_teams.engaged_teams()
+        if not defending_sets and self.npc_defense_teams.untouched:
+            defending_sets.append(self.npc_defense_teams.materialize())
         # Only include non-defeated garrisoned sets
         active_garrison = [hero_set for hero_set in self.garrisoned_hero_sets if not hero_set.is_defeated()]
         defending_sets.extend(active_garrison)
         return defending_sets
     
+    def preview_defender(self):
+        """The set get_all_defending_sets would offer first, without materializing a team.
+
+        With no engaged NPC team, an untouched one is stood in for by a
+        preview outside the pool. None if nothing defends.
+        """
+        engaged = self.npc_defense_teams.engaged_teams()
+        if engaged:
+            return engaged[0]
+        if self.npc_defense_teams.untouched:
+            return self.npc_defense_teams.preview()
+        for hero_set in self.garrisoned_hero_sets:
+            if not hero_set.is_defeated():
+                return hero_set
+        return None
+    
     def cleanup_defeated_defenders(self):
         """Remove all defeated hero sets from stronghold immediately"""
         # NOTE: NPCs are already properly removed by remove_defeated_npc_team() during battle resolution
@@ -153,6 +186,7 @@ class Stronghold:
         for defeated_set in defeated_garrison:
             self.garrisoned_hero_sets.remove(defeated_set)
             defeated_set.remove_from_garrison()
+            self.revision += 1
     
     def respawn_npcs_if_neutral(self):
         """Respawn NPCs if stronghold is neutral (for second half)"""
@@ -166,12 +200,14 @@ class Stronghold:
         self.home_alliance_id = alliance_id
         self.controlling_alliance = alliance_id
         # Alliance homes have no NPCs and can't be captured
-        self.npc_defense_teams = []
+        self.npc_defense_teams = NpcTeamPool(self.id, self.level, 0)
+        self.revision += 1
     
     def end_all_protection(self):
         """End protection immediately (for second half start)"""
         self.is_protected = False
         self.protection_end_time = 0
+        self.revision += 1
     
     def __repr__(self):
         status_parts = []
@@ -185,7 +221,7 @@ class Stronghold:
         if self.is_protected:
             status_parts.append("Protected")
         
-        npc_count = len(self.get_active_npc_teams())
+        npc_count = self.count_active_npc_teams()
         garrison_count = len(self.garrisoned_hero_sets)
         
         status = ", ".join(status_parts)
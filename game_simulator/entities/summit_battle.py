@@ -1,38 +1,254 @@
 # game_simulator/entities/summit_battle.py
-import random
 import time
+import numpy as np
+from ..simulation.batch_battle import (
+    TURN_DRAWS, MAX_HITS, MEAN_HITS, SET_SIZE, TURNS_ACTED, INEFFECTIVE_TURNS, DAMAGE_DEALT, DAMAGE_TAKEN,
+    TURNS_SURVIVED, DEATHS
+)
+from ..simulation.battle_stats import NO_ALLIANCE
+from .battle_log import (
+    BattleLog, LOG_FULL, START, ATTACK, INEFFECTIVE, HIT, ALL_DEFEATED, WIN_BY_DAMAGE, END, MESSAGE,
+    EXPECTED_ATTACK, NO_DAMAGE
+)
+
+# Battle modes: random turns as in the game, or deterministic expected-value turns
+SAMPLED = "sampled"
+EXPECTED = "expected"
+
+# Living hero slots for every alive-bitmask of a set (bit i is hero slot i)
+LIVING_SLOTS = tuple(
+    tuple(slot for slot in range(SET_SIZE) if mask >> slot & 1) for mask in range(1 << SET_SIZE)
+)
+
+
+def alive_mask(hero_set):
+    """Get the alive-bitmask of a hero set"""
+    mask = 0
+    for slot, hero in enumerate(hero_set.heroes):
+        if hero.store.alive.item(hero.row):
+            mask |= 1 << slot
+    return mask
+
+
+class SubsetTable:
+    """Lookups for one side attacking the other, keyed by the target's alive-bitmask.
+    
+    Hero stats are fixed during a battle, so the average defense of each of the
+    32 living subsets and each acting hero's damage per hit against it are
+    computed once and every turn is a table lookup.
+    """
+    
+    def __init__(self, acting_set, target_set):
+        defenses = [hero.defense for hero in target_set.heroes]
+        self.average_defense = [0] * len(LIVING_SLOTS)
+        for mask in range(1, len(LIVING_SLOTS)):
+            slots = LIVING_SLOTS[mask]
+            self.average_defense[mask] = sum(defenses[slot] for slot in slots) / len(slots)
+        
+        self.damage_per_hit = [
+            [max(0, hero.attack - avg_defense) for avg_defense in self.average_defense]
+            for hero in acting_set.heroes
+        ]
+
 
 class SummitBattle:
     """5v5 Hero Set battle following the game rules"""
     
-    def __init__(self, battle_id, attacking_set, defending_set, stronghold_id):
+    __slots__ = ("id", "attacking_set", "defending_set", "stronghold_id", "rng", "current_step", "max_steps",
+                 "is_active", "winner", "is_attacker_turn", "_subset_tables", "_harmless", "_harmless_masks",
+                 "short_circuit", "_skip_logged", "attacker_total_damage", "defender_total_damage",
+                 "turns_played", "skipped_turns", "ineffective_turns", "stats", "_stat_rows", "_stronghold_row", "log", "tape",
+                 "start_time", "_turn_time", "revision")
+    
+    def __init__(self, battle_id, attacking_set, defending_set, stronghold_id, rng=None, log_level=LOG_FULL):
         self.id = battle_id
         self.attacking_set = attacking_set
         self.defending_set = defending_set
         self.stronghold_id = stronghold_id
         
+        # Random stream for this battle. Every turn draws one TURN_DRAWS block,
+        # the same layout the vectorized kernel consumes.
+        self.rng = rng if rng is not None else np.random.default_rng()
+        
         # Battle state
         self.current_step = 0
         self.max_steps = 50
         self.is_active = True
         self.winner = None
         self.is_attacker_turn = True  # Attacker goes first
+        self.revision = 0  # Bumped by every turn and result, so views of the battle can be cached
+        self._subset_tables = None  # Built on the first turn
+        self._harmless = (False, False)  # Whether each side can no longer deal damage
+        self._harmless_masks = None  # Alive masks _harmless was computed for
+        
+        # Skip turns that cannot change anything. Only valid while no other
+        # battle can change these sets' heroes; GameState clears it otherwise.
+        self.short_circuit = True
+        self._skip_logged = [False, False]
         
         # Damage tracking for tie-breaking
         self.attacker_total_damage = 0
         self.defender_total_damage = 0
+        self.turns_played = 0
+        self.skipped_turns = 0  # Turns of turns_played a stalemate jump counted without playing
+        self.ineffective_turns = 0
+        
+        # Match-wide BattleStats counters, updated in place as turns are played
+        self.stats = None
+        self._stat_rows = None  # Hero rows in stats, [side][slot]
+        self._stronghold_row = None
         
-        # Battle log for viewing
-        self.battle_log = []
+        # Battle log for viewing, formatted only when read
+        self.log = BattleLog(self, log_level)
+        self.tape = None  # BattleTape that can rebuild a full log on demand
         self.start_time = time.time()
+        self._turn_time = 0.0  # Timestamp shared by the records of one turn
         
         # Initial log entry
-        self._log_action(f"Battle started at {stronghold_id}: {attacking_set.id} vs {defending_set.id}")
+        self._log(START)
+    
+    def track_stats(self, stats, attacking_alliance=NO_ALLIANCE, defending_alliance=NO_ALLIANCE):
+        """Count this battle's turns in a BattleStats"""
+        self.stats = stats
+        self._stat_rows, self._stronghold_row = stats.start_battle(self, attacking_alliance, defending_alliance)
+    
+    def _tally_action(self, side, slot, ineffective, damage, share=1):
+        """Count a hero's action, or its share of an expected turn, in the stats"""
+        counters = self.stats.hero_counters
+        row = self._stat_rows[side][slot]
+        counters[TURNS_ACTED, row] += share
+        counters[INEFFECTIVE_TURNS, row] += share * ineffective
+        counters[DAMAGE_DEALT, row] += damage
+    
+    @property
+    def battle_log(self):
+        """Battle log entries as text"""
+        return self.log.to_list()
+    
+    def _log(self, kind, side=0, slot=0, a=0, b=0):
+        """Add a structured record to the battle log if its level is kept"""
+        if self.log.wants(kind):
+            self.log.record(kind, time.time() - self.start_time, side, slot, a, b)
     
     def _log_action(self, message):
-        """Add an action to the battle log"""
-        timestamp = time.time() - self.start_time
-        self.battle_log.append(f"[{timestamp:.1f}s] {message}")
+        """Add a free-text action to the battle log"""
+        self._log(MESSAGE, a=message)
+    
+    def _turn_sets(self):
+        """Get (acting_set, defending_set, acting_side) for the current turn.
+        
+        Sides index (attacking_set, defending_set): 0 for attacker, 1 for defender.
+        """
+        if self.is_attacker_turn:
+            return self.attacking_set, self.defending_set, 0
+        return self.defending_set, self.attacking_set, 1
+    
+    def turn_index(self):
+        """Position in the battle's turn order: two turns per step, attacker first"""
+        return 2 * self.current_step + (0 if self.is_attacker_turn else 1)
+    
+    def _subset_table(self, side=None):
+        """Get the subset table for a side, by default the side acting this turn"""
+        if self._subset_tables is None:
+            self._subset_tables = (
+                SubsetTable(self.attacking_set, self.defending_set),
+                SubsetTable(self.defending_set, self.attacking_set),
+            )
+        if side is None:
+            side = 0 if self.is_attacker_turn else 1
+        return self._subset_tables[side]
+    
+    def _harmless_sides(self, masks=None):
+        """Get (attacker_harmless, defender_harmless) for the current living heroes.
+        
+        A side is harmless when none of its living heroes out-attacks the
+        other side's average defense. Its turns then change nothing, so the
+        other side's living heroes, and with them the harmlessness, stay fixed.
+        masks are the (attacker, defender) alive masks if already known.
+        """
+        if masks is None:
+            masks = (alive_mask(self.attacking_set), alive_mask(self.defending_set))
+        if masks != self._harmless_masks:
+            self._harmless_masks = masks
+            self._harmless = tuple(
+                all(self._subset_table(side).damage_per_hit[slot][masks[1 - side]] <= 0
+                    for slot in LIVING_SLOTS[masks[side]])
+                for side in (0, 1)
+            )
+        return self._harmless
+    
+    def can_short_circuit(self):
+        """Check whether this turn can be skipped or the battle decided outright"""
+        if not (self.short_circuit and self.is_active):
+            return False
+        harmless = self._harmless_sides()
+        return harmless[0 if self.is_attacker_turn else 1] or all(harmless)
+    
+    def _short_circuit(self, side, masks=None, expected=False):
+        """Skip a turn that cannot deal damage; get whether it was skipped.
+        
+        With both sides harmless nothing changes before the step limit, so the
+        battle jumps straight to its tie-break. A turn of a single harmless
+        side still uses up its random numbers, so the other side's turns see
+        the stream the full battle would have given them.
+        """
+        harmless = self._harmless_sides(masks)
+        if all(harmless):
+            self._log(NO_DAMAGE, a=2)
+            self._count_skipped_turns(masks, expected)
+            self.current_step = self.max_steps
+            self.is_attacker_turn = True
+            self._check_victory_conditions()
+            return True
+        
+        if not harmless[side]:
+            return False
+        if not self._skip_logged[side]:
+            self._skip_logged[side] = True
+            self._log(NO_DAMAGE, a=side)
+        draws = self.rng.random(TURN_DRAWS)
+        self.ineffective_turns += 1
+        if self.stats is not None:
+            # Count the hero the skipped turn would have picked
+            living_actors = LIVING_SLOTS[masks[side] if masks else alive_mask(self._turn_sets()[0])]
+            self._tally_action(side, living_actors[min(int(draws[0] * len(living_actors)), len(living_actors) - 1)], 1, 0)
+        self._end_turn()
+        return True
+    
+    def _count_skipped_turns(self, masks=None, expected=False):
+        """Count the turns a stalemate jump skips as playing them would have.
+        
+        Each is an ineffective turn: of the hero its random numbers pick, as
+        _play_turn picks it, or in expected mode shared by the living heroes.
+        Every living hero survives every one of them.
+        """
+        remaining = 2 * self.max_steps - self.turn_index()
+        if remaining <= 0:
+            return
+        if masks is None:
+            masks = (alive_mask(self.attacking_set), alive_mask(self.defending_set))
+        # The stream the skipped turns would have drawn
+        picks = None if expected else self.rng.random((remaining, TURN_DRAWS))[:, 0]
+        self.turns_played += remaining
+        self.skipped_turns += remaining
+        self.ineffective_turns += remaining
+        if self.stats is None:
+            return
+        
+        counters = self.stats.hero_counters
+        first = 0 if self.is_attacker_turn else 1
+        for side in (0, 1):
+            living = LIVING_SLOTS[masks[side]]
+            rows = self._stat_rows[side]
+            acting = range((side - first) % 2, remaining, 2)  # Skipped turns this side would act in
+            if expected:
+                for slot in living:
+                    self._tally_action(side, slot, 1, 0, len(acting) / len(living))
+            else:
+                for pick in picks[acting].tolist():
+                    self._tally_action(side, living[min(int(pick * len(living)), len(living) - 1)], 1, 0)
+            for slot in living:
+                counters[TURNS_SURVIVED, rows[slot]] += remaining
     
     def execute_turn(self):
         """Execute one turn of the battle"""
@@ -40,43 +256,51 @@ class SummitBattle:
             return
         
         # Determine acting and defending sets
-        if self.is_attacker_turn:
-            acting_set = self.attacking_set
-            defending_set = self.defending_set
-            side_name = "Attacker"
-        else:
-            acting_set = self.defending_set
-            defending_set = self.attacking_set
-            side_name = "Defender"
+        acting_set, defending_set, side = self._turn_sets()
         
-        # Check if acting side has living heroes
-        living_actors = acting_set.get_living_heroes()
-        living_defenders = defending_set.get_living_heroes()
+        # Check if both sides have living heroes
+        actor_mask = alive_mask(acting_set)
+        target_mask = alive_mask(defending_set)
         
-        if not living_actors or not living_defenders:
-            self._end_battle()
+        if not actor_mask or not target_mask:
+            self._check_victory_conditions()
+            return
+        
+        masks = (actor_mask, target_mask) if side == 0 else (target_mask, actor_mask)
+        if self.short_circuit and self._short_circuit(side, masks):
             return
         
+        self._play_turn(acting_set, defending_set, side, actor_mask, target_mask)
+    
+    def _play_turn(self, acting_set, defending_set, side, actor_mask, target_mask):
+        """Play one random turn between sets that both have living heroes"""
+        # Draw this turn's random numbers as one fixed-size block
+        draws = self.rng.random(TURN_DRAWS).tolist()
+        
         # Select random hero to act
-        acting_hero = random.choice(living_actors)
+        living_actors = LIVING_SLOTS[actor_mask]
+        hero_slot = living_actors[min(int(draws[0] * len(living_actors)), len(living_actors) - 1)]
         
         # Generate random number of hits (1-4)
-        num_hits = random.randint(1, 4)
+        num_hits = 1 + min(int(draws[1] * MAX_HITS), MAX_HITS - 1)
         
-        self._log_action(f"{side_name} {acting_hero.id} attacks with {num_hits} hits")
+        self._log_turn(ATTACK, side, hero_slot, num_hits)
         
-        # Calculate damage per hit
-        avg_defense = defending_set.get_average_defense()
-        damage_per_hit = max(0, acting_hero.attack - avg_defense)
+        # Damage per hit against the defenders alive at the start of the turn
+        table = self._subset_table()
+        damage_per_hit = table.damage_per_hit[hero_slot][target_mask]
         
         if damage_per_hit <= 0:
-            self._log_action(f"Attack ineffective! (ATK:{acting_hero.attack} vs AVG_DEF:{avg_defense:.1f})")
+            self._log_turn(INEFFECTIVE, side, hero_slot, table.average_defense[target_mask])
+            self.ineffective_turns += 1
             total_damage = 0
         else:
             # Apply damage for each hit
             total_damage = 0
+            living_defenders = LIVING_SLOTS[target_mask]
             for hit in range(num_hits):
-                hit_damage = self._apply_aoe_damage(damage_per_hit, living_defenders)
+                hit_weights = draws[2 + hit * SET_SIZE:2 + (hit + 1) * SET_SIZE]
+                hit_damage = self._apply_aoe_damage(damage_per_hit, defending_set.heroes, living_defenders, hit_weights, 1 - side)
                 total_damage += hit_damage
             
             # Track total damage for tie-breaking
@@ -85,6 +309,182 @@ class SummitBattle:
             else:
                 self.defender_total_damage += total_damage
         
+        if self.stats is not None:
+            self._tally_action(side, hero_slot, damage_per_hit <= 0, total_damage)
+        self._end_turn()
+    
+    def execute_expected_turn(self):
+        """Execute one deterministic turn using expected damage.
+        
+        The acting side deals the mean damage per hit of its living heroes,
+        MEAN_HITS times, split evenly over the living defenders. No random
+        numbers are drawn.
+        """
+        if not self.is_active:
+            return
+        
+        acting_set, defending_set, side = self._turn_sets()
+        actor_mask = alive_mask(acting_set)
+        target_mask = alive_mask(defending_set)
+        
+        if not actor_mask or not target_mask:
+            self._check_victory_conditions()
+            return
+        
+        if self.short_circuit and all(self._harmless_sides()):
+            self._short_circuit(side, expected=True)
+            return
+        
+        table = self._subset_table()
+        living_actors = LIVING_SLOTS[actor_mask]
+        expected_per_hit = 0
+        for slot in living_actors:
+            expected_per_hit += table.damage_per_hit[slot][target_mask]
+        expected_per_hit /= len(living_actors)
+        
+        if self.log.wants(EXPECTED_ATTACK):
+            self._turn_time = time.time() - self.start_time
+            self.log.record(EXPECTED_ATTACK, self._turn_time, side, 0, expected_per_hit)
+        
+        total_damage = 0
+        if expected_per_hit > 0:
+            living_defenders = LIVING_SLOTS[target_mask]
+            per_defender = MEAN_HITS * expected_per_hit / len(living_defenders)
+            log_hits = self.log.wants(HIT)
+            for slot in living_defenders:
+                defender = defending_set.heroes[slot]
+                actual_damage = defender.take_damage(per_defender)
+                total_damage += actual_damage
+                if log_hits:
+                    self.log.record(HIT, self._turn_time, 1 - side, slot, actual_damage, defender.current_hp)
+                if self.stats is not None:
+                    row = self._stat_rows[1 - side][slot]
+                    self.stats.hero_counters[DAMAGE_TAKEN, row] += actual_damage
+                    self.stats.hero_counters[DEATHS, row] += not defender.is_alive
+            
+            if self.is_attacker_turn:
+                self.attacker_total_damage += total_damage
+            else:
+                self.defender_total_damage += total_damage
+        
+        # Each living hero takes an equal share of the turn and deals damage
+        # in proportion to its damage per hit
+        share = 1 / len(living_actors)
+        for slot in living_actors:
+            hero_damage = table.damage_per_hit[slot][target_mask]
+            self.ineffective_turns += share * (hero_damage <= 0)
+            if self.stats is not None:
+                dealt = total_damage * share * hero_damage / expected_per_hit if expected_per_hit > 0 else 0
+                self._tally_action(side, slot, hero_damage <= 0, dealt, share)
+        self._end_turn()
+    
+    def apply_turn_result(self, hero_slot, num_hits, damage_per_hit, dealt, target_hp, target_alive, side_damage):
+        """Apply one turn computed by the vectorized kernel.
+        
+        dealt holds the damage each hit did to each hero slot; target_hp,
+        target_alive and side_damage are the kernel's state after the turn.
+        """
+        acting_set, defending_set, side = self._turn_sets()
+        
+        self._log_turn(ATTACK, side, hero_slot, num_hits)
+        
+        if damage_per_hit <= 0:
+            avg_defense = self._subset_table().average_defense[alive_mask(defending_set)]
+            self._log_turn(INEFFECTIVE, side, hero_slot, avg_defense)
+            self.ineffective_turns += 1
+            if self.stats is not None:
+                self._tally_action(side, hero_slot, 1, 0)
+        else:
+            # Log each hit against the HP it left, then take the kernel's final state
+            if self.log.wants(HIT):
+                hp = {slot: defending_set.heroes[slot].current_hp for slot in LIVING_SLOTS[alive_mask(defending_set)]}
+                for hit in range(num_hits):
+                    for slot in hp:
+                        damage = float(dealt[hit][slot])
+                        hp[slot] = max(0, hp[slot] - damage)
+                        self.log.record(HIT, self._turn_time, 1 - side, slot, damage, hp[slot])
+            
+            if self.stats is not None:
+                taken = dealt[:num_hits].sum(axis=0)
+                counters = self.stats.hero_counters
+                for slot, hero in enumerate(defending_set.heroes[:SET_SIZE]):
+                    row = self._stat_rows[1 - side][slot]
+                    counters[DAMAGE_TAKEN, row] += taken[slot]
+                    counters[DEATHS, row] += hero.is_alive and not target_alive[slot]
+                self._tally_action(side, hero_slot, 0, float(taken.sum()))
+            
+            for slot, hero in enumerate(defending_set.heroes[:SET_SIZE]):
+                hero.current_hp = float(target_hp[slot])
+                hero.is_alive = bool(target_alive[slot])
+            
+            if self.is_attacker_turn:
+                self.attacker_total_damage = float(side_damage)
+            else:
+                self.defender_total_damage = float(side_damage)
+        
+        self._end_turn()
+    
+    def apply_battle_result(self, hp, alive, step, attacker_turn, damage, tallies=None, skipped_turns=0):
+        """Apply the final state of a battle the vectorized kernel played to the end.
+        
+        hp and alive are indexed [side, slot]; damage holds each side's total.
+        tallies are the kernel's [field, side, slot] counters for the battle,
+        which count skipped_turns turns a stalemate jump did not play.
+        """
+        if tallies is not None:
+            self.turns_played += int(tallies[TURNS_ACTED].sum())
+            self.skipped_turns += skipped_turns
+            self.ineffective_turns += int(tallies[INEFFECTIVE_TURNS].sum())
+            if self.stats is not None:
+                self.stats.add_tallies(self._stat_rows, tallies)
+        for side, hero_set in enumerate((self.attacking_set, self.defending_set)):
+            for slot, hero in enumerate(hero_set.heroes[:SET_SIZE]):
+                hero.current_hp = float(hp[side][slot])
+                hero.is_alive = bool(alive[side][slot])
+        self.current_step = step
+        self.is_attacker_turn = bool(attacker_turn)
+        self.attacker_total_damage = float(damage[0])
+        self.defender_total_damage = float(damage[1])
+        self._check_victory_conditions()
+    
+    def adopt_result(self, played):
+        """Take the outcome of a copy of this battle that was played to the end.
+        
+        The copy's heroes are in the same slots; its log and stat counts
+        become this battle's.
+        """
+        own_heroes = self.attacking_set.heroes + self.defending_set.heroes
+        played_heroes = played.attacking_set.heroes + played.defending_set.heroes
+        for hero, played_hero in zip(own_heroes, played_heroes):
+            hero.current_hp = played_hero.current_hp
+            hero.is_alive = played_hero.is_alive
+        
+        self.current_step = played.current_step
+        self.is_attacker_turn = played.is_attacker_turn
+        self.attacker_total_damage = played.attacker_total_damage
+        self.defender_total_damage = played.defender_total_damage
+        self.turns_played += played.turns_played
+        self.skipped_turns += played.skipped_turns
+        self.ineffective_turns += played.ineffective_turns
+        self.winner = played.winner
+        self.log = played.log
+        self.log.battle = self
+        self.is_active = False
+        self.revision += 1
+        if self.stats is not None:
+            if played.stats is not None:
+                self.stats.add_tallies(self._stat_rows, played.stats.hero_counters[:, played._stat_rows])
+            self.stats.finish_battle(self, self._stronghold_row)
+    
+    def _end_turn(self):
+        """Hand the turn to the other side and check for a result"""
+        self.turns_played += 1
+        if self.stats is not None:
+            counters = self.stats.hero_counters
+            for side, hero_set in enumerate((self.attacking_set, self.defending_set)):
+                for slot in LIVING_SLOTS[alive_mask(hero_set)]:
+                    counters[TURNS_SURVIVED, self._stat_rows[side][slot]] += 1
+        
         # Switch turns
         self.is_attacker_turn = not self.is_attacker_turn
         
@@ -95,51 +495,70 @@ class SummitBattle:
         # Check victory conditions
         self._check_victory_conditions()
     
-    def _apply_aoe_damage(self, damage_per_hit, living_defenders):
-        """Apply AoE damage with random weighting"""
-        if not living_defenders or damage_per_hit <= 0:
+    def _log_turn(self, kind, side, slot, a):
+        """Log a turn record and stamp the time its hit records share"""
+        if self.log.wants(kind):
+            if kind == ATTACK:
+                self._turn_time = time.time() - self.start_time
+            self.log.record(kind, self._turn_time, side, slot, a)
+    
+    def _apply_aoe_damage(self, damage_per_hit, heroes, living_slots, hit_weights, target_side=1):
+        """Apply AoE damage with random weighting.
+        
+        Each hero in living_slots is weighted by hit_weights[slot].
+        """
+        if not living_slots or damage_per_hit <= 0:
             return 0
         
-        # Generate random weights for each living defender
-        weights = [random.random() for _ in living_defenders]
-        total_weight = sum(weights)
+        # Random weights for each living defender, summed in slot order
+        total_weight = 0
+        for slot in living_slots:
+            total_weight += hit_weights[slot]
         
         if total_weight <= 0:
             return 0
         
         # Normalize weights and apply damage
         total_damage_dealt = 0
-        for i, defender in enumerate(living_defenders):
-            weight_proportion = weights[i] / total_weight
+        log_hits = self.log.wants(HIT)
+        counters = self.stats.hero_counters if self.stats is not None else None
+        for slot in living_slots:
+            defender = heroes[slot]
+            weight_proportion = hit_weights[slot] / total_weight
             damage_to_apply = damage_per_hit * weight_proportion
             
+            was_alive = defender.is_alive
             actual_damage = defender.take_damage(damage_to_apply)
             total_damage_dealt += actual_damage
             
-            if not defender.is_alive:
-                self._log_action(f"  {defender.id} defeated! (took {actual_damage:.1f} damage)")
-            else:
-                self._log_action(f"  {defender.id} takes {actual_damage:.1f} damage (HP: {defender.current_hp:.1f}/{defender.max_hp})")
+            if counters is not None:
+                row = self._stat_rows[target_side][slot]
+                counters[DAMAGE_TAKEN, row] += actual_damage
+                counters[DEATHS, row] += was_alive and not defender.is_alive
+            
+            if log_hits:
+                self.log.record(HIT, self._turn_time, target_side, slot, actual_damage, defender.current_hp)
         
         return total_damage_dealt
     
     def _check_victory_conditions(self):
         """Check if battle should end based on victory conditions"""
-        attacker_living = len(self.attacking_set.get_living_heroes())
-        defender_living = len(self.defending_set.get_living_heroes())
+        self.revision += 1  # Every turn and every result played ends here
+        attacker_living = alive_mask(self.attacking_set)
+        defender_living = alive_mask(self.defending_set)
         
         # Check if one side is completely defeated
         if attacker_living == 0 and defender_living > 0:
             self.winner = "defender"
-            self._log_action(f"Defenders win! All attackers defeated.")
+            self._log(ALL_DEFEATED, a=self.winner)
             self._end_battle()
         elif defender_living == 0 and attacker_living > 0:
             self.winner = "attacker"
-            self._log_action(f"Attackers win! All defenders defeated.")
+            self._log(ALL_DEFEATED, a=self.winner)
             self._end_battle()
         elif attacker_living == 0 and defender_living == 0:
             self.winner = "draw"
-            self._log_action(f"Draw! All heroes defeated.")
+            self._log(ALL_DEFEATED, a=self.winner)
             self._end_battle()
         elif self.current_step >= self.max_steps:
             # 50 step limit reached
@@ -150,28 +569,27 @@ class SummitBattle:
         """Resolve battle when 50 step limit is reached"""
         if self.attacker_total_damage > self.defender_total_damage:
             self.winner = "attacker"
-            self._log_action(f"Attackers win by damage! (ATK:{self.attacker_total_damage:.1f} vs DEF:{self.defender_total_damage:.1f})")
-        elif self.defender_total_damage > self.attacker_total_damage:
-            self.winner = "defender"
-            self._log_action(f"Defenders win by damage! (DEF:{self.defender_total_damage:.1f} vs ATK:{self.attacker_total_damage:.1f})")
         else:
             # Equal damage - defender wins (attacker loses on tie)
             self.winner = "defender"
-            self._log_action(f"Tie in damage - Defenders win! (Both dealt {self.attacker_total_damage:.1f} damage)")
+        self._log(WIN_BY_DAMAGE, a=self.attacker_total_damage, b=self.defender_total_damage)
     
     def _end_battle(self):
         """End the battle"""
         self.is_active = False
+        if self.stats is not None:
+            self.stats.finish_battle(self, self._stronghold_row)
         duration = time.time() - self.start_time
-        self._log_action(f"Battle ended after {self.current_step} steps ({duration:.1f}s)")
+        self._log(END, a=duration)
     
-    def simulate_to_completion(self):
-        """Simulate entire battle to completion"""
+    def simulate_to_completion(self, mode=SAMPLED):
+        """Simulate entire battle to completion with SAMPLED or EXPECTED turns"""
+        turn = self.execute_expected_turn if mode == EXPECTED else self.execute_turn
         turn_count = 0
         max_turns = 1000  # Safety limit
         
         while self.is_active and turn_count < max_turns:
-            self.execute_turn()
+            turn()
             turn_count += 1
             
             # Safety check
@@ -200,8 +618,14 @@ class SummitBattle:
         }
     
     def get_recent_log_entries(self, count=10):
-        """Get recent battle log entries"""
-        return self.battle_log[-count:]
+        """Get recent battle log entries.
+        
+        When the battle keeps less than a full log, the full log is rebuilt
+        by replaying its tape up to the current turn.
+        """
+        if self.log.level < LOG_FULL and self.tape is not None and self.tape.exact:
+            return self.tape.replay(until=self).get_recent_log_entries(count)
+        return self.log.recent(count)
     
     def __repr__(self):
         status = "Active" if self.is_active else f"Ended ({self.winner} wins)"
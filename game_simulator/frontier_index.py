@@ -0,0 +1,66 @@
+# game_simulator/frontier_index.py
+
+
+class FrontierIndex:
+    """Each alliance's frontier: the strongholds next to its own that it does not hold.
+
+    This is what get_adjacent_strongholds finds by walking every controlled
+    stronghold's connections, kept up to date as strongholds change hands
+    instead. support counts, per alliance and target, the connections into
+    the target from the alliance's strongholds, so a target only leaves the
+    frontier when its last connection goes. Frontiers are dicts used as
+    ordered sets: membership is a lookup and iteration follows the order
+    targets were reached. Protection is left to Stronghold.can_be_attacked.
+    """
+
+    def __init__(self, strongholds):
+        self.strongholds = strongholds
+        self.owners = {}  # Stronghold id -> controlling alliance id, for held strongholds
+        self.support = {}  # Alliance id -> {stronghold id: connections into it from the alliance}
+        self.frontiers = {}  # Alliance id -> {stronghold id: None} of reachable strongholds it does not hold
+        self.revision = 0  # Bumped whenever a stronghold changes hands
+        for stronghold_id, stronghold in strongholds.items():
+            if stronghold.controlling_alliance is not None:
+                self.set_owner(stronghold_id, stronghold.controlling_alliance)
+
+    def _connections(self, stronghold_id):
+        return [target for target in self.strongholds[stronghold_id].connections if target in self.strongholds]
+
+    def set_owner(self, stronghold_id, alliance_id):
+        """Record that a stronghold changed hands; alliance_id None leaves it neutral"""
+        old = self.owners.get(stronghold_id)
+        if old == alliance_id:
+            return
+        connections = self._connections(stronghold_id)
+        self.revision += 1
+
+        if old is not None:
+            del self.owners[stronghold_id]
+            support = self.support[old]
+            frontier = self.frontiers[old]
+            for target in connections:
+                support[target] -= 1
+                if not support[target]:
+                    del support[target]
+                    frontier.pop(target, None)
+            if stronghold_id in support:  # The old owner still borders it
+                frontier[stronghold_id] = None
+
+        if alliance_id is not None:
+            self.owners[stronghold_id] = alliance_id
+            support = self.support.setdefault(alliance_id, {})
+            frontier = self.frontiers.setdefault(alliance_id, {})
+            for target in connections:
+                support[target] = support.get(target, 0) + 1
+                if self.owners.get(target) != alliance_id:
+                    frontier[target] = None
+            frontier.pop(stronghold_id, None)
+
+    def frontier(self, alliance_id):
+        """Ids of the strongholds an alliance borders and does not hold, as a read-only view"""
+        return self.frontiers.get(alliance_id, {}).keys()
+
+    def attackable(self, alliance_id):
+        """Frontier strongholds that are not protected right now"""
+        return [stronghold_id for stronghold_id in self.frontier(alliance_id)
+                if self.strongholds[stronghold_id].can_be_attacked()]
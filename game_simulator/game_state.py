@@ -1,14 +1,29 @@
 # game_simulator/game_state.py
+import heapq
 import time
 from .entities.alliance import Alliance
-from .entities.summit_battle import SummitBattle
+from .entities.summit_battle import SummitBattle, SAMPLED, EXPECTED
+from .entities.battle_tape import BattleTape
+from .entities.battle_log import LOG_OUTCOME
 from .map_layout import create_game_map
+from .frontier_index import FrontierIndex
+from .state_views import StateViews
+from .rng import new_match_seed, battle_rng, roster_rng, outcome_rng, comparison_rng
+from .simulation.outcome_table import NpcOutcomeTable
+from .simulation.backends import get_backend
+from .simulation.battle_stats import BattleStats, NO_ALLIANCE
+from .simulation.win_probability import compare_attacks
 
 class GameState:
-    def __init__(self):
+    def __init__(self, vectorized_battles=False, battle_log_level=LOG_OUTCOME, seed=None, battle_mode=SAMPLED, battle_backend=None,
+                 deferred_battles=False, precompute_npc_outcomes=False):
+        # Master seed: rosters and every battle draw from streams keyed by it
+        self.seed = seed if seed is not None else new_match_seed()
+        
         # Game timing
         self.game_time = 0.0  # In-game simulated time
         self.real_start_time = time.time()
+        self.revision = 0  # Bumped by every change GameState makes: battles started, played or resolved, a new half
         
         # Game structure
         self.current_half = 1  # 1 or 2
@@ -22,10 +37,46 @@ class GameState:
         # Alliances (4 alliances with 50 players each)
         self.alliances = {}
         self._initialize_alliances()
+        self.frontier = FrontierIndex(self.strongholds)  # Kept current as strongholds are captured
+        self.views = StateViews(self)  # Status, control, scores and target lists, cached by revision
+        
+        # Every selected set against full-HP NPC teams of each level. Filled here
+        # when precomputed, else simulated when first ranked
+        self.npc_outcomes = NpcOutcomeTable(
+            [hero_set for alliance in self.alliances.values()
+             for player in alliance.players for hero_set in player.selected_hero_sets],
+            rng=outcome_rng(self.seed), pilot_samples=8, samples=32, target_half_width=0.1
+        )
+        if precompute_npc_outcomes:
+            self.npc_outcomes.fill()
         
         # Active battles
         self.active_battles = []
         self.battle_counter = 0
+        self.battle_log_level = battle_log_level  # Verbosity of new battle logs; tapes rebuild full logs
+        self.battle_tapes = {}  # Battle id -> BattleTape, kept after the battle ends
+        self.battle_stats = BattleStats()  # Per-hero and per-stronghold counters over every battle
+        self.comparison_count = 0  # Attack comparisons so far; each draws its own stream
+        
+        # Backend that plays battle turns: a name from BACKENDS or an instance.
+        # Without one, vectorized_battles and battle_mode pick it.
+        if battle_backend is None:
+            if battle_mode == EXPECTED:
+                battle_backend = "expected"
+            else:
+                battle_backend = "vectorized" if vectorized_battles else "reference"
+        self.battle_backend = get_backend(battle_backend)
+        self.vectorized_battles = self.battle_backend.name == "vectorized"
+        self.battle_mode = self.battle_backend.mode  # SAMPLED turns, or EXPECTED for fast-forward runs
+        
+        # Deferred mode plays each battle out on a copy on the update after it
+        # starts and resolves it on the update it would have ended on
+        self.deferred_battles = deferred_battles
+        self.battle_updates = 0  # update_battles calls so far
+        self.scheduled_battles = []  # Heap of (update number, order, battle) for deferred battles
+        self.pending_battles = {}  # Deferred battle -> (played copy, update of its first turn)
+        self._stepped_battles = set()  # Battles played turn by turn in deferred mode
+        self._scheduled_count = 0
         
         # Game events and history
         self.event_log = []
@@ -45,7 +96,7 @@ class GameState:
         ]
         
         for alliance_id, name, color in alliance_data:
-            alliance = Alliance(alliance_id, name, color)
+            alliance = Alliance(alliance_id, name, color, rng=roster_rng(self.seed, alliance_id))
             
             # Set alliance home
             home_id = f"T{alliance_id}"
@@ -84,9 +135,17 @@ class GameState:
         # Create battle
         self.battle_counter += 1
         battle_id = f"Battle_{self.battle_counter}"
-        battle = SummitBattle(battle_id, attacking_set, defending_set, stronghold_id)
+        battle = SummitBattle(battle_id, attacking_set, defending_set, stronghold_id,
+                              rng=battle_rng(self.seed, self.battle_counter), log_level=self.battle_log_level)
+        battle.tape = BattleTape.record(battle, self.seed, self.battle_counter, self.battle_mode)
+        self.battle_tapes[battle_id] = battle.tape
+        defending_alliance = self._get_alliance_by_set(defending_set)
+        battle.track_stats(self.battle_stats,
+                           attacking_alliance.id if attacking_alliance else NO_ALLIANCE,
+                           defending_alliance.id if defending_alliance else NO_ALLIANCE)
         
         self.active_battles.append(battle)
+        self.revision += 1
         self._log_event(f"Battle started: {attacking_set.id} attacks {stronghold_id}")
         
         # Mark attacking set as consumed
@@ -94,26 +153,190 @@ class GameState:
         
         return battle
     
+    def rank_npc_attacks(self, alliance_id, stronghold_level):
+        """Get an alliance's available sets, best first against NPCs of a level"""
+        alliance = self.get_alliance(alliance_id)
+        if not alliance:
+            return []
+        self.npc_outcomes.refresh()
+        return self.npc_outcomes.rank_sets(alliance.get_all_available_hero_sets(), stronghold_level)
+    
+    def compare_attacks(self, attacking_set, stronghold_ids, samples=512):
+        """Compare attacking each stronghold with a set on common random numbers.
+
+        Each option fights the defender start_battle would pick, and a win
+        is worth the points it would award now. Strongholds that cannot be
+        attacked are left out; the result lists the ones compared.
+        """
+        alliance = self._get_alliance_by_set(attacking_set)
+        candidates = []
+        compared = []
+        for stronghold_id in stronghold_ids:
+            stronghold = self.get_stronghold(stronghold_id)
+            if not stronghold or not stronghold.can_be_attacked():
+                continue
+            if alliance and not self.can_alliance_attack_stronghold(alliance.id, stronghold_id):
+                continue
+            defender = stronghold.preview_defender()  # Untouched NPC teams stay counts
+            if defender is None:
+                continue
+            win_points = self.win_points(alliance.id if alliance else None, stronghold, defender)
+            candidates.append((attacking_set, defender, win_points))
+            compared.append(stronghold_id)
+        if not candidates:
+            return None
+
+        self.comparison_count += 1
+        result = compare_attacks(candidates, samples, rng=comparison_rng(self.seed, self.comparison_count))
+        result["stronghold_ids"] = compared
+        return result
+    
     def update_battles(self, dt=None):
         """Update all active battles"""
-        completed_battles = []
-        
-        for battle in self.active_battles:
-            if battle.is_active:
-                # For real-time simulation, execute one turn per update
-                # For faster simulation, could complete entire battle
-                battle.execute_turn()
-                
-                if not battle.is_active:
-                    completed_battles.append(battle)
+        self.battle_updates += 1
+        if self.active_battles:
+            self.revision += 1
+        
+        if self.deferred_battles:
+            completed_battles = self._update_deferred_battles()
+        else:
+            # For real-time simulation, execute one turn per update
+            self._mark_shared_sets()
+            running = [battle for battle in self.active_battles if battle.is_active]
+            self.battle_backend.advance(running)
+            completed_battles = [battle for battle in running if not battle.is_active]
         
         # Process completed battles
         for battle in completed_battles:
             self._resolve_battle(battle)
             self.active_battles.remove(battle)
+            self._stepped_battles.discard(battle)
+            self.views.forget(("battle", battle.id))
+    
+    def _update_deferred_battles(self):
+        """Run one update in deferred mode; get the battles that end in it.
+        
+        A new battle whose sets are in no other battle is played out on a copy
+        and scheduled; the real battle is untouched until it lands. One that
+        shares a set is played turn by turn, and any deferred battle holding
+        that set first catches up to where it would be now, so every battle
+        sees the same turns as in per-update mode.
+        """
+        new_battles = [battle for battle in self.active_battles
+                       if battle.is_active and battle not in self.pending_battles
+                       and battle not in self._stepped_battles]
+        holders = {}  # Set -> battle already holding it
+        for battle in self.active_battles:
+            if battle.is_active and battle not in new_battles:
+                for hero_set in (battle.attacking_set, battle.defending_set):
+                    holders[id(hero_set)] = battle
+        
+        deferred = []
+        for battle in new_battles:
+            set_keys = (id(battle.attacking_set), id(battle.defending_set))
+            others = [holders[key] for key in set_keys if key in holders]
+            if others or battle.tape is None:
+                for other in others:
+                    if other in self.pending_battles:
+                        self._catch_up(other)
+                self._stepped_battles.add(battle)
+            else:
+                deferred.append(battle)
+            for key in set_keys:
+                holders[key] = battle
+        
+        # A set shared inside the new batch makes its earlier holder stepped too
+        set_counts = {}
+        for battle in deferred:
+            for hero_set in (battle.attacking_set, battle.defending_set):
+                set_counts[id(hero_set)] = set_counts.get(id(hero_set), 0) + 1
+        for battle in self.active_battles:
+            if battle in self._stepped_battles:
+                for hero_set in (battle.attacking_set, battle.defending_set):
+                    set_counts[id(hero_set)] = set_counts.get(id(hero_set), 0) + 1
+        shared = [battle for battle in deferred
+                  if set_counts[id(battle.attacking_set)] > 1 or set_counts[id(battle.defending_set)] > 1]
+        self._stepped_battles.update(shared)
+        deferred = [battle for battle in deferred if battle not in self._stepped_battles]
+        
+        self._mark_shared_sets()
+        stepped = [battle for battle in self.active_battles if battle in self._stepped_battles and battle.is_active]
+        self.battle_backend.advance(stepped)
+        completed_battles = [battle for battle in stepped if not battle.is_active]
+        
+        self._schedule_battles(deferred)
+        while self.scheduled_battles and self.scheduled_battles[0][0] <= self.battle_updates:
+            battle = heapq.heappop(self.scheduled_battles)[2]
+            if battle in self.pending_battles:  # Not caught up and stepped meanwhile
+                battle.adopt_result(self.pending_battles.pop(battle)[0])
+                completed_battles.append(battle)
+        
+        # Resolve in start order, as per-update mode does
+        completed_battles.sort(key=self.active_battles.index)
+        return completed_battles
+    
+    def _schedule_battles(self, battles):
+        """Play copies of new battles to the end and schedule their resolution.
+        
+        A battle takes one update per turn, plus one for a stalemate skipped
+        to the step limit or a battle decided before its first turn. This
+        update counts as its first.
+        """
+        if not battles:
+            return
+        scratch_stats = BattleStats()  # Copies count here; adopt_result moves the counts over
+        copies = []
+        for battle in battles:
+            played = battle.tape.new_battle(battle.log.level)
+            played.short_circuit = battle.short_circuit
+            played.track_stats(scratch_stats)
+            copies.append(played)
+        self.battle_backend.run(copies)
+        
+        for battle, played in zip(battles, copies):
+            turns = played.turns_played - played.skipped_turns
+            updates = turns + (played.turn_index() != turns)
+            landing = self.battle_updates + max(1, updates) - 1
+            self._scheduled_count += 1
+            heapq.heappush(self.scheduled_battles, (landing, self._scheduled_count, battle))
+            self.pending_battles[battle] = (played, self.battle_updates)
+    
+    def _catch_up(self, battle):
+        """Play a deferred battle's real turns up to this update and step it from now on"""
+        _, first_update = self.pending_battles.pop(battle)
+        for _ in range(self.battle_updates - first_update):
+            self.battle_backend.advance([battle])
+        self._stepped_battles.add(battle)
+    
+    def _mark_shared_sets(self):
+        """Only let battles whose sets are in no other active battle skip turns"""
+        battle_counts = {}
+        running = [battle for battle in self.active_battles if battle.is_active]
+        for battle in running:
+            for hero_set in (battle.attacking_set, battle.defending_set):
+                battle_counts[id(hero_set)] = battle_counts.get(id(hero_set), 0) + 1
+        
+        for battle in running:
+            battle.short_circuit = (battle_counts[id(battle.attacking_set)] == 1
+                                    and battle_counts[id(battle.defending_set)] == 1)
+            # Another battle may change these heroes, which a replay would miss
+            if not battle.short_circuit and battle.tape is not None:
+                battle.tape.exact = False
+    
+    def get_battle(self, battle_id):
+        """Get an active battle, or a replay of a finished one from its tape"""
+        for battle in self.active_battles:
+            if battle.id == battle_id:
+                return battle
+        tape = self.battle_tapes.get(battle_id)
+        if tape is None or not tape.exact:
+            return None
+        return tape.replay()
     
     def _resolve_battle(self, battle):
         """Resolve the outcome of a completed battle"""
+        if battle.tape is not None:
+            battle.tape.release()
         stronghold = self.get_stronghold(battle.stronghold_id)
         if not stronghold:
             return
@@ -141,6 +364,7 @@ class GameState:
                         actual_capturing_alliance = self.get_alliance(capturing_alliance_id)
                         if actual_capturing_alliance:
                             actual_capturing_alliance.add_stronghold(stronghold.id)
+                            self.frontier.set_owner(stronghold.id, capturing_alliance_id)
                             
                             # Award capture points to the alliance that actually captured
                             self._award_capture_points(actual_capturing_alliance, stronghold)
@@ -169,8 +393,24 @@ class GameState:
             attacking_alliance = self._get_alliance_by_set(battle.attacking_set)
             self._log_event(f"Attack repelled at {stronghold.id} by defenders")
     
-    def _award_team_defeat_points(self, alliance, stronghold, is_npc=True):
-        """Award points for defeating a team at a stronghold"""
+    def win_points(self, alliance_id, stronghold, defending_set):
+        """Points an alliance would get now for beating a defending set at a stronghold"""
+        is_npc = defending_set.is_npc
+        points = sum(self._team_defeat_points(stronghold, is_npc))
+        
+        # Beating the last NPC team captures, if the alliance has the most defeats there.
+        # A living NPC defender is one of the stronghold's active teams, or a preview of one
+        remaining = stronghold.count_active_npc_teams() - (is_npc and not defending_set.is_defeated())
+        if is_npc and not remaining and not stronghold.is_alliance_home and alliance_id is not None:
+            defeats = dict(stronghold.npc_teams_defeated_by_alliance)
+            defeats[alliance_id] = defeats.get(alliance_id, 0) + 1
+            most = max(defeats.values())
+            if min(aid for aid, count in defeats.items() if count == most) == alliance_id:
+                points += sum(self._capture_points(stronghold))
+        return points
+    
+    def _team_defeat_points(self, stronghold, is_npc=True):
+        """Get (base points, first-time bonus) for defeating a team at a stronghold"""
         # Base points based on stronghold level
         base_points = {
             1: 40,   # Level 1 stronghold
@@ -178,16 +418,34 @@ class GameState:
             3: 80    # Level 3 stronghold
         }.get(stronghold.level, 40)
         
+        # First-time bonus for NPC defeats (40% bonus)
+        bonus_points = 0
+        if is_npc and f"{stronghold.id}_npc" not in self.first_time_npc_defeats:
+            bonus_points = int(base_points * 0.4)
+        return base_points, bonus_points
+    
+    def _capture_points(self, stronghold):
+        """Get (base points, first-time bonus) for capturing a stronghold"""
+        # Base occupation points based on stronghold level
+        base_points = {
+            1: 200,   # Level 1 stronghold
+            2: 420,   # Level 2 stronghold
+            3: 720    # Level 3 stronghold
+        }.get(stronghold.level, 200)
+        
+        # First-time capture bonus (40% bonus)
+        bonus_points = int(base_points * 0.4) if stronghold.id not in self.first_time_captures else 0
+        return base_points, bonus_points
+    
+    def _award_team_defeat_points(self, alliance, stronghold, is_npc=True):
+        """Award points for defeating a team at a stronghold"""
+        base_points, bonus_points = self._team_defeat_points(stronghold, is_npc)
         points_awarded = base_points
         
-        # First-time bonus for NPC defeats (40% bonus)
-        if is_npc:
-            defeat_key = f"{stronghold.id}_npc"
-            if defeat_key not in self.first_time_npc_defeats:
-                self.first_time_npc_defeats.add(defeat_key)
-                bonus_points = int(base_points * 0.4)
-                points_awarded += bonus_points
-                self._log_event(f"FIRST DEFEAT BONUS! Alliance {alliance.id} gets {bonus_points} bonus points for first NPC defeat at {stronghold.id}")
+        if bonus_points:
+            self.first_time_npc_defeats.add(f"{stronghold.id}_npc")
+            points_awarded += bonus_points
+            self._log_event(f"FIRST DEFEAT BONUS! Alliance {alliance.id} gets {bonus_points} bonus points for first NPC defeat at {stronghold.id}")
         
         # Award points to alliance
         alliance.summit_showdown_points += points_awarded
@@ -197,19 +455,11 @@ class GameState:
     
     def _award_capture_points(self, alliance, stronghold):
         """Award points for capturing a stronghold"""
-        # Base occupation points based on stronghold level
-        base_points = {
-            1: 200,   # Level 1 stronghold
-            2: 420,   # Level 2 stronghold
-            3: 720    # Level 3 stronghold
-        }.get(stronghold.level, 200)
-        
+        base_points, bonus_points = self._capture_points(stronghold)
         points_awarded = base_points
         
-        # First-time capture bonus (40% bonus)
-        if stronghold.id not in self.first_time_captures:
+        if bonus_points:
             self.first_time_captures.add(stronghold.id)
-            bonus_points = int(base_points * 0.4)
             points_awarded += bonus_points
             self._log_event(f"FIRST CAPTURE BONUS! Alliance {alliance.id} gets {bonus_points} bonus points for first capture of {stronghold.id}")
         
@@ -220,14 +470,12 @@ class GameState:
 
     def _get_alliance_by_set(self, hero_set):
         """Find which alliance owns a hero set"""
-        if hero_set.is_npc:
+        # Selected sets link to their player, and players to their alliance
+        player = hero_set.player
+        if hero_set.is_npc or player is None or player.alliance is None:
             return None
-        
-        for alliance in self.alliances.values():
-            for player in alliance.players:
-                if hero_set in player.selected_hero_sets:
-                    return alliance
-        return None
+        alliance = player.alliance
+        return alliance if self.alliances.get(alliance.id) is alliance else None
     
     def advance_to_second_half(self):
         """Advance game to second half"""
@@ -235,6 +483,7 @@ class GameState:
             return  # Already in second half
         
         self.current_half = 2
+        self.revision += 1
         self._log_event("Second Half begins!")
         
         # Reset all alliances for second half
@@ -252,24 +501,15 @@ class GameState:
         return {
             "half": self.current_half,
             "game_time": self.game_time,
+            "revision": self.revision,
             "active_battles": len(self.active_battles),
-            "alliance_scores": {aid: alliance.summit_showdown_points for aid, alliance in self.alliances.items()},
+            "alliance_scores": self.views.scores(),
             "stronghold_control": self._get_stronghold_control_summary()
         }
     
     def _get_stronghold_control_summary(self):
         """Get summary of stronghold control by alliance"""
-        control_summary = {aid: [] for aid in self.alliances.keys()}
-        neutral_count = 0
-        
-        for stronghold_id, stronghold in self.strongholds.items():
-            if stronghold.controlling_alliance:
-                control_summary[stronghold.controlling_alliance].append(stronghold_id)
-            else:
-                neutral_count += 1
-        
-        control_summary["neutral"] = neutral_count
-        return control_summary
+        return self.views.control_summary()
     
     def _log_event(self, message):
         """Log a game event"""
@@ -289,17 +529,31 @@ class GameState:
             return False
         
         # Must be adjacent to controlled stronghold
-        from .map_layout import get_adjacent_strongholds
-        attackable = get_adjacent_strongholds(self.strongholds, alliance.controlled_strongholds)
-        
-        return stronghold_id in attackable and stronghold.can_be_attacked()
+        return stronghold_id in self.frontier.frontier(alliance_id) and stronghold.can_be_attacked()
+    
+    def get_frontier(self, alliance_id):
+        """Get the ids of strongholds adjacent to an alliance's territory and not its own"""
+        return self.frontier.frontier(alliance_id)
+    
+    def get_attackable_strongholds(self, alliance_id):
+        """Get the ids of frontier strongholds an alliance can attack now"""
+        return self.views.attackable(alliance_id)
+    
+    def get_stronghold_summary(self, stronghold_id):
+        """Get a stronghold's owner, protection and defender counts for display"""
+        return self.views.stronghold_summary(stronghold_id)
+    
+    def get_battle_status(self, battle):
+        """Get a battle's status for display"""
+        return self.views.battle_status(battle)
     
     def to_dict(self):
         """Serialize game state"""
         return {
+            "seed": self.seed,
             "game_time": self.game_time,
             "current_half": self.current_half,
-            "alliance_scores": {aid: alliance.summit_showdown_points for aid, alliance in self.alliances.items()},
+            "alliance_scores": self.views.scores(),
             "stronghold_control": self._get_stronghold_control_summary(),
             "active_battles": len(self.active_battles)
         }
@@ -307,7 +561,7 @@ class GameState:
     @classmethod
     def from_dict(cls, data):
         """Load game state from dict (simplified)"""
-        state = cls()
+        state = cls(seed=data.get("seed"))
         state.game_time = data.get("game_time", 0.0)
         state.current_half = data.get("current_half", 1)
         return state
\ No newline at end of file
@@ -117,21 +117,21 @@ class MapRenderer:
             surface.blit(level_text, level_rect)
         
         # Draw NPC count and garrison info
-        self._draw_stronghold_details(surface, stronghold, x, y + radius + 10)
+        self._draw_stronghold_details(surface, game_state.get_stronghold_summary(stronghold.id), x, y + radius + 10)
     
-    def _draw_stronghold_details(self, surface, stronghold, x, y):
-        """Draw detailed info below stronghold"""
+    def _draw_stronghold_details(self, surface, summary, x, y):
+        """Draw detailed info below stronghold from its cached summary"""
         details = []
         
         # NPC teams remaining
-        active_npcs = len(stronghold.get_active_npc_teams())
+        active_npcs = summary['active_npcs']
         if active_npcs > 0:
-            details.append(f"NPCs: {active_npcs}/{stronghold.max_npc_teams}")
+            details.append(f"NPCs: {active_npcs}/{summary['max_npcs']}")
         
         # Garrison count
-        garrison_count = len(stronghold.garrisoned_hero_sets)
+        garrison_count = summary['garrison_count']
         if garrison_count > 0:
-            details.append(f"Garrison: {garrison_count}/{stronghold.max_garrison_size}")
+            details.append(f"Garrison: {garrison_count}/{summary['max_garrison']}")
         
         # Draw details
         for i, detail in enumerate(details):
@@ -0,0 +1,43 @@
+# game_simulator/rng.py
+import numpy as np
+
+# Stream kinds; each (match seed, kind, index) names an independent stream
+ROSTER_STREAM = 0
+BATTLE_STREAM = 1
+OUTCOME_STREAM = 2
+COMPARISON_STREAM = 3
+
+
+def new_match_seed():
+    """Pick a fresh 63-bit master seed for a match"""
+    return int(np.random.SeedSequence().entropy) % (1 << 63)
+
+
+def stream_rng(match_seed, kind, index):
+    """Get the Generator for one stream of a match.
+
+    Philox is counter based: the key alone fixes the stream, so any battle or
+    roster can be rebuilt in another process from (match_seed, kind, index).
+    """
+    key = [match_seed % (1 << 64), (kind << 48) | index]
+    return np.random.Generator(np.random.Philox(key=key))
+
+
+def battle_rng(match_seed, battle_number):
+    """Get the random stream of the match's n-th battle"""
+    return stream_rng(match_seed, BATTLE_STREAM, battle_number)
+
+
+def roster_rng(match_seed, alliance_id):
+    """Get the random stream used to generate an alliance's heroes"""
+    return stream_rng(match_seed, ROSTER_STREAM, alliance_id)
+
+
+def outcome_rng(match_seed):
+    """Get the random stream used for the match's precomputed outcome tables"""
+    return stream_rng(match_seed, OUTCOME_STREAM, 0)
+
+
+def comparison_rng(match_seed, number):
+    """Get the random stream of the match's n-th attack comparison"""
+    return stream_rng(match_seed, COMPARISON_STREAM, number)
@@ -0,0 +1,123 @@
+# game_simulator/simulation/backend_harness.py
+import math
+import time
+
+import numpy as np
+
+from ..entities.hero import Hero
+from ..entities.hero_set import HeroSet
+from ..entities.summit_battle import SummitBattle
+from ..entities.battle_tape import BattleTape
+from ..entities.battle_log import LOG_NONE
+from ..rng import stream_rng, battle_rng, new_match_seed
+from .backends import BACKENDS, get_backend
+
+# Stream kind for harness matchups, apart from the match streams in rng.py
+MATCHUP_STREAM = 15
+
+
+def matchup_tapes(count, seed):
+    """Tapes of count fresh matchups: player sets against player sets or NPC teams"""
+    rng = stream_rng(seed, MATCHUP_STREAM, 0)
+    tapes = []
+    for number in range(count):
+        attacking_set = HeroSet(f"A{number}", "player_a",
+                                heroes=[Hero(f"A{number}_H{i + 1}", rng=rng) for i in range(5)])
+        if rng.random() < 0.5:
+            defending_set = HeroSet(f"D{number}", "player_d",
+                                    heroes=[Hero(f"D{number}_H{i + 1}", rng=rng) for i in range(5)])
+        else:
+            level = int(rng.integers(1, 4))
+            defending_set = HeroSet(f"D{number}", "NPC", is_npc=True, stronghold_level=level)
+        battle = SummitBattle(f"Battle_{number}", attacking_set, defending_set, "harness",
+                              rng=battle_rng(seed, number), log_level=LOG_NONE)
+        tapes.append(BattleTape.record(battle, seed, number))
+    return tapes
+
+
+def run_backend(backend, tapes):
+    """Play fresh copies of the taped battles with a backend; get (battles, seconds)"""
+    backend = get_backend(backend)
+    battles = [tape.new_battle(LOG_NONE) for tape in tapes]
+    start = time.perf_counter()
+    backend.run(battles)
+    return battles, time.perf_counter() - start
+
+
+def _two_proportion_z(wins_a, wins_b, count):
+    """z statistic for the difference of two win rates over count battles each"""
+    pooled = (wins_a + wins_b) / (2 * count)
+    if pooled in (0.0, 1.0):
+        return 0.0
+    return (wins_a - wins_b) / count / math.sqrt(pooled * (1 - pooled) * 2 / count)
+
+
+def compare_backends(candidate, reference="reference", count=200, seed=None, z_limit=3.0):
+    """Run two backends on the same battles and report how well they agree.
+
+    An exact candidate must match every winner, step count and damage total.
+    Others must match the reference's attacker win rate within z_limit
+    standard errors.
+    """
+    seed = seed if seed is not None else new_match_seed()
+    candidate = get_backend(candidate)
+    reference = get_backend(reference)
+    tapes = matchup_tapes(count, seed)
+
+    reference_battles, reference_seconds = run_backend(reference, tapes)
+    candidate_battles, candidate_seconds = run_backend(candidate, tapes)
+
+    def outcomes(battles):
+        return (
+            np.array([battle.winner == "attacker" for battle in battles]),
+            np.array([battle.current_step for battle in battles]),
+            np.array([[battle.attacker_total_damage, battle.defender_total_damage] for battle in battles]),
+        )
+
+    ref_wins, ref_steps, ref_damage = outcomes(reference_battles)
+    cand_wins, cand_steps, cand_damage = outcomes(candidate_battles)
+    winner_mismatches = sum(a.winner != b.winner for a, b in zip(reference_battles, candidate_battles))
+    step_mismatches = int((ref_steps != cand_steps).sum())
+    damage_mismatches = int((~np.isclose(ref_damage, cand_damage, rtol=1e-9, atol=1e-6)).any(axis=1).sum())
+    z = _two_proportion_z(int(ref_wins.sum()), int(cand_wins.sum()), count)
+
+    if candidate.exact:
+        agrees = winner_mismatches == 0 and step_mismatches == 0 and damage_mismatches == 0
+    else:
+        agrees = abs(z) <= z_limit
+
+    return {
+        "reference": reference.name,
+        "candidate": candidate.name,
+        "exact": candidate.exact,
+        "battles": count,
+        "seed": seed,
+        "agrees": agrees,
+        "winner_mismatches": winner_mismatches,
+        "step_mismatches": step_mismatches,
+        "damage_mismatches": damage_mismatches,
+        "reference_win_rate": float(ref_wins.mean()),
+        "candidate_win_rate": float(cand_wins.mean()),
+        "win_rate_z": z,
+        "mean_step_difference": float((cand_steps - ref_steps).mean()),
+        "mean_damage_difference": float((cand_damage - ref_damage)[:, 0].mean()),
+        "reference_ms_per_battle": 1000 * reference_seconds / count,
+        "candidate_ms_per_battle": 1000 * candidate_seconds / count,
+        "speedup": reference_seconds / candidate_seconds if candidate_seconds > 0 else float("inf"),
+    }
+
+
+def compare_all(count=200, seed=None, reference="reference"):
+    """Compare every registered backend against the reference on the same battles"""
+    seed = seed if seed is not None else new_match_seed()
+    return [compare_backends(name, reference, count, seed) for name in BACKENDS if name != reference]
+
+
+if __name__ == "__main__":
+    for report in compare_all(count=1000):
+        kind = "exact" if report["exact"] else "approximate"
+        print(f"{report['candidate']:>10} ({kind}): agrees={report['agrees']} "
+              f"winners {report['winner_mismatches']}/{report['battles']} differ, "
+              f"win rate {report['candidate_win_rate']:.3f} vs {report['reference_win_rate']:.3f}, "
+              f"{report['candidate_ms_per_battle']:.3f} vs {report['reference_ms_per_battle']:.3f} ms/battle "
+              f"({report['speedup']:.1f}x)")
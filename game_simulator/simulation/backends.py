@@ -0,0 +1,79 @@
+# game_simulator/simulation/backends.py
+from ..entities.summit_battle import SAMPLED, EXPECTED
+from .batch_battle import advance_summit_battles, run_summit_battles
+
+
+class BattleBackend:
+    """Plays SummitBattle turns for GameState.
+
+    advance() plays one turn of every active battle it is given. exact
+    backends give the same winners, damage and steps as the reference
+    backend on the same random streams; the others only agree on average.
+    mode is the SummitBattle turn mode a battle tape replays with.
+    """
+
+    name = None
+    mode = SAMPLED
+    exact = True
+
+    def advance(self, battles):
+        """Play one turn of every active battle"""
+        raise NotImplementedError
+
+    def run(self, battles):
+        """Play every battle to the end"""
+        running = [battle for battle in battles if battle.is_active]
+        while running:
+            self.advance(running)
+            running = [battle for battle in running if battle.is_active]
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name})"
+
+
+class ReferenceBackend(BattleBackend):
+    """One SummitBattle.execute_turn() per battle, in pure Python"""
+
+    name = "reference"
+
+    def advance(self, battles):
+        for battle in battles:
+            if battle.is_active:
+                battle.execute_turn()
+
+
+class VectorizedBackend(BattleBackend):
+    """All battles' turns at once with the batch kernel; same results as the reference"""
+
+    name = "vectorized"
+
+    def advance(self, battles):
+        advance_summit_battles([battle for battle in battles if battle.is_active])
+
+    def run(self, battles):
+        run_summit_battles(battles)
+
+
+class ExpectedBackend(BattleBackend):
+    """Deterministic expected-value turns; approximates the reference"""
+
+    name = "expected"
+    mode = EXPECTED
+    exact = False
+
+    def advance(self, battles):
+        for battle in battles:
+            if battle.is_active:
+                battle.execute_expected_turn()
+
+
+BACKENDS = {backend.name: backend for backend in (ReferenceBackend, VectorizedBackend, ExpectedBackend)}
+
+
+def get_backend(backend):
+    """Get a backend instance from a name in BACKENDS or an instance"""
+    if isinstance(backend, BattleBackend):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown battle backend {backend!r}; choose from {', '.join(BACKENDS)}")
+    return BACKENDS[backend]()
@@ -0,0 +1,554 @@
+# game_simulator/simulation/batch_battle.py
+import numpy as np
+
+SET_SIZE = 5
+MAX_HITS = 4
+MAX_STEPS = 50
+MAX_TURNS = 2 * MAX_STEPS + 1  # Turns a fresh battle can take: two per step, plus the one that ends it
+MEAN_HITS = (1 + MAX_HITS) / 2  # Expected hits per turn
+
+# Every turn consumes a fixed block of uniforms: one to pick the acting hero,
+# one for the number of hits, then one AoE weight per (hit, hero slot).
+# Weights for dead slots are drawn but ignored so the stream stays aligned.
+TURN_DRAWS = 2 + MAX_HITS * SET_SIZE
+
+# Sides, indexed along axis 0 of the battle arrays
+ATTACKER = 0
+DEFENDER = 1
+
+# Winner codes
+ONGOING = 0
+ATTACKER_WIN = 1
+DEFENDER_WIN = 2
+DRAW = 3
+WINNER_NAMES = (None, "attacker", "defender", "draw")
+
+# Compact the working arrays once fewer than this fraction of battles is active
+COMPACT_THRESHOLD = 0.75
+
+# Look for battles neither side can win by damage every this many turns
+STALEMATE_CHECK_INTERVAL = 4
+
+# Per-hero counters kept by BattleArrays.track_tallies(), along axis 0 of tallies
+TALLY_FIELDS = ("turns_acted", "ineffective_turns", "damage_dealt", "damage_taken", "turns_survived", "deaths")
+TURNS_ACTED, INEFFECTIVE_TURNS, DAMAGE_DEALT, DAMAGE_TAKEN, TURNS_SURVIVED, DEATHS = range(len(TALLY_FIELDS))
+
+
+def pack_hero_sets(hero_sets):
+    """Pack hero sets into (attack, defense, hp, alive) arrays of shape [5, N]"""
+    count = len(hero_sets)
+    if count and all(len(hero_set.heroes) == SET_SIZE for hero_set in hero_sets):
+        store = hero_sets[0].store
+        if all(hero_set.store is store for hero_set in hero_sets):
+            # One gather per column straight from the hero store
+            rows = np.array([[hero.row for hero in hero_set.heroes] for hero_set in hero_sets], dtype=np.intp).T
+            return (store.attack[rows].astype(np.float64), store.defense[rows].astype(np.float64),
+                    store.current_hp[rows], store.alive[rows])
+
+    attack = np.zeros((SET_SIZE, count))
+    defense = np.zeros((SET_SIZE, count))
+    hp = np.zeros((SET_SIZE, count))
+    alive = np.zeros((SET_SIZE, count), dtype=bool)
+
+    for col, hero_set in enumerate(hero_sets):
+        for slot, hero in enumerate(hero_set.heroes[:SET_SIZE]):
+            attack[slot, col] = hero.attack
+            defense[slot, col] = hero.defense
+            hp[slot, col] = hero.current_hp
+            alive[slot, col] = hero.is_alive
+
+    return attack, defense, hp, alive
+
+
+class BattleArrays:
+    """State of N battles advanced in lockstep, indexed [side, hero slot, battle].
+
+    Slot-major storage keeps every per-slot operation on a contiguous vector of
+    battles, so reductions over a set are five vector adds.
+    """
+
+    def __init__(self, attack, defense, hp, alive, max_steps=MAX_STEPS, side=None, step=None, damage=None):
+        self.attack = np.asarray(attack, dtype=np.float64)
+        self.defense = np.asarray(defense, dtype=np.float64)
+        self.hp = np.array(hp, dtype=np.float64)
+        self.alive = np.array(alive, dtype=bool)
+        self.max_steps = max_steps
+
+        # Battles start fresh unless resumed mid-fight
+        count = self.hp.shape[2]
+        self.size = count
+        self.side = np.zeros(count, dtype=np.int8) if side is None else np.array(side, dtype=np.int8)  # Side about to act
+        self.step = np.zeros(count, dtype=np.int32) if step is None else np.array(step, dtype=np.int32)
+        self.damage = np.zeros((2, count)) if damage is None else np.array(damage, dtype=np.float64)  # Damage dealt per side
+        self.winner = np.zeros(count, dtype=np.int8)
+        self.active = np.ones(count, dtype=bool)
+        self.skipped = np.zeros(count, dtype=np.int32)  # Turns resolve_stalemates jumped over
+        self.tallies = None  # [field, side, slot, battle] once track_tallies() is called
+
+        # Battles that start with an empty side are decided before any turn
+        self.check_victory()
+
+    @classmethod
+    def from_hero_sets(cls, attacking_sets, defending_sets, max_steps=MAX_STEPS):
+        """Build battle arrays from matching lists of attacking and defending sets"""
+        if len(attacking_sets) != len(defending_sets):
+            raise ValueError("attacking_sets and defending_sets must have the same length")
+
+        atk = pack_hero_sets(attacking_sets)
+        dfn = pack_hero_sets(defending_sets)
+        stacked = [np.stack([a, d]) for a, d in zip(atk, dfn)]
+        return cls(*stacked, max_steps=max_steps)
+
+    @classmethod
+    def from_summit_battles(cls, battles):
+        """Build battle arrays from the current state of SummitBattle objects"""
+        atk = pack_hero_sets([battle.attacking_set for battle in battles])
+        dfn = pack_hero_sets([battle.defending_set for battle in battles])
+        stacked = [np.stack([a, d]) for a, d in zip(atk, dfn)]
+        return cls(
+            *stacked,
+            max_steps=np.array([battle.max_steps for battle in battles], dtype=np.int32),
+            side=[ATTACKER if battle.is_attacker_turn else DEFENDER for battle in battles],
+            step=[battle.current_step for battle in battles],
+            damage=[[battle.attacker_total_damage for battle in battles],
+                    [battle.defender_total_damage for battle in battles]],
+        )
+
+    def take(self, rows):
+        """Copy battles[rows] into a new BattleArrays"""
+        # np.take keeps the copies slot-major; indexing [..., rows] would lay
+        # them out battle by battle and make every per-slot vector strided
+        subset = BattleArrays.__new__(BattleArrays)
+        subset.attack = np.take(self.attack, rows, axis=-1)
+        subset.defense = np.take(self.defense, rows, axis=-1)
+        subset.hp = np.take(self.hp, rows, axis=-1)
+        subset.alive = np.take(self.alive, rows, axis=-1)
+        subset.max_steps = self.max_steps[rows] if np.ndim(self.max_steps) else self.max_steps
+        subset.size = len(rows)
+        subset.side = self.side[rows]
+        subset.step = self.step[rows]
+        subset.damage = np.take(self.damage, rows, axis=-1)
+        subset.winner = self.winner[rows]
+        subset.active = self.active[rows]
+        subset.skipped = self.skipped[rows]
+        subset.tallies = np.take(self.tallies, rows, axis=-1) if self.tallies is not None else None
+        return subset
+
+    def put(self, rows, subset):
+        """Write the mutable state of a subset taken with take(rows) back"""
+        self.hp[:, :, rows] = subset.hp
+        self.alive[:, :, rows] = subset.alive
+        self.side[rows] = subset.side
+        self.step[rows] = subset.step
+        self.damage[:, rows] = subset.damage
+        self.winner[rows] = subset.winner
+        self.active[rows] = subset.active
+        self.skipped[rows] = subset.skipped
+        if self.tallies is not None:
+            self.tallies[..., rows] = subset.tallies
+
+    def track_tallies(self):
+        """Start counting TALLY_FIELDS per hero over the sampled turns that follow"""
+        self.tallies = np.zeros((len(TALLY_FIELDS), 2, SET_SIZE, self.size))
+
+    @staticmethod
+    def _by_side(values, side):
+        """Pick values[side[i], :, i] for every battle as a [5, N] array"""
+        if isinstance(side, int):
+            return values[side]
+        return np.where(side == ATTACKER, values[ATTACKER], values[DEFENDER])
+
+    def advance(self, draws, details=False):
+        """Execute one turn of every active battle.
+
+        draws is a [TURN_DRAWS, N] block of uniforms, one column per battle.
+        Decided battles are left untouched. Mirrors SummitBattle.execute_turn:
+        the target set, its average defense and the AoE weights are fixed at the
+        start of the turn, a defender killed by an earlier hit absorbs nothing
+        from later hits, and damage is counted as applied. With details, returns
+        (hero, hits, damage_per_hit, dealt) where dealt is [MAX_HITS, 5, N].
+        """
+        count = self.size
+        active = self.active.copy()
+        act, tgt, uniform = self._turn_sides(active)
+
+        act_attack = self._by_side(self.attack, act)
+        act_alive = self._by_side(self.alive, act)
+        tgt_defense = self._by_side(self.defense, tgt)
+        tgt_alive = self._by_side(self.alive, tgt)
+        tgt_hp = self._by_side(self.hp, tgt).copy()
+
+        # Random living hero: the k-th living slot in slot order
+        n_act = act_alive.view(np.int8).sum(axis=0, dtype=np.int8)  # Summing bools as int8 skips a cast
+        k = np.minimum((draws[0] * n_act).astype(np.intp), n_act - 1)
+        seen = np.zeros(count, dtype=np.intp)
+        hero = np.zeros(count, dtype=np.intp)
+        for slot in range(SET_SIZE):
+            seen += act_alive[slot]
+            hero += seen <= k
+        attack = np.take_along_axis(act_attack, hero[None, :], axis=0)[0]
+        hits = 1 + np.minimum((draws[1] * MAX_HITS).astype(np.intp), MAX_HITS - 1)
+
+        tgt_mask = tgt_alive.astype(np.float64)
+        defense_sum = (tgt_defense * tgt_mask).sum(axis=0)
+        damage_per_hit = np.maximum(0, attack - defense_sum / np.maximum(tgt_mask.sum(axis=0), 1))
+
+        weights = draws[2:].reshape(MAX_HITS, SET_SIZE, count)
+        living = tgt_alive.copy()
+        dealt = np.zeros((MAX_HITS, SET_SIZE, count)) if details else None
+        taken = np.zeros((SET_SIZE, count)) if self.tallies is not None else None
+        turn_damage = np.zeros(count)
+
+        # Hits are worked out in place in one buffer; fresh [5, N] temporaries
+        # cost more than the arithmetic
+        hit = np.empty((SET_SIZE, count))
+        for h in range(MAX_HITS):
+            striking = active & (hits > h) & (damage_per_hit > 0)
+            if not striking.any():
+                break
+            np.multiply(weights[h], tgt_mask, out=hit)
+            total_weight = hit.sum(axis=0)
+            applies = striking & (total_weight > 0)
+            hit /= np.where(applies, total_weight, 1.0)
+            hit *= damage_per_hit
+            hit *= living & applies
+            np.subtract(tgt_hp, hit, out=tgt_hp)
+            np.maximum(tgt_hp, 0, out=tgt_hp)
+            # Living defenders left at 0 HP by a hit that applied are killed
+            living &= (tgt_hp > 0) | ~applies
+            turn_damage += hit.sum(axis=0)
+            if details:
+                dealt[h] = hit
+            if taken is not None:
+                taken += hit
+
+        died = tgt_alive & ~living if self.tallies is not None else None  # tgt_alive may be a view _end_turn overwrites
+        self._end_turn(active, act, tgt, uniform, tgt_hp, living, turn_damage)
+        if self.tallies is not None:
+            self._tally_turn(active, act, tgt, hero, damage_per_hit, turn_damage, taken, died)
+        if details:
+            return hero, hits, damage_per_hit, dealt
+
+    def _tally_turn(self, active, act, tgt, hero, damage_per_hit, turn_damage, taken, died):
+        """Add one sampled turn of the active battles to the tallies"""
+        cols = np.flatnonzero(active)
+        act_side = np.broadcast_to(act, active.shape)[cols]
+        tgt_side = np.broadcast_to(tgt, active.shape)[cols]
+        tallies = self.tallies
+        tallies[TURNS_ACTED, act_side, hero[cols], cols] += 1
+        tallies[INEFFECTIVE_TURNS, act_side, hero[cols], cols] += damage_per_hit[cols] <= 0
+        tallies[DAMAGE_DEALT, act_side, hero[cols], cols] += turn_damage[cols]
+        tallies[DAMAGE_TAKEN, tgt_side, :, cols] += taken[:, cols].T
+        tallies[DEATHS, tgt_side, :, cols] += died[:, cols].T
+        tallies[TURNS_SURVIVED] += self.alive & active
+
+    def advance_expected(self):
+        """Execute one deterministic expected-value turn of every active battle.
+
+        The acting side deals the mean damage per hit of its living heroes,
+        MEAN_HITS times, split evenly over the defenders alive at the start of
+        the turn. Deaths, damage totals and the step limit work as in advance().
+        Tallies are not kept for expected turns.
+        """
+        active = self.active.copy()
+        act, tgt, uniform = self._turn_sides(active)
+
+        act_mask = self._by_side(self.alive, act).astype(np.float64)
+        tgt_alive = self._by_side(self.alive, tgt)
+        tgt_mask = tgt_alive.astype(np.float64)
+        tgt_hp = self._by_side(self.hp, tgt)
+        n_act = act_mask.sum(axis=0)
+        n_tgt = tgt_mask.sum(axis=0)
+
+        avg_defense = (self._by_side(self.defense, tgt) * tgt_mask).sum(axis=0) / np.maximum(n_tgt, 1)
+        hero_damage = np.maximum(0, self._by_side(self.attack, act) - avg_defense) * act_mask
+        expected_per_hit = hero_damage.sum(axis=0) / np.maximum(n_act, 1)
+        per_defender = MEAN_HITS * expected_per_hit / np.maximum(n_tgt, 1) * active
+
+        hit = per_defender * tgt_mask
+        tgt_hp = np.maximum(0, tgt_hp - hit)
+        living = tgt_alive & (tgt_hp > 0)
+        self._end_turn(active, act, tgt, uniform, tgt_hp, living, hit.sum(axis=0))
+
+    def _turn_sides(self, active):
+        """Get (acting side, target side, uniform) for the active battles.
+
+        Lockstep batches share a side and get plain ints; mixed batches get a
+        per-battle side array.
+        """
+        acting = self.side[active]
+        uniform = len(acting) == 0 or (acting == acting[0]).all()
+        act = int(acting[0]) if len(acting) and uniform else self.side.astype(np.intp)
+        return act, 1 - act, uniform
+
+    def _end_turn(self, active, act, tgt, uniform, tgt_hp, living, turn_damage):
+        """Write the target side's state back, switch sides and check for results"""
+        if not uniform:
+            for side in (ATTACKER, DEFENDER):
+                targeted = tgt == side
+                self.hp[side] = np.where(targeted, tgt_hp, self.hp[side])
+                self.alive[side] = np.where(targeted, living, self.alive[side])
+                self.damage[1 - side] += np.where(targeted, turn_damage, 0.0)
+        else:
+            self.hp[tgt] = tgt_hp
+            self.alive[tgt] = living
+            self.damage[act] += turn_damage
+
+        # Switch sides; a step completes when the attacker is up again
+        self.side = np.where(active, 1 - self.side, self.side).astype(np.int8)
+        self.step += active & (self.side == ATTACKER)
+
+        self.check_victory()
+
+    def resolve_stalemates(self, picks=None):
+        """Jump battles in which neither side can deal damage to the step limit.
+
+        A side deals damage only if some living hero out-attacks the other
+        side's average defense. With neither able to, no HP changes again and
+        the step-limit tie-break on the current damage totals is the result.
+        With tallies, the jumped turns are counted as advance() would count
+        them; picks(cols, turns) gets the [len(cols), turns] draws[0] uniforms
+        those battles' next turns would pick their acting heroes with.
+        """
+        mask = self.alive.astype(np.float64)
+        living = mask.sum(axis=1)
+        avg_defense = (self.defense * mask).sum(axis=1) / np.maximum(living, 1)
+        best_attack = np.where(self.alive, self.attack, -np.inf).max(axis=1)
+
+        stalled = (self.active & (best_attack[ATTACKER] <= avg_defense[DEFENDER])
+                   & (best_attack[DEFENDER] <= avg_defense[ATTACKER]))
+        if stalled.any():
+            cols = np.flatnonzero(stalled)
+            remaining = 2 * (np.broadcast_to(self.max_steps, stalled.shape)[cols] - self.step[cols]) - self.side[cols]
+            self.skipped[cols] += remaining
+            if self.tallies is not None and picks is not None:
+                self._tally_skipped(cols, remaining, picks(cols, int(remaining.max())))
+            self.step[stalled] = np.broadcast_to(self.max_steps, stalled.shape)[stalled]
+            self.side[stalled] = ATTACKER
+            self.check_victory()
+
+    def _tally_skipped(self, cols, remaining, uniforms):
+        """Tally the ineffective turns a stalemate jump skips in battles cols"""
+        tallies = self.tallies
+        for i, col in enumerate(cols.tolist()):
+            first = int(self.side[col])
+            for side in (ATTACKER, DEFENDER):
+                living = np.flatnonzero(self.alive[side, :, col])
+                acting = uniforms[i, (side - first) % 2:remaining[i]:2]
+                slots = living[np.minimum((acting * len(living)).astype(np.intp), len(living) - 1)]
+                acted = np.bincount(slots, minlength=SET_SIZE)
+                tallies[TURNS_ACTED, side, :, col] += acted
+                tallies[INEFFECTIVE_TURNS, side, :, col] += acted
+            tallies[TURNS_SURVIVED, :, :, col] += remaining[i] * self.alive[:, :, col]
+
+    def check_victory(self):
+        """Decide battles that have been wiped out or reached the step limit"""
+        attacker_living = self.alive[ATTACKER].any(axis=0)
+        defender_living = self.alive[DEFENDER].any(axis=0)
+
+        # 50 step limit: most damage wins, attacker loses a tie
+        limit = attacker_living & defender_living & (self.step >= self.max_steps)
+        attacker_wins = (attacker_living & ~defender_living) | (limit & (self.damage[ATTACKER] > self.damage[DEFENDER]))
+        defender_wins = (~attacker_living & defender_living) | (limit & ~attacker_wins)
+        draw = ~attacker_living & ~defender_living
+        winner = (attacker_wins * np.int8(ATTACKER_WIN) + defender_wins * np.int8(DEFENDER_WIN)
+                  + draw * np.int8(DRAW)).astype(np.int8)
+
+        decided = self.active & (winner != ONGOING)
+        self.winner[decided] = winner[decided]
+        self.active &= ~decided
+
+
+def run_battles(battles, rng=None, expected=False):
+    """Advance every battle in lockstep until all are decided.
+
+    With expected, battles take deterministic expected-value turns and no
+    random numbers are drawn.
+
+    A batch of about 20,000 battles plays 50-75x faster than looping
+    simulate_to_completion() on battles that keep no log, and 75-100x on
+    ones with a full log (benchmarks/batch_battle.py). Each turn draws
+    TURN_DRAWS uniforms per battle from one stream, about a quarter of the
+    time, and makes some twenty float64 passes over [5, N] arrays. Fewer
+    draws or float32 would change the results the scalar path is checked
+    against.
+    """
+    rng = np.random.default_rng(rng) if not expected else None
+
+    rows = np.flatnonzero(battles.active)
+    work = battles.take(rows)
+    draws = None if expected else np.empty((TURN_DRAWS, work.size))  # Refilled each turn rather than allocated
+    turn = 0
+    while len(rows):
+        if turn % STALEMATE_CHECK_INTERVAL == 0:
+            # Jumped turns would draw from the shared stream; only tallies need them
+            work.resolve_stalemates(None if expected else lambda cols, turns: rng.random((len(cols), turns)))
+        turn += 1
+
+        if expected:
+            work.advance_expected()
+        else:
+            work.advance(rng.random(out=draws))
+
+        if work.active.sum() < COMPACT_THRESHOLD * work.size:
+            battles.put(rows, work)
+            keep = np.flatnonzero(work.active)
+            rows = rows[keep]
+            work = work.take(keep)
+            if draws is not None:
+                draws = draws.reshape(-1)[:TURN_DRAWS * work.size].reshape(TURN_DRAWS, work.size)
+
+    battles.put(rows, work)
+    return BatchBattleResult(battles)
+
+
+def advance_summit_battles(battles):
+    """Execute one turn of every active SummitBattle with the vectorized kernel.
+
+    Each battle draws its turn from its own rng exactly as execute_turn does, so
+    the outcome matches the scalar path. Battles that share a hero set run in
+    successive waves in list order, seeing each other's damage as they would
+    one execute_turn call at a time.
+    """
+    waves = []
+    last_wave = {}
+    for battle in battles:
+        if not battle.is_active:
+            continue
+        set_keys = (id(battle.attacking_set), id(battle.defending_set))
+        wave = 1 + max(last_wave.get(key, -1) for key in set_keys)
+        for key in set_keys:
+            last_wave[key] = wave
+        if wave == len(waves):
+            waves.append([])
+        waves[wave].append(battle)
+
+    for wave in waves:
+        _advance_wave(wave)
+
+
+def run_summit_battles(battles):
+    """Play active SummitBattles to the end with the vectorized kernel.
+
+    Battles that keep per-turn log records, share a hero set or may not
+    skip turns are played turn by turn with advance_summit_battles. The rest
+    are packed once and only their final state and stat tallies are written
+    back. Each battle draws every turn it could still need from its own rng
+    up front, which is the same stream execute_turn would consume, so the
+    results match the scalar path.
+    """
+    battles = [battle for battle in battles if battle.is_active]
+    set_counts = {}
+    for battle in battles:
+        for hero_set in (battle.attacking_set, battle.defending_set):
+            set_counts[id(hero_set)] = set_counts.get(id(hero_set), 0) + 1
+
+    packed = []
+    stepped = []
+    for battle in battles:
+        shared = set_counts[id(battle.attacking_set)] > 1 or set_counts[id(battle.defending_set)] > 1
+        if shared or battle.log.wants_turns() or not battle.short_circuit:
+            stepped.append(battle)
+        else:
+            packed.append(battle)
+
+    while stepped:
+        advance_summit_battles(stepped)
+        stepped = [battle for battle in stepped if battle.is_active]
+    if not packed:
+        return
+
+    # Tallies give each battle its turn counts and stats
+    arrays = BattleArrays.from_summit_battles(packed)
+    arrays.track_tallies()
+    turns = int((2 * (arrays.max_steps - arrays.step)).max()) + 1
+    play_drawn_battles(arrays, np.stack([battle.rng.random((turns, TURN_DRAWS)) for battle in packed]))
+
+    for col, battle in enumerate(packed):
+        battle.apply_battle_result(
+            arrays.hp[:, :, col], arrays.alive[:, :, col], int(arrays.step[col]),
+            arrays.side[col] == ATTACKER, arrays.damage[:, col],
+            arrays.tallies[..., col], int(arrays.skipped[col])
+        )
+
+
+def play_drawn_battles(arrays, draws):
+    """Play BattleArrays to the end on turns drawn up front.
+
+    draws[i, turn] holds battle i's TURN_DRAWS uniforms for its turn-th turn
+    from now. execute_turn skips stalemates at once, so they are looked for
+    every turn to play the same turns.
+    """
+    rows = np.flatnonzero(arrays.active)
+    work = arrays.take(rows)
+    turn = 0
+    while len(rows):
+        work.resolve_stalemates(lambda cols, turns: draws[rows[cols], turn:turn + turns, 0])
+        work.advance(draws[rows, turn].T)
+        turn += 1
+
+        if work.active.sum() < COMPACT_THRESHOLD * work.size:
+            arrays.put(rows, work)
+            keep = np.flatnonzero(work.active)
+            rows = rows[keep]
+            work = work.take(keep)
+    arrays.put(rows, work)
+
+
+def _advance_wave(battles):
+    """Advance battles that share no hero set by one turn"""
+    ready = []
+    for battle in battles:
+        if battle.attacking_set.is_defeated() or battle.defending_set.is_defeated() or battle.can_short_circuit():
+            battle.execute_turn()  # Decides the battle on the scalar path
+        else:
+            ready.append(battle)
+    if not ready:
+        return
+
+    arrays = BattleArrays.from_summit_battles(ready)
+    draws = np.empty((TURN_DRAWS, len(ready)))
+    for col, battle in enumerate(ready):
+        draws[:, col] = battle.rng.random(TURN_DRAWS)
+
+    acting = arrays.side.copy()
+    hero, hits, damage_per_hit, dealt = arrays.advance(draws, details=True)
+
+    for col, battle in enumerate(ready):
+        act = acting[col]
+        battle.apply_turn_result(
+            int(hero[col]), int(hits[col]), float(damage_per_hit[col]), dealt[:, :, col],
+            arrays.hp[1 - act, :, col], arrays.alive[1 - act, :, col], arrays.damage[act, col]
+        )
+
+
+def simulate_battles(attacking_sets, defending_sets, rng=None, max_steps=MAX_STEPS, expected=False):
+    """Simulate N (attacking_set, defending_set) battles without touching the heroes"""
+    battles = BattleArrays.from_hero_sets(attacking_sets, defending_sets, max_steps)
+    return run_battles(battles, rng, expected)
+
+
+class BatchBattleResult:
+    """Outcome arrays of a batch run"""
+
+    def __init__(self, battles):
+        self.winners = battles.winner.copy()
+        self.attacker_damage = battles.damage[ATTACKER].copy()
+        self.defender_damage = battles.damage[DEFENDER].copy()
+        self.steps = battles.step.copy()
+
+    def __len__(self):
+        return len(self.winners)
+
+    def winner_names(self):
+        """Get winners as the strings SummitBattle uses"""
+        return [WINNER_NAMES[code] for code in self.winners]
+
+    def attacker_win_rate(self):
+        """Fraction of battles won by the attacker"""
+        if len(self.winners) == 0:
+            return 0.0
+        return float(np.mean(self.winners == ATTACKER_WIN))
+
+    def __repr__(self):
+        return f"BatchBattleResult({len(self)} battles, attacker win rate {self.attacker_win_rate():.3f})"
@@ -0,0 +1,204 @@
+# game_simulator/simulation/battle_farm.py
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ..rng import battle_rng
+from ..entities.battle_tape import ATTACK, DEFENSE, HP
+from .batch_battle import BattleArrays, BatchBattleResult, play_drawn_battles, MAX_TURNS, SET_SIZE, TURN_DRAWS
+
+# Arrays a farm run shares with its workers: name -> (shape after the battle axis, dtype)
+FARM_INPUTS = {
+    "stats": ((2, SET_SIZE, 4), np.float64),  # BattleTape.stats layout
+    "seeds": ((2,), np.uint64),  # (match seed, battle number)
+}
+FARM_OUTPUTS = {
+    "winner": ((), np.int8),
+    "step": ((), np.int32),
+    "damage": ((2,), np.float64),  # Damage dealt per side
+    "hp": ((2, SET_SIZE), np.float64),  # Final HP per side and slot
+}
+
+
+def farm_inputs(tapes):
+    """Get the (stats, seeds) farm inputs that replay a list of BattleTapes"""
+    stats = np.array([tape.stats for tape in tapes], dtype=np.float64).reshape(-1, 2, SET_SIZE, 4)
+    seeds = np.array([(tape.match_seed, tape.battle_number) for tape in tapes], dtype=np.uint64).reshape(-1, 2)
+    return stats, seeds
+
+
+def play_farm_block(stats, seeds):
+    """Play a block of fresh battles to the end in this process.
+
+    Each battle draws from battle_rng(match seed, battle number), so a taped
+    battle comes out as SummitBattle would play it, whatever block it is in.
+    """
+    count = len(seeds)
+    by_side = stats.transpose(3, 1, 2, 0)  # [column, side, slot, battle]
+    arrays = BattleArrays(by_side[ATTACK], by_side[DEFENSE], by_side[HP], by_side[HP] > 0)
+    draws = np.empty((count, MAX_TURNS, TURN_DRAWS))
+    for i, (match_seed, battle_number) in enumerate(seeds.tolist()):
+        draws[i] = battle_rng(match_seed, battle_number).random((MAX_TURNS, TURN_DRAWS))
+    play_drawn_battles(arrays, draws)
+    return {
+        "winner": arrays.winner,
+        "step": arrays.step,
+        "damage": arrays.damage.T,
+        "hp": arrays.hp.transpose(2, 0, 1),
+    }
+
+
+class SharedArrays:
+    """Named arrays with a leading battle axis laid out in one shared memory block"""
+
+    def __init__(self, layout, count, name=None):
+        self.layout = layout
+        self.count = count
+        offsets = {}
+        size = 0
+        for key, (shape, dtype) in layout.items():
+            size = -(-size // 8) * 8  # Keep every array 8-byte aligned
+            offsets[key] = size
+            size += count * int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+        self.owner = name is None
+        self.memory = shared_memory.SharedMemory(name=name, create=self.owner, size=max(size, 1))
+        self.arrays = {
+            key: np.ndarray((count,) + shape, dtype=dtype, buffer=self.memory.buf, offset=offsets[key])
+            for key, (shape, dtype) in layout.items()
+        }
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def close(self):
+        """Drop the views and detach; the creator also frees the block"""
+        self.arrays = {}
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+def _farm_chunk(input_name, output_name, count, start, stop):
+    """Worker: play battles[start:stop] from shared inputs into shared outputs"""
+    inputs = SharedArrays(FARM_INPUTS, count, input_name)
+    outputs = SharedArrays(FARM_OUTPUTS, count, output_name)
+    try:
+        results = play_farm_block(inputs.arrays["stats"][start:stop], inputs.arrays["seeds"][start:stop])
+        for key, values in results.items():
+            outputs.arrays[key][start:stop] = values
+    finally:
+        inputs.close()
+        outputs.close()
+    return start, stop
+
+
+class FarmResult(BatchBattleResult):
+    """Outcome arrays of a farm run, in input order.
+
+    done marks the battles that were played; after a cancel the rest keep
+    winner 0 (ONGOING).
+    """
+
+    def __init__(self, outputs, done, cancelled):
+        self.winners = outputs["winner"].copy()
+        self.attacker_damage = outputs["damage"][:, 0].copy()
+        self.defender_damage = outputs["damage"][:, 1].copy()
+        self.steps = outputs["step"].copy()
+        self.final_hp = outputs["hp"].copy()
+        self.done = done
+        self.cancelled = cancelled
+
+
+class BattleFarm:
+    """Plays large batches of battles across worker processes.
+
+    Inputs and results travel through shared memory, so a chunk costs the
+    workers one small message. Every battle has its own random stream, so
+    the results do not depend on the number of workers or the chunk size.
+    workers=0 plays every chunk in this process.
+    """
+
+    def __init__(self, workers=None, chunk_size=1024):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.chunk_size = chunk_size
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Stop the running batch: chunks already being played finish, and no more start"""
+        self._cancel.set()
+
+    def run(self, stats, seeds, progress=None):
+        """Play every (stats, seeds) battle; get a FarmResult.
+
+        progress(done, total) is called after each chunk, in this process,
+        and may call cancel().
+        """
+        self._cancel.clear()
+        seeds = np.asarray(seeds, dtype=np.uint64).reshape(-1, 2)
+        count = len(seeds)
+        chunks = [(start, min(start + self.chunk_size, count)) for start in range(0, count, self.chunk_size)]
+        done = np.zeros(count, dtype=bool)
+
+        if self.workers == 0:
+            outputs = {key: np.zeros((count,) + shape, dtype=dtype) for key, (shape, dtype) in FARM_OUTPUTS.items()}
+            for start, stop in chunks:
+                if self._cancel.is_set():
+                    break
+                for key, values in play_farm_block(stats[start:stop], seeds[start:stop]).items():
+                    outputs[key][start:stop] = values
+                done[start:stop] = True
+                if progress:
+                    progress(int(done.sum()), count)
+            return FarmResult(outputs, done, self._cancel.is_set())
+
+        inputs = SharedArrays(FARM_INPUTS, count)
+        outputs = SharedArrays(FARM_OUTPUTS, count)
+        try:
+            inputs.arrays["stats"][:] = stats
+            inputs.arrays["seeds"][:] = seeds
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                # A chunk per worker plus one waiting keeps the workers busy;
+                # after a cancel nothing more is submitted and the waiting one is dropped
+                queued = iter(chunks)
+                pending = set()
+                while True:
+                    while len(pending) <= self.workers and not self._cancel.is_set():
+                        chunk = next(queued, None)
+                        if chunk is None:
+                            break
+                        pending.add(pool.submit(_farm_chunk, inputs.name, outputs.name, count, *chunk))
+                    if self._cancel.is_set():
+                        for future in pending:
+                            future.cancel()
+                    if not pending:
+                        break
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        if future.cancelled():
+                            continue
+                        start, stop = future.result()
+                        done[start:stop] = True
+                        if progress:
+                            progress(int(done.sum()), count)
+            return FarmResult(outputs.arrays, done, self._cancel.is_set())
+        finally:
+            inputs.close()
+            outputs.close()
+
+
+if __name__ == "__main__":
+    import time
+
+    from .backend_harness import matchup_tapes
+
+    stats, seeds = farm_inputs(matchup_tapes(20000, seed=1))
+    for workers in (0, os.cpu_count() or 1):
+        start = time.perf_counter()
+        result = BattleFarm(workers).run(stats, seeds)
+        seconds = time.perf_counter() - start
+        print(f"{workers} workers: {len(result) / seconds:,.0f} battles/s, "
+              f"attacker win rate {result.attacker_win_rate():.3f}")
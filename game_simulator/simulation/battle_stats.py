@@ -0,0 +1,115 @@
+# game_simulator/simulation/battle_stats.py
+import numpy as np
+
+from .batch_battle import TALLY_FIELDS
+
+# Per-hero counters: battles fought, then the kernel's per-turn tallies
+HERO_FIELDS = ("battles",) + TALLY_FIELDS
+
+# Per-stronghold counters, added when a battle ends
+STRONGHOLD_FIELDS = ("battles", "attacker_wins", "turns", "ineffective_turns", "attacker_damage", "defender_damage")
+
+NO_ALLIANCE = -1  # Alliance of NPC heroes
+
+
+class BattleStats:
+    """Streaming battle counters for a whole match, per hero and per stronghold.
+
+    Heroes get one row each, keyed by hero id, so respawned NPC teams reuse
+    their rows and memory grows with the roster rather than the number of
+    battles. SummitBattle adds to its heroes' rows as turns are played, with
+    or without a battle log. hero_counters rows are the BattleArrays
+    TALLY_FIELDS; battles fought are counted apart in hero_battles.
+    """
+
+    def __init__(self, capacity=1024):
+        self.hero_rows = {}  # Hero id -> row
+        self.hero_alliance = np.full(capacity, NO_ALLIANCE, dtype=np.int32)
+        self.hero_battles = np.zeros(capacity)
+        self.hero_counters = np.zeros((len(TALLY_FIELDS), capacity))
+        self.stronghold_rows = {}  # Stronghold id -> row
+        self.stronghold_counters = np.zeros((len(STRONGHOLD_FIELDS), 16))
+
+    def _hero_row(self, hero, alliance_id):
+        """Get a hero's row, adding one if the hero is new"""
+        row = self.hero_rows.get(hero.id)
+        if row is None:
+            row = len(self.hero_rows)
+            if row == self.hero_counters.shape[1]:
+                self.hero_counters = np.concatenate([self.hero_counters, np.zeros_like(self.hero_counters)], axis=1)
+                self.hero_alliance = np.concatenate([self.hero_alliance, np.full_like(self.hero_alliance, NO_ALLIANCE)])
+                self.hero_battles = np.concatenate([self.hero_battles, np.zeros_like(self.hero_battles)])
+            self.hero_rows[hero.id] = row
+            self.hero_alliance[row] = alliance_id
+        return row
+
+    def _stronghold_row(self, stronghold_id):
+        """Get a stronghold's row, adding one if the stronghold is new"""
+        row = self.stronghold_rows.get(stronghold_id)
+        if row is None:
+            row = len(self.stronghold_rows)
+            if row == self.stronghold_counters.shape[1]:
+                self.stronghold_counters = np.concatenate(
+                    [self.stronghold_counters, np.zeros_like(self.stronghold_counters)], axis=1)
+            self.stronghold_rows[stronghold_id] = row
+        return row
+
+    def start_battle(self, battle, attacking_alliance=NO_ALLIANCE, defending_alliance=NO_ALLIANCE):
+        """Count a new battle; get its [side, slot] hero rows and its stronghold row"""
+        rows = np.array([
+            [self._hero_row(hero, alliance_id) for hero in hero_set.heroes]
+            for hero_set, alliance_id in ((battle.attacking_set, attacking_alliance),
+                                          (battle.defending_set, defending_alliance))
+        ], dtype=np.intp)
+        self.hero_battles[rows] += 1
+        stronghold_row = self._stronghold_row(battle.stronghold_id)
+        self.stronghold_counters[0, stronghold_row] += 1
+        return rows, stronghold_row
+
+    def add_tallies(self, rows, tallies):
+        """Add a battle's BattleArrays tallies [field, side, slot] to its hero rows"""
+        self.hero_counters[:, rows] += tallies
+
+    def finish_battle(self, battle, stronghold_row):
+        """Add an ended battle to its stronghold's counters"""
+        self.stronghold_counters[1:, stronghold_row] += (
+            battle.winner == "attacker",
+            battle.turns_played,
+            battle.ineffective_turns,
+            battle.attacker_total_damage,
+            battle.defender_total_damage,
+        )
+
+    def _hero_totals(self, rows):
+        """Sum the hero counters over rows into a dict"""
+        totals = {"battles": float(self.hero_battles[rows].sum())}
+        totals.update(zip(TALLY_FIELDS, self.hero_counters[:, rows].sum(axis=1).tolist()))
+        acted = totals["turns_acted"]
+        totals["ineffective_rate"] = totals["ineffective_turns"] / acted if acted else 0.0
+        return totals
+
+    def hero_totals(self, hero):
+        """Counters of one hero"""
+        row = self.hero_rows.get(hero.id)
+        return self._hero_totals([] if row is None else [row])
+
+    def hero_set_totals(self, hero_set):
+        """Counters summed over a hero set's heroes"""
+        return self._hero_totals([self.hero_rows[hero.id] for hero in hero_set.heroes if hero.id in self.hero_rows])
+
+    def alliance_totals(self, alliance_id):
+        """Counters summed over every hero of an alliance; NO_ALLIANCE for NPCs"""
+        count = len(self.hero_rows)
+        return self._hero_totals(np.flatnonzero(self.hero_alliance[:count] == alliance_id))
+
+    def stronghold_totals(self, stronghold_id):
+        """Counters of the battles fought at a stronghold"""
+        row = self.stronghold_rows.get(stronghold_id)
+        if row is None:
+            return dict.fromkeys(STRONGHOLD_FIELDS, 0.0)
+        return dict(zip(STRONGHOLD_FIELDS, self.stronghold_counters[:, row].tolist()))
+
+    def hero_table(self):
+        """Every hero's HERO_FIELDS as a [hero, field] array, with the hero ids in row order"""
+        count = len(self.hero_rows)
+        return list(self.hero_rows), np.column_stack([self.hero_battles[:count], self.hero_counters[:, :count].T])
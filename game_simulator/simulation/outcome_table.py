@@ -0,0 +1,177 @@
+# game_simulator/simulation/outcome_table.py
+import numpy as np
+
+from ..entities.hero_set import HeroSet
+from .batch_battle import BattleArrays, pack_hero_sets, run_battles, ATTACKER_WIN
+from .win_probability import wilson_interval
+
+# NPC heroes have fixed stats per stronghold level, so one team per level
+# stands in for every full-HP NPC team at that level
+NPC_LEVELS = (1, 2, 3)
+
+
+class NpcOutcomeTable:
+    """Win probability and expected damage of hero sets against full-HP NPC teams.
+
+    Row r is hero_sets[r] and column c is NPC_LEVELS[c]. fill() simulates
+    every cell up front; cells not filled are simulated when a lookup or
+    ranking first asks for them. Each cell plays batches of pilot_samples
+    battles until the Wilson interval of its win rate is no wider than 2 *
+    target_half_width or it has played samples battles. Rows are keyed by
+    set id; a set the table has not seen gets a row when it is asked for,
+    and a new set under a known id takes over that id's row. refresh()
+    simulates again the rows whose set's HP changed.
+    """
+
+    def __init__(self, hero_sets, rng=None, pilot_samples=16, samples=64, target_half_width=0.05, z=1.96):
+        if pilot_samples < 1 or samples < pilot_samples:
+            raise ValueError("Need 1 <= pilot_samples <= samples")
+        self.hero_sets = []
+        self.rows = {}  # Set id -> row
+        self.rng = np.random.default_rng(rng)
+        self.pilot_samples = pilot_samples
+        self.samples = samples
+        self.target_half_width = target_half_width
+        self.z = z
+
+        shape = (0, len(NPC_LEVELS))
+        self.win_probability = np.zeros(shape)
+        self.expected_attacker_damage = np.zeros(shape)
+        self.expected_defender_damage = np.zeros(shape)
+        self.sample_counts = np.zeros(shape, dtype=np.int32)  # 0 until a cell is simulated
+        self._hp = np.zeros((5, 0))  # HP each row was computed from
+
+        self._npc_teams = [
+            pack_hero_sets([HeroSet(f"NPC_L{level}", "NPC", is_npc=True, stronghold_level=level)])
+            for level in NPC_LEVELS
+        ]
+        self._rows(hero_sets)
+
+    def _rows(self, hero_sets):
+        """Get the rows of hero sets, adding rows for sets not seen before"""
+        rows = []
+        added = 0
+        for hero_set in hero_sets:
+            row = self.rows.get(hero_set.id)
+            if row is None:
+                row = len(self.hero_sets)
+                self.rows[hero_set.id] = row
+                self.hero_sets.append(hero_set)
+                added += 1
+            elif self.hero_sets[row] is not hero_set:
+                # A reselected set under a known id; its outcomes are someone else's
+                self.hero_sets[row] = hero_set
+                self.sample_counts[row] = 0
+            rows.append(row)
+        if added:
+            self.win_probability = self._extend(self.win_probability, added)
+            self.expected_attacker_damage = self._extend(self.expected_attacker_damage, added)
+            self.expected_defender_damage = self._extend(self.expected_defender_damage, added)
+            self.sample_counts = self._extend(self.sample_counts, added)
+            self._hp = np.concatenate([self._hp, np.zeros((5, added))], axis=1)
+        return np.array(rows, dtype=np.intp)
+
+    @staticmethod
+    def _extend(values, added):
+        return np.concatenate([values, np.zeros((added, values.shape[1]), dtype=values.dtype)])
+
+    def _ensure(self, rows, col):
+        """Simulate the cells of rows in a column that have not been simulated"""
+        rows = np.unique(rows[self.sample_counts[rows, col] == 0])
+        if len(rows) == 0:
+            return
+        packed = pack_hero_sets([self.hero_sets[row] for row in rows])
+        # Other levels simulated at an older HP no longer hold
+        changed = rows[(packed[2] != self._hp[:, rows]).any(axis=0)]
+        self.sample_counts[changed] = 0
+        self._hp[:, rows] = packed[2]
+        npc_team = self._npc_teams[col]
+
+        wins = np.zeros(len(rows), dtype=np.int64)
+        attacker_damage = np.zeros(len(rows))
+        defender_damage = np.zeros(len(rows))
+        counts = np.zeros(len(rows), dtype=np.int64)
+        open_cells = np.arange(len(rows))
+        while len(open_cells):
+            batch = min(self.pilot_samples, self.samples - int(counts[open_cells[0]]))
+            subset = tuple(values[:, open_cells] for values in packed)
+            more = self._sample(subset, npc_team, batch)
+            wins[open_cells] += more[0]
+            attacker_damage[open_cells] += more[1]
+            defender_damage[open_cells] += more[2]
+            counts[open_cells] += batch
+
+            # Keep sampling only cells whose win rate is still uncertain
+            still_open = []
+            for cell in open_cells:
+                if counts[cell] >= self.samples:
+                    continue
+                low, high = wilson_interval(int(wins[cell]), int(counts[cell]), self.z)
+                if (high - low) / 2 > self.target_half_width:
+                    still_open.append(cell)
+            open_cells = np.array(still_open, dtype=np.intp)
+
+        self.win_probability[rows, col] = wins / counts
+        self.expected_attacker_damage[rows, col] = attacker_damage / counts
+        self.expected_defender_damage[rows, col] = defender_damage / counts
+        self.sample_counts[rows, col] = counts
+
+    def _sample(self, packed, npc_team, samples):
+        """Run samples battles per packed set; get per-set wins and damage sums"""
+        count = packed[0].shape[1]
+        arrays = [
+            np.stack([np.repeat(attacker, samples, axis=1), np.repeat(npc, count * samples, axis=1)])
+            for attacker, npc in zip(packed, npc_team)
+        ]
+        outcome = run_battles(BattleArrays(*arrays), self.rng)
+        wins = (outcome.winners == ATTACKER_WIN).reshape(count, samples).sum(axis=1)
+        attacker_damage = outcome.attacker_damage.reshape(count, samples).sum(axis=1)
+        defender_damage = outcome.defender_damage.reshape(count, samples).sum(axis=1)
+        return wins, attacker_damage, defender_damage
+
+    def fill(self):
+        """Simulate every cell not simulated yet"""
+        rows = np.arange(len(self.hero_sets))
+        for col in range(len(NPC_LEVELS)):
+            self._ensure(rows, col)
+
+    def refresh(self):
+        """Simulate again the rows whose set HP changed; get the number of rows redone.
+
+        Only the levels a row had been simulated against are redone.
+        """
+        if not self.hero_sets:
+            return 0
+        hp = pack_hero_sets(self.hero_sets)[2]
+        simulated = self.sample_counts > 0
+        dirty = np.flatnonzero((hp != self._hp).any(axis=0) & simulated.any(axis=1))
+        redo = [dirty[simulated[dirty, col]] for col in range(len(NPC_LEVELS))]
+        self.sample_counts[dirty] = 0
+        for col, rows in enumerate(redo):
+            self._ensure(rows, col)
+        return len(dirty)
+
+    def lookup(self, hero_set, level):
+        """Get the outcome of hero_set attacking a full-HP NPC team of a level"""
+        rows = self._rows([hero_set])
+        col = NPC_LEVELS.index(level)
+        self._ensure(rows, col)
+        row = rows[0]
+        return {
+            "win_probability": float(self.win_probability[row, col]),
+            "expected_attacker_damage": float(self.expected_attacker_damage[row, col]),
+            "expected_defender_damage": float(self.expected_defender_damage[row, col]),
+            "samples": int(self.sample_counts[row, col]),
+        }
+
+    def rank_sets(self, hero_sets, level):
+        """Sort hero sets by win probability against an NPC level, best first"""
+        hero_sets = list(hero_sets)
+        if not hero_sets:
+            return []
+        col = NPC_LEVELS.index(level)
+        rows = self._rows(hero_sets)
+        self._ensure(rows, col)
+        # Most likely win first, then most damage dealt
+        order = np.lexsort((-self.expected_attacker_damage[rows, col], -self.win_probability[rows, col]))
+        return [hero_sets[i] for i in order]
@@ -0,0 +1,211 @@
+# game_simulator/simulation/surrogate.py
+import math
+
+import numpy as np
+
+from .batch_battle import BattleArrays, run_battles, ATTACKER, DEFENDER, ATTACKER_WIN, SET_SIZE, MEAN_HITS
+from ..entities.hero import PLAYER_STATS
+
+FEATURE_NAMES = (
+    "attacker_living",
+    "defender_living",
+    "attacker_hp",
+    "defender_hp",
+    "attacker_damage_per_hit",
+    "defender_damage_per_hit",
+    "log_kill_time_ratio",
+)
+
+# NPC stat multipliers per stronghold level from the game rules
+NPC_MULTIPLIERS = (0.8, 1.0, 1.2)
+
+
+def _side_features(attack_sum, defense_sum, hp, living):
+    """Mean living attack, average living defense, HP and living count of one side"""
+    if living == 0:
+        return 0.0, 0.0, hp, 0
+    return attack_sum / living, defense_sum / living, hp, living
+
+
+def _features(atk_side, def_side):
+    """Feature vector from the (mean attack, avg defense, hp, living) of both sides"""
+    atk_attack, atk_defense, atk_hp, atk_living = atk_side
+    def_attack, def_defense, def_hp, def_living = def_side
+    atk_dph = max(0.0, atk_attack - def_defense) if def_living else 0.0
+    def_dph = max(0.0, def_attack - atk_defense) if atk_living else 0.0
+    # Turns the attacker needs to wipe the defender, relative to the reverse
+    kill_ratio = (math.log((def_hp + 1) / (MEAN_HITS * atk_dph + 1))
+                  - math.log((atk_hp + 1) / (MEAN_HITS * def_dph + 1)))
+    return (atk_living, def_living, atk_hp, def_hp, atk_dph, def_dph, kill_ratio)
+
+
+def battle_features(battles):
+    """Feature matrix [N, len(FEATURE_NAMES)] for battle arrays, vectorized"""
+    alive = battles.alive.astype(np.float64)
+    living = alive.sum(axis=1)
+    safe_living = np.maximum(living, 1)
+    mean_attack = (battles.attack * alive).sum(axis=1) / safe_living
+    avg_defense = (battles.defense * alive).sum(axis=1) / safe_living
+    hp = (battles.hp * alive).sum(axis=1)
+
+    atk_dph = np.where(living[DEFENDER] > 0, np.maximum(0, mean_attack[ATTACKER] - avg_defense[DEFENDER]), 0.0)
+    atk_dph = np.where(living[ATTACKER] > 0, atk_dph, 0.0)
+    def_dph = np.where(living[ATTACKER] > 0, np.maximum(0, mean_attack[DEFENDER] - avg_defense[ATTACKER]), 0.0)
+    def_dph = np.where(living[DEFENDER] > 0, def_dph, 0.0)
+    kill_ratio = (np.log((hp[DEFENDER] + 1) / (MEAN_HITS * atk_dph + 1))
+                  - np.log((hp[ATTACKER] + 1) / (MEAN_HITS * def_dph + 1)))
+
+    return np.column_stack([living[ATTACKER], living[DEFENDER], hp[ATTACKER], hp[DEFENDER],
+                            atk_dph, def_dph, kill_ratio])
+
+
+def hero_set_summary(hero_set):
+    """(mean attack, avg defense, hp, living) of a hero set's living heroes"""
+    attack_sum = 0
+    defense_sum = 0
+    hp = 0
+    living = 0
+    for hero in hero_set.heroes:
+        if hero.is_alive:
+            attack_sum += hero.attack
+            defense_sum += hero.defense
+            hp += hero.current_hp
+            living += 1
+    return _side_features(attack_sum, defense_sum, hp, living)
+
+
+def random_battles(count, rng=None):
+    """Random matchups of player sets against player or NPC sets.
+
+    A share of the heroes start wounded or dead so the model also sees
+    part-fought battles, not only fresh ones.
+    """
+    rng = np.random.default_rng(rng)
+    shape = (2, SET_SIZE, count)
+    attack, defense, max_hp = (np.maximum(1, np.floor(rng.normal(mean, std, shape))) for mean, std in PLAYER_STATS)
+
+    # Half of the defending sets are NPC teams of a random level
+    npc = rng.random(count) < 0.5
+    multiplier = np.array(NPC_MULTIPLIERS)[rng.integers(0, len(NPC_MULTIPLIERS), count)]
+    for values, (base, _) in zip((attack, defense, max_hp), PLAYER_STATS):
+        values[DEFENDER] = np.where(npc, np.floor(base * multiplier), values[DEFENDER])
+
+    wounded = rng.random(shape) < 0.3
+    hp = np.where(wounded, max_hp * rng.uniform(0.05, 1.0, shape), max_hp)
+    alive = rng.random(shape) >= 0.1
+    hp = np.where(alive, hp, 0.0)
+    return BattleArrays(attack, defense, hp, alive)
+
+
+def calibration_report(probabilities, outcomes, bins=10):
+    """Brier score, log loss and per-bin predicted vs observed win rates"""
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    outcomes = np.asarray(outcomes, dtype=np.float64)
+    clipped = np.clip(probabilities, 1e-12, 1 - 1e-12)
+
+    edges = np.linspace(0, 1, bins + 1)
+    index = np.minimum(np.searchsorted(edges, probabilities, side="right") - 1, bins - 1)
+    table = []
+    for b in range(bins):
+        in_bin = index == b
+        count = int(in_bin.sum())
+        if count:
+            table.append({
+                "low": float(edges[b]),
+                "high": float(edges[b + 1]),
+                "count": count,
+                "predicted": float(probabilities[in_bin].mean()),
+                "observed": float(outcomes[in_bin].mean()),
+            })
+
+    return {
+        "brier": float(np.mean((probabilities - outcomes) ** 2)),
+        "log_loss": float(-np.mean(outcomes * np.log(clipped) + (1 - outcomes) * np.log(1 - clipped))),
+        "bins": table,
+    }
+
+
+class SurrogateModel:
+    """Logistic model of the attacker's win probability from aggregate set features.
+
+    Assumes the attacker acts next, as in a fresh battle. Standardization is
+    folded into the weights so predict() is one short dot product.
+    """
+
+    def __init__(self, weights, bias, mean, scale):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+
+        # Weights on raw features, as plain floats for the scalar path
+        raw = self.weights / self.scale
+        self._raw_weights = raw.tolist()
+        self._raw_bias = self.bias - float(np.dot(raw, self.mean))
+
+    @classmethod
+    def fit(cls, features, outcomes, ridge=1e-3, iterations=25):
+        """Fit by Newton's method (IRLS) with a small L2 penalty"""
+        mean = features.mean(axis=0)
+        scale = features.std(axis=0)
+        scale[scale == 0] = 1.0
+        design = np.column_stack([np.ones(len(features)), (features - mean) / scale])
+
+        beta = np.zeros(design.shape[1])
+        penalty = ridge * np.eye(design.shape[1])
+        penalty[0, 0] = 0.0  # Leave the bias unpenalized
+        for _ in range(iterations):
+            p = 1 / (1 + np.exp(-(design @ beta)))
+            gradient = design.T @ (p - outcomes) + penalty @ beta
+            hessian = (design * (p * (1 - p))[:, None]).T @ design + penalty
+            step = np.linalg.solve(hessian, gradient)
+            beta -= step
+            if np.abs(step).max() < 1e-8:
+                break
+
+        return cls(beta[1:], beta[0], mean, scale)
+
+    @classmethod
+    def train(cls, battles=20000, rng=None, ridge=1e-3):
+        """Simulate random battles with the batch kernel and fit a model to them"""
+        rng = np.random.default_rng(rng)
+        arrays = random_battles(battles, rng)
+        features = battle_features(arrays)
+        outcome = run_battles(arrays, rng)
+        return cls.fit(features, (outcome.winners == ATTACKER_WIN).astype(np.float64), ridge)
+
+    def predict(self, attacking_set, defending_set):
+        """Probability that attacking_set beats defending_set"""
+        features = _features(hero_set_summary(attacking_set), hero_set_summary(defending_set))
+        z = self._raw_bias
+        for weight, value in zip(self._raw_weights, features):
+            z += weight * value
+        if z < -500:
+            return 0.0
+        return 1 / (1 + math.exp(-z))
+
+    def predict_arrays(self, battles):
+        """Win probabilities for every battle in a BattleArrays"""
+        z = self.bias + ((battle_features(battles) - self.mean) / self.scale) @ self.weights
+        return 1 / (1 + np.exp(-z))
+
+    def calibration(self, battles=5000, rng=None, bins=10):
+        """Calibration report on freshly simulated battles"""
+        rng = np.random.default_rng(rng)
+        arrays = random_battles(battles, rng)
+        probabilities = self.predict_arrays(arrays)
+        outcome = run_battles(arrays, rng)
+        return calibration_report(probabilities, outcome.winners == ATTACKER_WIN, bins)
+
+    def save(self, path):
+        """Save the model to an .npz file"""
+        np.savez(path, weights=self.weights, bias=self.bias, mean=self.mean, scale=self.scale,
+                 feature_names=np.array(FEATURE_NAMES))
+
+    @classmethod
+    def load(cls, path):
+        """Load a model saved with save()"""
+        with np.load(path) as data:
+            if tuple(data["feature_names"]) != FEATURE_NAMES:
+                raise ValueError("Saved model was trained on different features")
+            return cls(data["weights"], data["bias"], data["mean"], data["scale"])
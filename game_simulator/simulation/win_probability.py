@@ -0,0 +1,198 @@
+# game_simulator/simulation/win_probability.py
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+from .batch_battle import (BattleArrays, pack_hero_sets, run_battles, play_drawn_battles,
+                           ATTACKER_WIN, MAX_STEPS, MAX_TURNS, TURN_DRAWS)
+
+
+def hero_set_key(hero_set):
+    """Get a hashable snapshot of the stats and HP that decide a set's battles"""
+    return tuple((hero.attack, hero.defense, hero.current_hp, hero.is_alive) for hero in hero_set.heroes)
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """Wilson score interval for a binomial proportion"""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    # The exact bounds at p = 0 and p = 1 are 0 and 1; avoid rounding just inside them
+    low = 0.0 if successes == 0 else max(0.0, center - half_width)
+    high = 1.0 if successes == trials else min(1.0, center + half_width)
+    return low, high
+
+
+class WinProbabilityEstimator:
+    """Monte Carlo win probability of an attack, memoized per set state.
+
+    Battles run in batches of batch_size on the vectorized kernel until the
+    confidence interval is no wider than 2 * target_half_width or max_samples
+    is reached. Results are kept in an LRU cache of cache_size entries keyed by
+    the current stats and HP of both sets.
+    """
+
+    def __init__(self, cache_size=1024, batch_size=256, max_samples=4096,
+                 target_half_width=0.02, z=1.96, rng=None):
+        if batch_size < 1 or max_samples < 1:
+            raise ValueError("batch_size and max_samples must be at least 1")
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.max_samples = max_samples
+        self.target_half_width = target_half_width
+        self.z = z
+        self.rng = np.random.default_rng(rng)
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def estimate(self, attacking_set, defending_set):
+        """Estimate the outcome of attacking_set attacking defending_set"""
+        key = (hero_set_key(attacking_set), hero_set_key(defending_set))
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return dict(cached)
+
+        self.misses += 1
+        result = self._simulate(attacking_set, defending_set)
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return dict(result)
+
+    def _simulate(self, attacking_set, defending_set):
+        """Sample battles until the interval is tight enough"""
+        # Pack once and repeat the single battle along the batch axis
+        start = [np.stack([a, d]) for a, d in zip(pack_hero_sets([attacking_set]), pack_hero_sets([defending_set]))]
+
+        wins = 0
+        samples = 0
+        attacker_damage = 0.0
+        defender_damage = 0.0
+        low, high = 0.0, 1.0
+        while samples < self.max_samples:
+            count = min(self.batch_size, self.max_samples - samples)
+            battles = BattleArrays(*(np.repeat(values, count, axis=2) for values in start), max_steps=MAX_STEPS)
+            outcome = run_battles(battles, self.rng)
+
+            wins += int(np.count_nonzero(outcome.winners == ATTACKER_WIN))
+            attacker_damage += float(outcome.attacker_damage.sum())
+            defender_damage += float(outcome.defender_damage.sum())
+            samples += count
+
+            low, high = wilson_interval(wins, samples, self.z)
+            if (high - low) / 2 <= self.target_half_width:
+                break
+
+        return {
+            "win_probability": wins / samples,
+            "confidence_interval": (low, high),
+            "expected_attacker_damage": attacker_damage / samples,
+            "expected_defender_damage": defender_damage / samples,
+            "samples": samples,
+        }
+
+    def clear(self):
+        """Drop every cached estimate"""
+        self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+
+def _mean_interval(values, z):
+    """Mean of values with a normal-approximation interval"""
+    mean = float(values.mean())
+    if len(values) < 2:
+        return mean, (mean, mean)
+    half_width = z * float(values.std(ddof=1)) / math.sqrt(len(values))
+    return mean, (mean - half_width, mean + half_width)
+
+
+def compare_attacks(candidates, samples=512, rng=None, antithetic=True, z=1.96):
+    """Compare attack options on common random numbers.
+
+    candidates are (attacking_set, defending_set) or (attacking_set,
+    defending_set, win_points) tuples. Every candidate plays the same samples
+    random streams. With antithetic, the second half of the streams mirror
+    the first (u -> 1 - u) and each mirrored pair counts as one draw. The
+    candidates share their luck, so the difference between two of them is
+    measured stream by stream, with a far narrower interval than
+    independent runs of the same size give.
+
+    Differences are against the candidate with the most expected points
+    (win probability if no points are given); decided is True when the
+    points interval is below zero. variance_reduction is how many times more
+    battles independent plain sampling would need for the same interval.
+    With antithetic, an odd samples is rounded up to whole pairs.
+    """
+    if not candidates:
+        raise ValueError("Need at least one candidate to compare")
+    if samples < 1:
+        raise ValueError("samples must be at least 1")
+    rng = np.random.default_rng(rng)
+    units = (samples + 1) // 2 if antithetic else samples
+    draws = rng.random((units, MAX_TURNS, TURN_DRAWS))
+    if antithetic:
+        draws = np.concatenate([draws, 1 - draws])
+
+    wins = []
+    points = []
+    battle_variances = []  # Per-battle variance of the points, as plain sampling sees it
+    for candidate in candidates:
+        attacking_set, defending_set = candidate[:2]
+        win_points = candidate[2] if len(candidate) > 2 else 1.0
+        start = [np.stack([a, d]) for a, d in zip(pack_hero_sets([attacking_set]), pack_hero_sets([defending_set]))]
+        battles = BattleArrays(*(np.repeat(values, len(draws), axis=2) for values in start), max_steps=MAX_STEPS)
+        play_drawn_battles(battles, draws)
+        won = (battles.winner == ATTACKER_WIN).astype(np.float64)
+        battle_variances.append(float((won * win_points).var(ddof=1)) if len(won) > 1 else 0.0)
+        if antithetic:
+            won = (won[:units] + won[units:]) / 2  # One value per mirrored pair
+        wins.append(won)
+        points.append(won * win_points)
+
+    options = []
+    for won, scored in zip(wins, points):
+        win_probability, win_interval = _mean_interval(won, z)
+        expected_points, points_interval = _mean_interval(scored, z)
+        options.append({
+            "win_probability": win_probability,
+            "win_probability_interval": win_interval,
+            "expected_points": expected_points,
+            "expected_points_interval": points_interval,
+        })
+
+    best = max(range(len(options)), key=lambda i: options[i]["expected_points"])
+    differences = []
+    for i in range(len(options)):
+        win_difference, win_interval = _mean_interval(wins[i] - wins[best], z)
+        points_difference, points_interval = _mean_interval(points[i] - points[best], z)
+        # Variance per draw of independent plain runs, against what the pairing left
+        independent = (battle_variances[i] + battle_variances[best]) * units / len(draws)
+        paired = float((points[i] - points[best]).var(ddof=1)) if units > 1 else 0.0
+        if i == best:
+            reduction = None
+        else:
+            reduction = independent / paired if paired > 0 else float("inf")
+        differences.append({
+            "win_probability": win_difference,
+            "win_probability_interval": win_interval,
+            "expected_points": points_difference,
+            "expected_points_interval": points_interval,
+            "decided": i == best or points_interval[1] < 0,
+            "variance_reduction": reduction,
+        })
+
+    return {
+        "options": options,
+        "differences": differences,
+        "best": best,
+        "samples": len(draws),
+    }
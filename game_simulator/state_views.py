@@ -0,0 +1,126 @@
+# game_simulator/state_views.py
+import time
+
+
+class StateViews:
+    """Derived views of a GameState, rebuilt only when their inputs change.
+
+    Each view is stored with the revisions of the entities it was built
+    from: ownership from the FrontierIndex, each alliance's, stronghold's
+    and battle's own counter, and the living heroes of engaged NPC teams.
+    A query compares those revisions with the live ones and rebuilds the
+    view only if one moved. Views that depend
+    on protection also hold the time the first protection they saw ends,
+    since protection runs out on the clock rather than by a change.
+    Cached views are shared between callers and must not be changed.
+    """
+
+    def __init__(self, game_state):
+        self.game_state = game_state
+        self._views = {}  # View key -> (input revisions, expiry time or None, view)
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(self, key, inputs, build):
+        """Get a view, calling build() for (view, expiry time or None) when it is stale"""
+        entry = self._views.get(key)
+        if entry is not None and entry[0] == inputs and (entry[1] is None or time.time() < entry[1]):
+            self.hits += 1
+            return entry[2]
+        self.misses += 1
+        view, expires = build()
+        self._views[key] = (inputs, expires, view)
+        return view
+
+    def forget(self, key):
+        """Drop a view that can no longer be asked for, such as a finished battle's"""
+        self._views.pop(key, None)
+
+    def control_summary(self):
+        """Ids of the strongholds each alliance holds, in map order, and the neutral count"""
+        frontier = self.game_state.frontier
+        return self._cached("control", frontier.revision, self._build_control_summary)
+
+    def _build_control_summary(self):
+        game_state = self.game_state
+        control_summary = {aid: [] for aid in game_state.alliances.keys()}
+        neutral_count = 0
+        for stronghold_id, stronghold in game_state.strongholds.items():
+            if stronghold.controlling_alliance:
+                control_summary[stronghold.controlling_alliance].append(stronghold_id)
+            else:
+                neutral_count += 1
+        control_summary["neutral"] = neutral_count
+        return control_summary, None
+
+    def scores(self):
+        """Summit Showdown points of each alliance"""
+        alliances = self.game_state.alliances
+        inputs = tuple(alliance.revision for alliance in alliances.values())
+        return self._cached("scores", inputs, lambda: (
+            {aid: alliance.summit_showdown_points for aid, alliance in alliances.items()}, None))
+
+    @staticmethod
+    def _defender_inputs(stronghold):
+        """A stronghold's revision and its materialized NPC teams' living heroes.
+
+        An engaged team can be wiped out without leaving the pool, as in a
+        draw, so its losses do not move the stronghold's revision.
+        """
+        return stronghold.revision, tuple(team.living_count for team in stronghold.npc_defense_teams.teams)
+
+    def defender_counts(self, stronghold_id):
+        """Active NPC teams and garrisoned sets at a stronghold"""
+        stronghold = self.game_state.strongholds[stronghold_id]
+        return self._cached(("defenders", stronghold_id), self._defender_inputs(stronghold), lambda: ({
+            "npc": stronghold.count_active_npc_teams(),
+            "garrison": len(stronghold.garrisoned_hero_sets),
+        }, None))
+
+    def stronghold_summary(self, stronghold_id):
+        """A stronghold's owner, protection and defenders for display"""
+        stronghold = self.game_state.strongholds[stronghold_id]
+        return self._cached(("stronghold", stronghold_id), self._defender_inputs(stronghold),
+                            lambda: self._build_stronghold_summary(stronghold))
+
+    def _build_stronghold_summary(self, stronghold):
+        is_protected = not stronghold.can_be_attacked()
+        defenders = self.defender_counts(stronghold.id)
+        summary = {
+            "id": stronghold.id,
+            "level": stronghold.level,
+            "position": {"x": stronghold.x, "y": stronghold.y},
+            "controlling_alliance": stronghold.controlling_alliance,
+            "is_alliance_home": stronghold.is_alliance_home,
+            "is_protected": is_protected,
+            "active_npcs": defenders["npc"],
+            "max_npcs": stronghold.max_npc_teams,
+            "garrison_count": defenders["garrison"],
+            "max_garrison": stronghold.max_garrison_size,
+        }
+        return summary, stronghold.protection_end_time if is_protected else None
+
+    def attackable(self, alliance_id):
+        """Ids of the frontier strongholds an alliance can attack now"""
+        game_state = self.game_state
+        frontier = game_state.frontier.frontier(alliance_id)
+        inputs = (game_state.frontier.revision,
+                  tuple(game_state.strongholds[stronghold_id].revision for stronghold_id in frontier))
+        return self._cached(("attackable", alliance_id), inputs, lambda: self._build_attackable(frontier))
+
+    def _build_attackable(self, frontier):
+        strongholds = self.game_state.strongholds
+        attackable = []
+        expires = None
+        for stronghold_id in frontier:
+            stronghold = strongholds[stronghold_id]
+            if stronghold.can_be_attacked():
+                attackable.append(stronghold_id)
+            elif expires is None or stronghold.protection_end_time < expires:
+                expires = stronghold.protection_end_time
+        return attackable, expires
+
+    def battle_status(self, battle):
+        """A battle's get_battle_status(), rebuilt after its turns or its sets' losses"""
+        inputs = (battle, battle.revision, battle.attacking_set.living_count, battle.defending_set.living_count)
+        return self._cached(("battle", battle.id), inputs, lambda: (battle.get_battle_status(), None))
@@ -318,6 +318,20 @@ def create_swagger_spec():
                             "required": True,
                             "schema": {"type": "integer", "minimum": 1, "maximum": 4},
                             "description": "Alliance ID (1-4)"
+                        },
+                        {
+                            "name": "top",
+                            "in": "query",
+                            "required": False,
+                            "schema": {"type": "integer", "minimum": 0},
+                            "description": "Return only this many sets, strongest (attack plus current HP) first"
+                        },
+                        {
+                            "name": "npc_level",
+                            "in": "query",
+                            "required": False,
+                            "schema": {"type": "integer", "minimum": 1, "maximum": 3},
+                            "description": "Rank sets by their chance to beat a full-HP NPC team of this level, and include each set's npc_outcome"
                         }
                     ],
                     "responses": {
@@ -329,6 +343,14 @@ def create_swagger_spec():
                                 }
                             }
                         },
+                        "400": {
+                            "description": "Invalid npc_level",
+                            "content": {
+                                "application/json": {
+                                    "schema": {"$ref": "#/components/schemas/Error"}
+                                }
+                            }
+                        },
                         "404": {
                             "description": "Alliance not found",
                             "content": {
@@ -541,6 +563,7 @@ def create_swagger_spec():
                     "properties": {
                         "half": {"type": "integer", "description": "Current game half (1 or 2)"},
                         "game_time": {"type": "number", "description": "Elapsed game time in seconds"},
+                        "revision": {"type": "integer", "description": "Increases whenever a battle starts, plays a turn or ends, or a new half begins"},
                         "active_battles": {"type": "integer", "description": "Number of active battles"},
                         "alliance_scores": {
                             "type": "object",
@@ -611,7 +634,8 @@ def create_swagger_spec():
                             "type": "array",
                             "items": {"$ref": "#/components/schemas/HeroSet"}
                         },
-                        "total_count": {"type": "integer"}
+                        "total_count": {"type": "integer", "description": "Number of sets returned"},
+                        "available_count": {"type": "integer", "description": "Number of sets the alliance can attack with, whatever top limits the list to"}
                     }
                 },
                 "HeroSet": {
@@ -625,7 +649,17 @@ def create_swagger_spec():
                         "total_hp": {"type": "number"},
                         "max_hp": {"type": "number"},
                         "can_attack": {"type": "boolean"},
-                        "is_garrisoned": {"type": "boolean"}
+                        "is_garrisoned": {"type": "boolean"},
+                        "npc_outcome": {
+                            "type": "object",
+                            "description": "Only with npc_level: outcome against a full-HP NPC team of that level",
+                            "properties": {
+                                "win_probability": {"type": "number"},
+                                "expected_attacker_damage": {"type": "number"},
+                                "expected_defender_damage": {"type": "number"},
+                                "samples": {"type": "integer"}
+                            }
+                        }
                     }
                 },
                 "BattleList": {
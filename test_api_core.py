@@ -67,6 +67,24 @@ def test_map_and_strongholds(game):
     print(f"  - Level: {level3.level}, Can attack: {level3.can_be_attacked()}")
     print(f"  - NPCs: {len(level3.get_active_npc_teams())}/{level3.max_npc_teams}")
 
+def test_npc_team_pools(game):
+    """Test that NPC teams are counted without being built"""
+    print("\n🛡️ Testing NPC Team Pools...")
+    
+    stronghold = game.get_stronghold("S2-9")
+    pool = stronghold.npc_defense_teams
+    count = stronghold.count_active_npc_teams()
+    assert count == stronghold.max_npc_teams and pool.untouched == count
+    print(f"✓ Stronghold {stronghold.id}: {count} NPC teams counted, {len(pool.teams)} built")
+    
+    defender = stronghold.get_all_defending_sets()[0]
+    assert defender.is_npc and len(pool.teams) == 1 and stronghold.count_active_npc_teams() == count
+    print(f"✓ First defender built on demand: {defender.id}")
+    
+    teams = stronghold.get_active_npc_teams()
+    assert len(teams) == count and pool.untouched == 0
+    print(f"✓ Listing the teams builds all {len(teams)}")
+
 def test_battle_system(game):
     """Test battle functionality"""
     print("\n⚔️ Testing Battle System...")
@@ -151,6 +169,33 @@ def test_api_data_structures(game):
         else:
             print(f"  - {key}: {value}")
 
+def test_frontier_index(game):
+    """Test that the frontier index agrees with walking the map"""
+    print("\n🗺️ Testing Frontier Index...")
+    
+    from game_simulator.map_layout import get_adjacent_strongholds
+    
+    def check(game):
+        for alliance_id, alliance in game.alliances.items():
+            adjacent = get_adjacent_strongholds(game.strongholds, alliance.controlled_strongholds)
+            assert set(game.get_frontier(alliance_id)) == set(adjacent)
+            attackable = [stronghold_id for stronghold_id in adjacent
+                          if game.get_stronghold(stronghold_id).can_be_attacked()]
+            assert sorted(game.get_attackable_strongholds(alliance_id)) == sorted(attackable)
+            print(f"✓ Alliance {alliance_id}: {len(adjacent)} frontier strongholds, {len(attackable)} attackable")
+    
+    check(game)
+    
+    # Captures on a separate game, applied the way battle resolution does
+    captured = GameState(seed=7)
+    for stronghold_id in ["S1-2", "S1-5", "S2-9"]:
+        stronghold = captured.get_stronghold(stronghold_id)
+        stronghold.controlling_alliance = 1
+        captured.alliances[1].add_stronghold(stronghold_id)
+        captured.frontier.set_owner(stronghold_id, 1)
+    print("✓ After Alliance 1 captures S1-2, S1-5 and S2-9:")
+    check(captured)
+
 def test_game_status(game):
     """Test game status reporting"""
     print("\n📈 Testing Game Status...")
@@ -183,12 +228,18 @@ def main():
         # Test map and strongholds
         test_map_and_strongholds(game)
         
+        # Test NPC team pools
+        test_npc_team_pools(game)
+        
         # Test battle system
         test_battle_system(game)
         
         # Test API data structures
         test_api_data_structures(game)
         
+        # Test frontier index
+        test_frontier_index(game)
+        
         # Test game status
         test_game_status(game)
         
@@ -0,0 +1,78 @@
+# tests/test_available_set_pool.py
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import game modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_simulator.entities.alliance import Alliance
+from game_simulator.rng import roster_rng
+
+class TestAvailableSetPool(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.alliance = Alliance(1, "Test Alliance", rng=roster_rng(0, 1))
+        self.pool = self.alliance.available_sets
+    
+    def _scan(self):
+        return [hero_set for player in self.alliance.players for hero_set in player.get_available_sets_for_attack()]
+    
+    def _strongest(self, count):
+        return sorted(self._scan(), key=lambda hero_set: -hero_set.get_power_rating())[:count]
+    
+    def test_pool_follows_set_status(self):
+        """Test that consuming, defeating and resetting sets moves them in and out in roster order"""
+        self.assertEqual(len(self.pool), 300)
+        consumed = self.alliance.players[3].selected_hero_sets[2]
+        defeated = self.alliance.players[7].selected_hero_sets[0]
+        consumed.mark_consumed_for_attack()
+        for hero in defeated.heroes:
+            hero.take_damage(hero.max_hp)
+        
+        self.assertNotIn(consumed, self.pool)
+        self.assertNotIn(defeated, self.pool)
+        self.assertEqual(self.alliance.get_available_hero_sets_count(), 298)
+        self.assertEqual(self.alliance.get_all_available_hero_sets(), self._scan())
+        
+        self.alliance.reset_all_hero_sets_for_new_half()
+        defeated.heal_all_heroes()
+        self.assertIn(consumed, self.pool)
+        self.assertIn(defeated, self.pool)
+        self.assertEqual(self.alliance.get_all_available_hero_sets(), self._scan())
+    
+    def test_reselected_sets_keep_roster_order(self):
+        """Test that a player's new sets take the old sets' place in the pool"""
+        player = self.alliance.players[10]
+        player.select_hero_sets(list(range(20, 50)))
+        self.assertEqual(len(self.pool), 300)
+        self.assertEqual(self.alliance.get_all_available_hero_sets(), self._scan())
+        self.assertIs(self.alliance.get_all_available_hero_sets()[60], player.selected_hero_sets[0])
+    
+    def test_strongest_sets_follow_damage(self):
+        """Test that top-k queries rank by current power after damage and healing"""
+        self.assertEqual(self.alliance.get_strongest_available_sets(5), self._strongest(5))
+        
+        best = self.alliance.get_strongest_available_sets(1)[0]
+        for hero in best.heroes:
+            hero.take_damage(hero.max_hp - 1)
+        self.assertNotIn(best, self.alliance.get_strongest_available_sets(10))
+        self.assertEqual(self.alliance.get_strongest_available_sets(10), self._strongest(10))
+        
+        best.heal_all_heroes()
+        self.assertIs(self.alliance.get_strongest_available_sets(1)[0], best)
+        self.assertEqual(len(self.alliance.get_strongest_available_sets(1000)), 300)
+
+    def test_strongest_after_scattered_damage(self):
+        """Test that top-k queries match a full sort after damage to many sets"""
+        self.alliance.get_strongest_available_sets(1)
+        for i, player in enumerate(self.alliance.players):
+            for j, hero_set in enumerate(player.selected_hero_sets):
+                if (i + j) % 3 == 0:
+                    hero_set.heroes[j % 5].take_damage(500 * (i % 7 + 1))
+        for count in (1, 5, 40, 300):
+            self.assertEqual(self.alliance.get_strongest_available_sets(count), self._strongest(count))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# tests/test_backends.py
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import game modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_simulator.entities.summit_battle import EXPECTED
+from game_simulator.entities.battle_log import LOG_FULL
+from game_simulator.game_state import GameState
+from game_simulator.simulation.backends import get_backend, ReferenceBackend, VectorizedBackend
+from game_simulator.simulation.backend_harness import compare_backends, matchup_tapes
+
+class TestBattleBackends(unittest.TestCase):
+
+    def test_vectorized_matches_reference(self):
+        """Test that the vectorized backend reproduces every reference battle"""
+        report = compare_backends("vectorized", count=60, seed=5)
+
+        self.assertTrue(report["exact"])
+        self.assertTrue(report["agrees"])
+        self.assertEqual(report["winner_mismatches"], 0)
+        self.assertEqual(report["step_mismatches"], 0)
+        self.assertEqual(report["damage_mismatches"], 0)
+        self.assertGreater(report["candidate_ms_per_battle"], 0)
+
+    def test_expected_agrees_statistically(self):
+        """Test that the approximate backend is judged on win rates only"""
+        report = compare_backends("expected", count=100, seed=5)
+
+        self.assertFalse(report["exact"])
+        self.assertTrue(report["agrees"])
+        self.assertLess(abs(report["candidate_win_rate"] - report["reference_win_rate"]), 0.1)
+
+    def test_vectorized_run_keeps_turn_logs(self):
+        """Test that battles with turn logs or shared sets still match when run in a batch"""
+        tapes = matchup_tapes(8, seed=11)
+        reference = [tape.new_battle(LOG_FULL) for tape in tapes]
+        batched = [tape.new_battle(LOG_FULL if i % 2 else 0) for i, tape in enumerate(tapes)]
+        ReferenceBackend().run(reference)
+        VectorizedBackend().run(batched)
+
+        for i, (expected, actual) in enumerate(zip(reference, batched)):
+            self.assertEqual(actual.winner, expected.winner)
+            self.assertEqual(actual.current_step, expected.current_step)
+            self.assertEqual(actual.attacker_total_damage, expected.attacker_total_damage)
+            if i % 2:
+                self.assertEqual(len(actual.battle_log), len(expected.battle_log))
+
+    def test_backend_selection(self):
+        """Test choosing a backend by name and per GameState"""
+        self.assertIsInstance(get_backend("vectorized"), VectorizedBackend)
+        backend = ReferenceBackend()
+        self.assertIs(get_backend(backend), backend)
+        with self.assertRaises(ValueError):
+            get_backend("quantum")
+
+        game_state = GameState(battle_backend="expected")
+        self.assertEqual(game_state.battle_mode, EXPECTED)
+        self.assertFalse(game_state.vectorized_battles)
+
+if __name__ == '__main__':
+    unittest.main()
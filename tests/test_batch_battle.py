@@ -0,0 +1,146 @@
+# tests/test_batch_battle.py
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import game modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import copy
+import numpy as np
+
+from game_simulator.entities.hero import Hero
+from game_simulator.entities.hero_set import HeroSet
+from game_simulator.entities.summit_battle import SummitBattle, EXPECTED
+from game_simulator.simulation.batch_battle import (
+    simulate_battles, advance_summit_battles, BattleArrays, ATTACKER_WIN, DEFENDER_WIN, ONGOING, WINNER_NAMES
+)
+
+class TestBatchBattle(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.attacking_sets = [HeroSet(f"atk_{i}", "player_1") for i in range(20)]
+        self.defending_sets = [HeroSet(f"def_{i}", "NPC", is_npc=True, stronghold_level=1) for i in range(20)]
+
+    def _harmless_set(self, set_id):
+        """Create a set that can neither hurt nor be hurt by normal heroes"""
+        heroes = [Hero(f"{set_id}_H{i}", is_npc=True, stronghold_level=1) for i in range(5)]
+        for hero in heroes:
+            hero.attack = 1
+            hero.defense = 100000
+        return HeroSet(set_id, "NPC", heroes, is_npc=True)
+
+    def test_result_arrays(self):
+        """Test that a batch returns one outcome per battle"""
+        result = simulate_battles(self.attacking_sets, self.defending_sets, rng=1)
+
+        self.assertEqual(len(result), 20)
+        self.assertEqual(result.winners.shape, (20,))
+        self.assertTrue(np.all(result.winners != ONGOING))
+        self.assertTrue(np.all(result.steps <= 50))
+        self.assertTrue(np.all(result.attacker_damage >= 0))
+        self.assertTrue(np.all(result.defender_damage >= 0))
+
+        for name in result.winner_names():
+            self.assertIn(name, ["attacker", "defender", "draw"])
+
+    def test_heroes_untouched(self):
+        """Test that batch simulation does not damage the real heroes"""
+        simulate_battles(self.attacking_sets, self.defending_sets, rng=1)
+
+        for hero_set in self.attacking_sets + self.defending_sets:
+            self.assertEqual(hero_set.get_total_hp(), hero_set.get_max_hp())
+
+    def test_reproducible_with_seed(self):
+        """Test that the same seed gives the same outcomes"""
+        first = simulate_battles(self.attacking_sets, self.defending_sets, rng=7)
+        second = simulate_battles(self.attacking_sets, self.defending_sets, rng=7)
+
+        np.testing.assert_array_equal(first.winners, second.winners)
+        np.testing.assert_array_equal(first.steps, second.steps)
+        np.testing.assert_array_equal(first.attacker_damage, second.attacker_damage)
+
+    def test_defeated_defenders(self):
+        """Test that a battle against a wiped out set is decided before any turn"""
+        for hero in self.defending_sets[0].heroes:
+            hero.take_damage(hero.max_hp + 100)
+
+        result = simulate_battles(self.attacking_sets[:1], self.defending_sets[:1], rng=1)
+
+        self.assertEqual(result.winners[0], ATTACKER_WIN)
+        self.assertEqual(result.steps[0], 0)
+
+    def test_step_limit_tie(self):
+        """Test that a battle nobody can damage goes 50 steps and the defender wins the tie"""
+        attackers = [self._harmless_set("atk_harmless")]
+        defenders = [self._harmless_set("def_harmless")]
+
+        result = simulate_battles(attackers, defenders, rng=1)
+
+        self.assertEqual(result.steps[0], 50)
+        self.assertEqual(result.attacker_damage[0], 0)
+        self.assertEqual(result.winners[0], DEFENDER_WIN)
+
+    def test_lockstep_battles_finish_independently(self):
+        """Test that short battles stop while long ones continue"""
+        attackers = [self._harmless_set("atk_harmless"), self.attacking_sets[0]]
+        defenders = [self._harmless_set("def_harmless"), self.defending_sets[0]]
+
+        battles = BattleArrays.from_hero_sets(attackers, defenders)
+        result = simulate_battles(attackers, defenders, rng=3)
+
+        self.assertEqual(battles.size, 2)
+        self.assertEqual(result.steps[0], 50)
+        self.assertLess(result.steps[1], 50)
+
+    def test_advance_matches_scalar_turns(self):
+        """Test that vectorized turns give the same battles as execute_turn on the same streams"""
+        # Battles 0 and 1 share a defending set, as several attackers can hit one NPC team
+        pairs = [(0, 0), (1, 0), (2, 2), (3, 3), (4, 4)]
+        battles = [
+            SummitBattle(f"Battle_{i}", self.attacking_sets[a], self.defending_sets[d], "S1",
+                         rng=np.random.default_rng(i))
+            for i, (a, d) in enumerate(pairs)
+        ]
+        scalar = battles
+        vectorized = copy.deepcopy(battles)
+
+        for _ in range(120):
+            for battle in scalar:
+                battle.execute_turn()
+            advance_summit_battles(vectorized)
+
+        for expected, actual in zip(scalar, vectorized):
+            self.assertFalse(actual.is_active)
+            self.assertEqual(actual.winner, expected.winner)
+            self.assertEqual(actual.current_step, expected.current_step)
+            self.assertEqual(actual.attacker_total_damage, expected.attacker_total_damage)
+            self.assertEqual(actual.defender_total_damage, expected.defender_total_damage)
+            for hero_set in ("attacking_set", "defending_set"):
+                for mine, theirs in zip(getattr(actual, hero_set).heroes, getattr(expected, hero_set).heroes):
+                    self.assertEqual(mine.current_hp, theirs.current_hp)
+                    self.assertEqual(mine.is_alive, theirs.is_alive)
+
+    def test_expected_mode_matches_scalar(self):
+        """Test that expected-value batches are deterministic and match SummitBattle"""
+        first = simulate_battles(self.attacking_sets, self.defending_sets, expected=True)
+        second = simulate_battles(self.attacking_sets, self.defending_sets, expected=True)
+        np.testing.assert_array_equal(first.attacker_damage, second.attacker_damage)
+
+        for i in range(len(first)):
+            battle = SummitBattle(f"Battle_{i}", self.attacking_sets[i], self.defending_sets[i], "S1")
+            battle.simulate_to_completion(EXPECTED)
+
+            self.assertEqual(battle.winner, WINNER_NAMES[first.winners[i]])
+            self.assertEqual(battle.current_step, first.steps[i])
+            self.assertEqual(battle.attacker_total_damage, first.attacker_damage[i])
+            self.assertEqual(battle.defender_total_damage, first.defender_damage[i])
+
+    def test_mismatched_lengths(self):
+        """Test that attacking and defending lists must pair up"""
+        with self.assertRaises(ValueError):
+            simulate_battles(self.attacking_sets, self.defending_sets[:3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# tests/test_battle_farm.py
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import game modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from game_simulator.simulation.backend_harness import matchup_tapes, run_backend
+from game_simulator.simulation.battle_farm import BattleFarm, farm_inputs
+
+class TestBattleFarm(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.tapes = matchup_tapes(50, seed=9)
+        self.stats, self.seeds = farm_inputs(self.tapes)
+
+    def test_matches_reference(self):
+        """Test that farmed battles come out as SummitBattle plays them"""
+        result = BattleFarm(workers=0, chunk_size=16).run(self.stats, self.seeds)
+        battles, _ = run_backend("reference", self.tapes)
+
+        self.assertTrue(result.done.all())
+        self.assertFalse(result.cancelled)
+        self.assertEqual(result.winner_names(), [battle.winner for battle in battles])
+        self.assertEqual(result.steps.tolist(), [battle.current_step for battle in battles])
+        self.assertTrue(np.allclose(result.attacker_damage, [battle.attacker_total_damage for battle in battles]))
+        self.assertEqual(result.final_hp[0, 0, 0], battles[0].attacking_set.heroes[0].current_hp)
+
+    def test_results_independent_of_workers(self):
+        """Test that worker processes and chunking do not change the results"""
+        local = BattleFarm(workers=0, chunk_size=50).run(self.stats, self.seeds)
+        pooled = BattleFarm(workers=2, chunk_size=7).run(self.stats, self.seeds)
+
+        self.assertTrue(pooled.done.all())
+        self.assertTrue(np.array_equal(local.winners, pooled.winners))
+        self.assertTrue(np.array_equal(local.steps, pooled.steps))
+        self.assertTrue(np.array_equal(local.final_hp, pooled.final_hp))
+
+    def test_progress_and_cancel(self):
+        """Test that progress is reported per chunk and cancel stops the batch"""
+        farm = BattleFarm(workers=0, chunk_size=10)
+        reports = []
+
+        def progress(done, total):
+            reports.append((done, total))
+            if done >= 20:
+                farm.cancel()
+
+        result = farm.run(self.stats, self.seeds, progress)
+
+        self.assertEqual(reports, [(10, 50), (20, 50)])
+        self.assertTrue(result.cancelled)
+        self.assertEqual(int(result.done.sum()), 20)
+        self.assertTrue((result.winners[20:] == 0).all())
+
+    def test_cancel_stops_worker_submissions(self):
+        """Test that a cancel with workers starts no chunk after the ones in flight"""
+        farm = BattleFarm(workers=2, chunk_size=5)
+        reports = []
+
+        def progress(done, total):
+            reports.append(done)
+            farm.cancel()
+
+        result = farm.run(self.stats, self.seeds, progress)
+
+        self.assertTrue(result.cancelled)
+        self.assertLessEqual(int(result.done.sum()), 15)  # At most a chunk per worker and one waiting
+        self.assertEqual(int(result.done.sum()), reports[-1])
+        self.assertTrue((result.winners[~result.done] == 0).all())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+# tests/test_battle_stats.py
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import game modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from game_simulator.entities.hero_set import HeroSet
+from game_simulator.entities.summit_battle import SummitBattle, SAMPLED, EXPECTED
+from game_simulator.entities.battle_log import LOG_NONE
+from game_simulator.game_state import GameState
+from game_simulator.simulation.backends import ReferenceBackend, VectorizedBackend
+from game_simulator.simulation.backend_harness import matchup_tapes
+from game_simulator.simulation.battle_stats import BattleStats, HERO_FIELDS, NO_ALLIANCE
+
+class TestBattleStats(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.stats = BattleStats(capacity=4)
+        self.attacking_set = HeroSet("atk", "player_1")
+        self.defending_set = HeroSet("S1-2_NPC_1", "NPC", is_npc=True, stronghold_level=2)
+
+    def _run(self, backend, tapes):
+        stats = BattleStats()
+        battles = [tape.new_battle(LOG_NONE) for tape in tapes]
+        for battle in battles:
+            battle.track_stats(stats, 1, NO_ALLIANCE)
+        backend.run(battles)
+        return stats, battles
+
+    def test_counts_without_log(self):
+        """Test that counters add up over a battle that keeps no log"""
+        battle = SummitBattle("b1", self.attacking_set, self.defending_set, "S1-2", log_level=LOG_NONE)
+        battle.track_stats(self.stats, 1)
+        battle.simulate_to_completion()
+
+        attackers = self.stats.hero_set_totals(self.attacking_set)
+        defenders = self.stats.hero_set_totals(self.defending_set)
+        stronghold = self.stats.stronghold_totals("S1-2")
+
+        self.assertEqual(len(battle.battle_log), 0)
+        self.assertEqual(attackers["battles"], 5)
+        self.assertAlmostEqual(attackers["damage_dealt"], battle.attacker_total_damage)
+        self.assertAlmostEqual(defenders["damage_taken"], battle.attacker_total_damage)
+        self.assertAlmostEqual(attackers["damage_taken"], defenders["damage_dealt"])
+        self.assertEqual(attackers["turns_acted"] + defenders["turns_acted"], battle.turns_played)
+        self.assertEqual(defenders["deaths"], 5 - len(self.defending_set.get_living_heroes()))
+        self.assertEqual(stronghold["battles"], 1)
+        self.assertEqual(stronghold["turns"], battle.turns_played)
+        self.assertEqual(self.stats.alliance_totals(1)["battles"], 5)
+        self.assertEqual(self.stats.alliance_totals(NO_ALLIANCE)["battles"], 5)
+
+    def test_respawned_heroes_reuse_rows(self):
+        """Test that memory grows with distinct heroes, not with battles"""
+        for _ in range(3):
+            respawned = HeroSet("S1-2_NPC_1", "NPC", is_npc=True, stronghold_level=2)
+            self.stats.start_battle(SummitBattle("b", self.attacking_set, respawned, "S1-2"))
+
+        self.assertEqual(len(self.stats.hero_rows), 10)
+        self.assertEqual(self.stats.hero_totals(respawned.heroes[0])["battles"], 3)
+        self.assertEqual(self.stats.stronghold_totals("S1-2")["battles"], 3)
+
+    def test_batch_run_matches_scalar(self):
+        """Test that kernel tallies give the same counters as scalar turns"""
+        tapes = matchup_tapes(40, seed=21)
+        scalar, scalar_battles = self._run(ReferenceBackend(), tapes)
+        batched, batched_battles = self._run(VectorizedBackend(), tapes)
+
+        scalar_ids, scalar_table = scalar.hero_table()
+        batched_ids, batched_table = batched.hero_table()
+        self.assertEqual(scalar_ids, batched_ids)
+        self.assertEqual(scalar_table.shape[1], len(HERO_FIELDS))
+        self.assertTrue(np.allclose(scalar_table, batched_table))
+        self.assertEqual([b.turns_played for b in scalar_battles], [b.turns_played for b in batched_battles])
+        self.assertEqual([b.ineffective_turns for b in scalar_battles], [b.ineffective_turns for b in batched_battles])
+
+    def _stalemate(self, short_circuit, backend=None, mode=SAMPLED):
+        """Play a battle in which neither side can hurt the other, from the defender's first turn"""
+        stats = BattleStats()
+        attacking_set = HeroSet("atk", "player_1")
+        defending_set = HeroSet("S3-10_NPC_1", "NPC", is_npc=True, stronghold_level=3)
+        for hero_set in (attacking_set, defending_set):
+            for hero in hero_set.heroes:
+                hero.attack = 50
+                hero.defense = 100
+        attacking_set.heroes[0].take_damage(attacking_set.heroes[0].max_hp + 100)
+        battle = SummitBattle("b1", attacking_set, defending_set, "S3-10", rng=np.random.default_rng(5), log_level=LOG_NONE)
+        battle.track_stats(stats, 1)
+        battle.short_circuit = False
+        (battle.execute_expected_turn if mode == EXPECTED else battle.execute_turn)()
+        battle.short_circuit = short_circuit
+        if backend is not None:
+            backend.run([battle])
+        else:
+            battle.simulate_to_completion(mode)
+        return stats, battle
+
+    def test_stalemate_jump_counts_skipped_turns(self):
+        """Test that skipping a stalemate to the step limit leaves the same counters as playing it"""
+        for backend, mode in ((None, SAMPLED), (None, EXPECTED), (VectorizedBackend(), SAMPLED)):
+            played_stats, played = self._stalemate(False, backend, mode)
+            skipped_stats, skipped = self._stalemate(True, backend, mode)
+
+            self.assertEqual(played.turns_played, 2 * played.max_steps)
+            self.assertEqual(skipped.turns_played, played.turns_played)
+            self.assertAlmostEqual(skipped.ineffective_turns, played.ineffective_turns)
+            self.assertEqual(skipped.winner, played.winner)
+            self.assertTrue(np.allclose(skipped_stats.hero_table()[1], played_stats.hero_table()[1]))
+            for field, value in played_stats.stronghold_totals("S3-10").items():
+                self.assertAlmostEqual(skipped_stats.stronghold_totals("S3-10")[field], value)
+            self.assertEqual(skipped.skipped_turns, 2 * skipped.max_steps - 1)
+            self.assertEqual(played.skipped_turns, 0)
+
+    def test_game_state_tracks_battles(self):
+        """Test that GameState battles feed the match counters"""
+        game_state = GameState(seed=7)
+        attacking_set = game_state.get_alliance(1).get_all_available_hero_sets()[0]
+        battle = game_state.start_battle(attacking_set, "S1-2")
+        while game_state.active_battles:
+            game_state.update_battles()
+
+        self.assertEqual(game_state.battle_stats.alliance_totals(1)["battles"], 5)
+        self.assertEqual(game_state.battle_stats.hero_set_totals(attacking_set)["battles"], 5)
+        self.assertEqual(game_state.battle_stats.stronghold_totals("S1-2")["attacker_wins"],
+                         1 if battle.winner == "attacker" else 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+# tests/test_battle_tape.py
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import game modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_simulator.entities.hero_set import HeroSet
+from game_simulator.entities.summit_battle import SummitBattle
+from game_simulator.entities.battle_tape import BattleTape
+from game_simulator.entities.battle_log import LOG_FULL, LOG_OUTCOME
+from game_simulator.game_state import GameState
+from game_simulator.rng import battle_rng, new_match_seed
+
+def _untimed(entries):
+    """Log entries without their timestamps"""
+    return [entry.split("] ", 1)[1] for entry in entries]
+
+class TestBattleTape(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.seed = new_match_seed()
+        self.attacking_set = HeroSet("atk", "player_1")
+        self.defending_set = HeroSet("def", "NPC", is_npc=True, stronghold_level=2)
+        # Start part-fought so the tape has to keep wounded and dead heroes
+        self.attacking_set.heroes[0].take_damage(self.attacking_set.heroes[0].max_hp)
+        self.attacking_set.heroes[1].take_damage(1234.5)
+
+    def _battle(self, log_level):
+        battle = SummitBattle("Battle_7", self.attacking_set, self.defending_set, "S1-2",
+                              rng=battle_rng(self.seed, 7), log_level=log_level)
+        battle.tape = BattleTape.record(battle, self.seed, 7)
+        return battle
+
+    def test_replay_matches_battle(self):
+        """Test that replaying a tape rebuilds the battle and its full log"""
+        battle = self._battle(LOG_FULL)
+        tape = battle.tape
+        battle.simulate_to_completion()
+
+        replay = tape.replay()
+
+        self.assertIsNot(replay.attacking_set, self.attacking_set)
+        self.assertEqual(replay.winner, battle.winner)
+        self.assertEqual(replay.current_step, battle.current_step)
+        self.assertEqual(replay.attacker_total_damage, battle.attacker_total_damage)
+        self.assertEqual([h.current_hp for h in replay.attacking_set.heroes],
+                         [h.current_hp for h in self.attacking_set.heroes])
+        # Only the wall-clock duration of the final record differs
+        self.assertEqual(_untimed(replay.battle_log)[:-1], _untimed(battle.battle_log)[:-1])
+
+    def test_live_log_from_tape(self):
+        """Test that a battle without a full log shows its turns from the tape"""
+        battle = self._battle(LOG_OUTCOME)
+        for _ in range(5):
+            battle.execute_turn()
+
+        entries = battle.get_recent_log_entries(20)
+        replay = battle.tape.replay(until=battle)
+
+        self.assertEqual(len(battle.battle_log), 1)
+        self.assertGreater(len(entries), 5)
+        self.assertEqual(replay.current_step, battle.current_step)
+        self.assertEqual(replay.is_attacker_turn, battle.is_attacker_turn)
+        self.assertEqual(replay.attacker_total_damage, battle.attacker_total_damage)
+
+        # The cached replay is continued rather than rebuilt
+        battle.execute_turn()
+        self.assertIs(battle.tape.replay(until=battle), replay)
+        self.assertEqual(replay.defender_total_damage, battle.defender_total_damage)
+
+    def test_finished_battles_replay_from_game_state(self):
+        """Test that GameState keeps tapes of finished battles"""
+        game_state = GameState(seed=99)
+        attacking_set = game_state.get_alliance(1).get_all_available_hero_sets()[0]
+        battle = game_state.start_battle(attacking_set, "S1-2")
+
+        while game_state.active_battles:
+            game_state.update_battles()
+
+        replay = game_state.get_battle(battle.id)
+        self.assertIsNotNone(replay)
+        self.assertFalse(replay.is_active)
+        self.assertEqual(replay.winner, battle.winner)
+        self.assertEqual(replay.current_step, battle.current_step)
+        self.assertGreater(len(replay.battle_log), len(battle.battle_log))
+        self.assertIsNone(game_state.get_battle("Battle_999"))
+
+    def test_viewing_finished_battle_keeps_no_replay(self):
+        """Test that a finished battle's replay is not held once it has been viewed"""
+        game_state = GameState(seed=99)
+        attacking_set = game_state.get_alliance(1).get_all_available_hero_sets()[0]
+        battle = game_state.start_battle(attacking_set, "S1-2")
+        while game_state.active_battles:
+            game_state.update_battles()
+
+        tape = game_state.battle_tapes[battle.id]
+        first = game_state.get_battle(battle.id)
+        self.assertIsNone(tape._replay)
+        second = game_state.get_battle(battle.id)
+        self.assertIsNone(tape._replay)
+        self.assertEqual(second.battle_log, first.battle_log)
+
+if __name__ == '__main__':
+    unittest.main()
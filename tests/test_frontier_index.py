@@ -0,0 +1,68 @@
+# tests/test_frontier_index.py
+import unittest
+import random
+import sys
+import os
+
+# Add the parent directory to the path so we can import game modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_simulator.frontier_index import FrontierIndex
+from game_simulator.game_state import GameState
+from game_simulator.map_layout import create_game_map, get_adjacent_strongholds
+
+class TestFrontierIndex(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.strongholds = create_game_map()
+        for alliance_id in range(1, 5):
+            self.strongholds[f"T{alliance_id}"].set_as_alliance_home(alliance_id)
+        self.index = FrontierIndex(self.strongholds)
+    
+    def _scan(self, alliance_id):
+        controlled = [stronghold_id for stronghold_id, stronghold in self.strongholds.items()
+                      if stronghold.controlling_alliance == alliance_id]
+        return set(get_adjacent_strongholds(self.strongholds, controlled))
+    
+    def test_homes_border_their_neighbours(self):
+        """Test that a fresh map's frontiers are the homes' connections"""
+        self.assertEqual(set(self.index.frontier(1)), set(self.strongholds["T1"].connections))
+        self.assertIn(self.strongholds["T1"].connections[0], self.index.frontier(1))
+        self.assertEqual(list(self.index.frontier(7)), [])
+    
+    def test_matches_scan_through_ownership_changes(self):
+        """Test that the index agrees with a full adjacency scan as strongholds change hands"""
+        rng = random.Random(5)
+        contested = [stronghold_id for stronghold_id in self.strongholds if not stronghold_id.startswith("T")]
+        for _ in range(200):
+            stronghold_id = rng.choice(contested)
+            owner = rng.choice([None, 1, 2, 3, 4])
+            self.strongholds[stronghold_id].controlling_alliance = owner
+            self.index.set_owner(stronghold_id, owner)
+            for alliance_id in range(1, 5):
+                self.assertEqual(set(self.index.frontier(alliance_id)), self._scan(alliance_id))
+    
+    def test_game_state_follows_captures(self):
+        """Test that GameState attack checks use the frontier and see captures"""
+        game_state = GameState(seed=3)
+        target = game_state.strongholds["T1"].connections[0]
+        self.assertTrue(game_state.can_alliance_attack_stronghold(1, target))
+        self.assertFalse(game_state.can_alliance_attack_stronghold(1, "S3-10"))
+        
+        game_state.strongholds[target].controlling_alliance = 1
+        game_state.get_alliance(1).add_stronghold(target)
+        game_state.frontier.set_owner(target, 1)
+        self.assertFalse(game_state.can_alliance_attack_stronghold(1, target))
+        self.assertEqual(set(game_state.get_frontier(1)),
+                         set(get_adjacent_strongholds(game_state.strongholds, game_state.get_alliance(1).controlled_strongholds)))
+        
+        # Protection hides a frontier stronghold from attacks but keeps it on the frontier
+        protected = next(iter(game_state.get_frontier(1)))
+        game_state.strongholds[protected].start_protection(20)
+        self.assertIn(protected, game_state.get_frontier(1))
+        self.assertNotIn(protected, game_state.get_attackable_strongholds(1))
+        self.assertFalse(game_state.can_alliance_attack_stronghold(1, protected))
+
+if __name__ == '__main__':
+    unittest.main()
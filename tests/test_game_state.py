@@ -6,10 +6,13 @@ import os
 # Add the parent directory to the path so we can import game modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import numpy as np
+
 from game_simulator.game_state import GameState
 from game_simulator.entities.summit_battle import SummitBattle
 from game_simulator.entities.hero import Hero
 from game_simulator.entities.hero_set import HeroSet
+from game_simulator.rng import battle_rng, roster_rng
 
 class TestGameState(unittest.TestCase):
     
@@ -166,6 +169,144 @@ class TestGameState(unittest.TestCase):
         
         self.assertEqual(state_dict["game_time"], 0.0)
         self.assertEqual(state_dict["current_half"], 1)
+        
+    def test_seeded_match_is_reproducible(self):
+        """Test that a master seed fixes the rosters and every battle"""
+        first = GameState(seed=1234)
+        second = GameState(seed=1234)
+        
+        first_stats = [(h.attack, h.defense, h.max_hp) for h in first.get_alliance(2).players[7].initial_hero_pool]
+        second_stats = [(h.attack, h.defense, h.max_hp) for h in second.get_alliance(2).players[7].initial_hero_pool]
+        self.assertEqual(first_stats, second_stats)
+        self.assertEqual(GameState.from_dict(first.to_dict()).seed, 1234)
+        
+        battle = first.start_battle(first.get_alliance(1).get_all_available_hero_sets()[0], "S1-2")
+        battle.simulate_to_completion()
+        
+        # The battle can be replayed alone from the seed and its number
+        attacking_set = second.get_alliance(1).get_all_available_hero_sets()[0]
+        defending_set = second.get_stronghold("S1-2").get_all_defending_sets()[0]
+        replay = SummitBattle("replay", attacking_set, defending_set, "S1-2", rng=battle_rng(1234, 1))
+        replay.simulate_to_completion()
+        
+        self.assertEqual(replay.winner, battle.winner)
+        self.assertEqual(replay.current_step, battle.current_step)
+        self.assertEqual(replay.attacker_total_damage, battle.attacker_total_damage)
+
+    def test_deferred_battles_keep_timing(self):
+        """Test that deferred battles resolve on the same update as turn-by-turn ones"""
+        def play(deferred):
+            game_state = GameState(seed=42, deferred_battles=deferred)
+            sets = game_state.get_alliance(1).get_all_available_hero_sets()
+            timeline = []
+            for update in range(120):
+                if update in (0, 3, 4):
+                    game_state.start_battle(sets[update], "S1-2")
+                game_state.update_battles()
+                timeline.append((len(game_state.active_battles), list(game_state.event_log),
+                                 game_state.get_alliance(1).summit_showdown_points))
+            return game_state, timeline
+        
+        stepped, stepped_timeline = play(False)
+        deferred, deferred_timeline = play(True)
+        
+        self.assertEqual(deferred_timeline, stepped_timeline)
+        self.assertEqual(deferred.battle_counter, 3)
+        self.assertEqual(deferred.active_battles, [])
+        self.assertEqual(deferred.scheduled_battles, [])
+        self.assertEqual(deferred.pending_battles, {})
+
+    def test_compare_attacks(self):
+        """Test that attack options are compared with the points a win would give"""
+        attacking_set = self.game_state.get_alliance(1).get_all_available_hero_sets()[0]
+        result = self.game_state.compare_attacks(attacking_set, ["S1-2", "S1-3"], samples=32)
+
+        # S1-3 is not adjacent to alliance 1, so only S1-2 is compared
+        self.assertEqual(result["stronghold_ids"], ["S1-2"])
+        self.assertEqual(result["options"][0]["expected_points"],
+                         56 * result["options"][0]["win_probability"])  # 40 plus the first-defeat bonus
+        self.assertIsNone(self.game_state.compare_attacks(attacking_set, ["S1-3"]))
+
+    def test_compare_attacks_leaves_defenders_untouched(self):
+        """Test that comparing attacks builds no NPC team and changes no stronghold view"""
+        stronghold = self.game_state.strongholds["S1-2"]
+        pool = stronghold.npc_defense_teams
+        summary = self.game_state.get_stronghold_summary("S1-2")
+        revision = stronghold.revision
+        attacking_set = self.game_state.get_alliance(1).get_all_available_hero_sets()[0]
+        result = self.game_state.compare_attacks(attacking_set, ["S1-2"], samples=32)
+        
+        self.assertEqual(stronghold.revision, revision)
+        self.assertEqual(pool.untouched, stronghold.max_npc_teams)
+        self.assertEqual(pool.teams, [])
+        self.assertIs(self.game_state.get_stronghold_summary("S1-2"), summary)
+        
+        # The preview plays as the materialized team would
+        game_state = GameState(seed=self.game_state.seed)
+        game_state.strongholds["S1-2"].get_all_defending_sets()
+        attacking_set = game_state.get_alliance(1).get_all_available_hero_sets()[0]
+        self.assertEqual(game_state.compare_attacks(attacking_set, ["S1-2"], samples=32)["options"], result["options"])
+
+    def test_compact_hero_pools(self):
+        """Test that pools are stat arrays drawn as per-hero construction would draw them"""
+        player = self.game_state.get_alliance(2).players[3]
+        
+        # Alliance 2 draws players in order, so player 4's pool follows 150 heroes
+        rng = roster_rng(self.game_state.seed, 2)
+        heroes = [Hero(f"h{i}", rng=rng) for i in range(4 * 50)][150:]
+        self.assertEqual(player.hero_pool.tolist(), [[h.attack, h.defense, h.max_hp] for h in heroes])
+        
+        # Only the 30 selected heroes are Hero objects; the rest are rebuilt on request
+        selected = [hero for hero_set in player.selected_hero_sets for hero in hero_set.heroes]
+        self.assertEqual(len(selected), 30)
+        self.assertEqual(player.initial_hero_pool[:30], selected)
+        self.assertEqual(len(player.discarded_heroes), 20)
+        self.assertEqual(player.discarded_heroes[0].attack, int(player.hero_pool[30, 0]))
+
+    def test_lean_entities(self):
+        """Test that entities have no instance dict and format their ids when read"""
+        player = self.game_state.get_alliance(1).players[0]
+        hero_set = player.selected_hero_sets[1]
+        stronghold = self.game_state.strongholds["S1-2"]
+        battle = self.game_state.start_battle(hero_set, "S1-2")
+        for entity in (player, hero_set, hero_set.heroes[0], stronghold, battle):
+            self.assertFalse(hasattr(entity, "__dict__"))
+        
+        self.assertEqual(hero_set.id, "PA1_P1_Set2")
+        self.assertEqual(hero_set.heroes[0].id, "PA1_P1_H6")
+        self.assertEqual(hero_set.heroes[0].key, ("PA1_P1", 6))
+        self.assertEqual(battle.tape.hero_ids[0], tuple(hero.id for hero in hero_set.heroes))
+        self.assertEqual(battle.defending_set.heroes[4].id, "S1-2_NPC_1_H5")
+
+    def test_set_ownership_index(self):
+        """Test that owner and id lookups follow a player's reselection"""
+        alliance = self.game_state.get_alliance(3)
+        player = alliance.get_player("A3_P7")
+        old_set = player.selected_hero_sets[0]
+        self.assertIs(self.game_state._get_alliance_by_set(old_set), alliance)
+        self.assertIs(alliance.get_hero_set("PA3_P7_Set1"), old_set)
+        self.assertIsNone(alliance.get_hero_set("PA1_P7_Set1"))
+        
+        player.select_hero_sets(list(range(20, 50)))
+        new_set = player.selected_hero_sets[0]
+        self.assertIsNone(self.game_state._get_alliance_by_set(old_set))
+        self.assertIs(self.game_state._get_alliance_by_set(new_set), alliance)
+        self.assertIs(alliance.get_hero_set("PA3_P7_Set1"), new_set)
+        self.assertIsNone(self.game_state._get_alliance_by_set(self.game_state.strongholds["S1-2"].get_all_defending_sets()[0]))
+
+    def test_precomputed_npc_outcomes(self):
+        """Test that a precomputed outcome table ranks without simulating"""
+        game_state = GameState(seed=4, precompute_npc_outcomes=True)
+        table = game_state.npc_outcomes
+        self.assertEqual(table.win_probability.shape, (1200, 3))
+        self.assertTrue((table.sample_counts > 0).all())
+        
+        counts = table.sample_counts.copy()
+        ranked = game_state.rank_npc_attacks(2, 1)
+        np.testing.assert_array_equal(table.sample_counts, counts)
+        self.assertEqual(set(ranked), set(game_state.get_alliance(2).get_all_available_hero_sets()))
+        probabilities = [table.lookup(hero_set, 1)["win_probability"] for hero_set in ranked]
+        self.assertEqual(probabilities, sorted(probabilities, reverse=True))
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
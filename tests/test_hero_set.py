@@ -8,6 +8,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from game_simulator.entities.hero import Hero
 from game_simulator.entities.hero_set import HeroSet
+from game_simulator.entities.alliance import Alliance
+from game_simulator.rng import roster_rng
 
 class TestHeroSet(unittest.TestCase):
     
@@ -172,6 +174,33 @@ class TestHeroSet(unittest.TestCase):
         hero_set_str = str(self.hero_set)
         
         self.assertIn("4/5 alive", hero_set_str)
+    
+    def test_running_totals_propagate(self):
+        """Test that hero writes update set, player and alliance totals"""
+        alliance = Alliance(1, "Test Alliance", rng=roster_rng(0, 1))
+        player = alliance.players[2]
+        hero_set = player.selected_hero_sets[4]
+        hero = hero_set.heroes[1]
+        set_power = hero_set.total_attack + hero_set.get_total_hp()
+        player_power = player.get_total_power_rating()
+        alliance_power = alliance.get_total_power_rating()
+        
+        hero.take_damage(hero.max_hp + 100)
+        hero_set.heroes[2].current_hp = 10
+        lost = hero_set.total_attack + hero_set.get_total_hp() - set_power
+        self.assertAlmostEqual(player.get_total_power_rating(), player_power + lost)
+        self.assertAlmostEqual(alliance.get_total_power_rating(), alliance_power + lost)
+        self.assertEqual(hero_set.get_total_damage_potential(), sum(h.attack for h in hero_set.get_living_heroes()))
+        self.assertEqual(hero_set.get_average_defense(),
+                         sum(h.defense for h in hero_set.get_living_heroes()) / 4)
+        
+        hero.defense += 50  # Dead heroes do not count toward the living defense
+        self.assertEqual(hero_set.living_defense, sum(h.defense for h in hero_set.get_living_heroes()))
+        hero_set.heal_all_heroes()
+        self.assertEqual(hero_set.living_count, 5)
+        self.assertAlmostEqual(alliance.get_total_power_rating(), alliance_power)
+        self.assertAlmostEqual(alliance.total_hp, sum(h.current_hp for p in alliance.players
+                                                      for s in p.selected_hero_sets for h in s.heroes))
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
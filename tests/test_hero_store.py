@@ -0,0 +1,79 @@
+# tests/test_hero_store.py
+import unittest
+import sys
+import os
+import gc
+
+# Add the parent directory to the path so we can import game modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from game_simulator.entities.hero import Hero
+from game_simulator.entities.hero_set import HeroSet
+from game_simulator.entities.hero_store import HeroStore
+from game_simulator.entities.player import Player
+from game_simulator.simulation.batch_battle import pack_hero_sets
+
+class TestHeroStore(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.store = HeroStore(capacity=4)
+
+    def test_heroes_are_views(self):
+        """Test that hero attributes read and write the store's columns"""
+        hero = Hero("h1", is_npc=True, stronghold_level=2, store=self.store)
+
+        self.assertEqual(self.store.attack[hero.row], hero.attack)
+        self.store.current_hp[hero.row] = 100
+        self.assertEqual(hero.current_hp, 100)
+        self.assertIsInstance(hero.attack, int)
+        self.assertIsInstance(hero.current_hp, float)
+
+        hero.take_damage(500)
+        self.assertFalse(self.store.alive[hero.row])
+        self.assertEqual(self.store.current_hp[hero.row], 0)
+
+    def test_rows_are_reused(self):
+        """Test that the store grows with live heroes and recycles dropped ones"""
+        heroes = [Hero(f"h{i}", is_npc=True, store=self.store) for i in range(10)]
+        self.assertEqual(len(self.store), 10)
+        self.assertGreaterEqual(self.store.capacity, 10)
+        self.assertEqual(heroes[9].attack, heroes[0].attack)  # Growing kept the values
+
+        del heroes[5:]
+        gc.collect()
+        self.assertEqual(len(self.store), 5)
+        Hero("h10", is_npc=True, store=self.store)
+        self.assertEqual(self.store.size, 10)
+
+    def test_set_and_roster_aggregates(self):
+        """Test that array aggregates match the per-hero sums"""
+        hero_set = HeroSet("s1", "player_1", store=self.store)
+        hero_set.heroes[2].take_damage(1000)
+        self.assertEqual(hero_set.get_total_hp(), sum(hero.current_hp for hero in hero_set.heroes))
+        self.assertEqual(hero_set.get_max_hp(), sum(hero.max_hp for hero in hero_set.heroes))
+
+        player = Player("p1", 1, rng=np.random.default_rng(3))
+        self.assertEqual(player.get_total_power_rating(), 0)
+        player.select_hero_sets()
+        heroes = [hero for hero_set in player.selected_hero_sets for hero in hero_set.heroes]
+        self.assertEqual(len(player.hero_rows), 30)
+        self.assertAlmostEqual(player.get_total_power_rating(),
+                               sum(hero.attack + hero.current_hp for hero in heroes))
+
+    def test_pack_from_store(self):
+        """Test that packing reads the columns the heroes show"""
+        hero_sets = [HeroSet(f"s{i}", "player_1", store=self.store) for i in range(3)]
+        hero_sets[1].heroes[4].take_damage(10 ** 6)
+        attack, defense, hp, alive = pack_hero_sets(hero_sets)
+
+        self.assertEqual(attack.shape, (5, 3))
+        self.assertEqual(attack[0, 2], hero_sets[2].heroes[0].attack)
+        self.assertEqual(hp[4, 1], 0)
+        self.assertFalse(alive[4, 1])
+        self.assertTrue(alive[3, 1])
+
+if __name__ == '__main__':
+    unittest.main()
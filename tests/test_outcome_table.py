@@ -0,0 +1,111 @@
+# tests/test_outcome_table.py
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import game modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from game_simulator.entities.hero_set import HeroSet
+from game_simulator.simulation.outcome_table import NpcOutcomeTable, NPC_LEVELS
+from game_simulator.simulation.win_probability import wilson_interval
+
+class TestNpcOutcomeTable(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.hero_sets = [HeroSet(f"set_{i}", "player_1") for i in range(6)]
+        self.table = NpcOutcomeTable(self.hero_sets, rng=1)
+
+    def test_table_shape(self):
+        """Test one row per set and one column per NPC level"""
+        self.assertEqual(self.table.sample_counts.sum(), 0)  # Nothing simulated until filled or asked
+        self.table.fill()
+        self.assertTrue((self.table.sample_counts >= self.table.pilot_samples).all())
+        self.assertEqual(self.table.win_probability.shape, (6, len(NPC_LEVELS)))
+        self.assertTrue(((self.table.win_probability >= 0) & (self.table.win_probability <= 1)).all())
+
+        # Weaker NPCs are never harder to beat on average
+        means = self.table.win_probability.mean(axis=0)
+        self.assertGreaterEqual(means[0], means[2])
+
+    def test_lookup(self):
+        """Test looking up one set against one level"""
+        result = self.table.lookup(self.hero_sets[0], 1)
+
+        self.assertIn("win_probability", result)
+        self.assertIn("expected_attacker_damage", result)
+        self.assertIn("expected_defender_damage", result)
+        self.assertGreaterEqual(result["samples"], self.table.pilot_samples)
+
+    def test_refresh_recomputes_damaged_rows_only(self):
+        """Test that only sets whose HP changed are simulated again"""
+        self.table.fill()
+        self.assertEqual(self.table.refresh(), 0)
+
+        counts = self.table.sample_counts.copy()
+        probabilities = self.table.win_probability.copy()
+        for hero in self.hero_sets[2].heroes:
+            hero.take_damage(hero.max_hp + 100)
+
+        # The damaged row is simulated again at once, at every level
+        self.assertEqual(self.table.refresh(), 1)
+        self.assertTrue((self.table.win_probability[2] == 0.0).all())
+        self.assertTrue((self.table.sample_counts[2] > 0).all())
+        others = np.arange(6) != 2
+        np.testing.assert_array_equal(self.table.sample_counts[others], counts[others])
+        np.testing.assert_array_equal(self.table.win_probability[others], probabilities[others])
+        self.assertEqual(self.table.refresh(), 0)
+
+    def test_new_level_drops_levels_simulated_at_older_hp(self):
+        """Test that simulating a level at a new HP drops the row's other levels"""
+        table = NpcOutcomeTable(self.hero_sets, rng=2)
+        self.assertGreater(table.lookup(self.hero_sets[3], 1)["win_probability"], 0.0)
+        for hero in self.hero_sets[3].heroes:
+            hero.take_damage(hero.max_hp + 100)
+        self.assertEqual(table.lookup(self.hero_sets[3], 2)["win_probability"], 0.0)
+        self.assertEqual(table.lookup(self.hero_sets[3], 1)["win_probability"], 0.0)
+
+    def test_rank_sets(self):
+        """Test that ranking puts the most likely winner first"""
+        for hero in self.hero_sets[4].heroes:
+            hero.take_damage(hero.max_hp + 100)
+        self.table.refresh()
+
+        ranked = self.table.rank_sets(self.hero_sets, 1)
+
+        self.assertEqual(len(ranked), 6)
+        self.assertIs(ranked[-1], self.hero_sets[4])
+        probabilities = [self.table.lookup(hero_set, 1)["win_probability"] for hero_set in ranked]
+        self.assertEqual(probabilities, sorted(probabilities, reverse=True))
+
+    def test_unseen_and_reselected_sets(self):
+        """Test that sets the table was not built with are ranked, not dropped"""
+        newcomer = HeroSet("set_new", "player_1")
+        ranked = self.table.rank_sets(self.hero_sets + [newcomer], 1)
+        self.assertEqual(len(ranked), 7)
+        self.assertIn(newcomer, ranked)
+
+        # A new set under a known id takes over its row instead of reading the old outcomes
+        replacement = HeroSet("set_0", "player_1")
+        for hero in replacement.heroes:
+            hero.take_damage(hero.max_hp + 100)
+        self.assertEqual(self.table.lookup(replacement, 1)["win_probability"], 0.0)
+        self.assertIs(self.table.hero_sets[self.table.rows["set_0"]], replacement)
+
+    def test_uncertain_cells_keep_sampling(self):
+        """Test that a cell is only settled early when its interval is tight"""
+        self.table.fill()
+        counts = self.table.sample_counts
+        probabilities = self.table.win_probability
+        for row, col in zip(*np.nonzero(counts < self.table.samples)):
+            wins = int(round(probabilities[row, col] * counts[row, col]))
+            low, high = wilson_interval(wins, int(counts[row, col]))
+            self.assertLessEqual((high - low) / 2, self.table.target_half_width)
+        # A unanimous pilot alone does not settle a cell
+        self.assertTrue((counts > self.table.pilot_samples).all())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# tests/test_state_views.py
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add the parent directory to the path so we can import game modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_simulator.game_state import GameState
+from game_simulator.state_views import StateViews
+
+class TestStateViews(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.game_state = GameState(seed=3)
+        self.views = self.game_state.views
+
+    def test_views_kept_until_inputs_change(self):
+        """Test that status views are reused until a capture or score change"""
+        status = self.game_state.get_game_status()
+        again = self.game_state.get_game_status()
+        self.assertIs(again["stronghold_control"], status["stronghold_control"])
+        self.assertIs(again["alliance_scores"], status["alliance_scores"])
+
+        # Points change only the scores
+        self.game_state.get_alliance(2).summit_showdown_points += 40
+        again = self.game_state.get_game_status()
+        self.assertEqual(again["alliance_scores"][2], 40)
+        self.assertEqual(status["alliance_scores"][2], 0)
+        self.assertIs(again["stronghold_control"], status["stronghold_control"])
+
+        # A capture changes the control summary
+        target = self.game_state.strongholds["T1"].connections[0]
+        self.game_state.strongholds[target].controlling_alliance = 1
+        self.game_state.frontier.set_owner(target, 1)
+        again = self.game_state.get_game_status()
+        self.assertIn(target, again["stronghold_control"][1])
+        self.assertEqual(again["stronghold_control"]["neutral"], status["stronghold_control"]["neutral"] - 1)
+        self.assertEqual(again["stronghold_control"], StateViews(self.game_state).control_summary())
+
+    def test_stronghold_summary_follows_changes(self):
+        """Test that a summary is rebuilt when its stronghold changes or its protection runs out"""
+        target = self.game_state.strongholds["T1"].connections[0]
+        stronghold = self.game_state.strongholds[target]
+        summary = self.game_state.get_stronghold_summary(target)
+        self.assertIs(self.game_state.get_stronghold_summary(target), summary)
+        self.assertEqual(summary["active_npcs"], stronghold.max_npc_teams)
+
+        team = stronghold.get_all_defending_sets()[0]
+        stronghold.remove_defeated_npc_team(team, 1)
+        self.assertEqual(self.game_state.get_stronghold_summary(target)["active_npcs"], stronghold.max_npc_teams - 1)
+
+        stronghold.start_protection(20)
+        self.assertTrue(self.game_state.get_stronghold_summary(target)["is_protected"])
+        self.assertNotIn(target, self.game_state.get_attackable_strongholds(1))
+
+        # Protection ends on the clock, with no change to the stronghold
+        with mock.patch("time.time", return_value=stronghold.protection_end_time + 1):
+            self.assertFalse(self.game_state.get_stronghold_summary(target)["is_protected"])
+            self.assertIn(target, self.game_state.get_attackable_strongholds(1))
+
+    def test_summary_counts_npc_team_lost_in_draw(self):
+        """Test that an NPC team wiped out in a draw, and so left in its pool, is no longer counted"""
+        alliance = self.game_state.get_alliance(1)
+        target = self.game_state.get_attackable_strongholds(1)[0]
+        stronghold = self.game_state.strongholds[target]
+        battle = self.game_state.start_battle(alliance.get_all_available_hero_sets()[0], target)
+        before = self.game_state.get_stronghold_summary(target)["active_npcs"]
+
+        for hero in battle.attacking_set.heroes + battle.defending_set.heroes:
+            hero.take_damage(hero.max_hp + 100)
+        self.game_state.update_battles()
+        self.assertEqual(battle.winner, "draw")
+        self.assertIn(battle.defending_set, stronghold.npc_defense_teams.teams)
+
+        summary = self.game_state.get_stronghold_summary(target)
+        self.assertEqual(summary["active_npcs"], before - 1)
+        self.assertEqual(summary["active_npcs"], stronghold.count_active_npc_teams())
+        self.assertEqual(self.views.defender_counts(target)["npc"], before - 1)
+
+    def test_battle_status_follows_turns(self):
+        """Test that a battle's status is rebuilt after each turn"""
+        alliance = self.game_state.get_alliance(1)
+        target = self.game_state.get_attackable_strongholds(1)[0]
+        battle = self.game_state.start_battle(alliance.get_all_available_hero_sets()[0], target)
+        status = self.game_state.get_battle_status(battle)
+        self.assertIs(self.game_state.get_battle_status(battle), status)
+
+        while battle.is_active:
+            self.game_state.update_battles()
+            if battle.is_active:
+                self.assertEqual(self.game_state.get_battle_status(battle), battle.get_battle_status())
+        self.assertGreater(self.game_state.revision, 1)
+        self.assertNotIn(("battle", battle.id), self.views._views)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -219,5 +219,22 @@ class TestStronghold(unittest.TestCase):
         # Same as regular level 1 strongholds
         self.assertEqual(self.level1_stronghold.max_garrison_size, 9)
 
+    def test_npc_teams_materialize_when_fought(self):
+        """Test that untouched NPC teams stay counts until a battle needs one"""
+        pool = self.level2_stronghold.npc_defense_teams
+        self.assertEqual(pool.untouched, 12)
+        self.assertEqual(pool.teams, [])
+        self.assertEqual(self.level2_stronghold.count_active_npc_teams(), 12)
+
+        defending_sets = self.level2_stronghold.get_all_defending_sets()
+        self.assertEqual(len(defending_sets), 1)
+        self.assertEqual(defending_sets[0].id, "S10-10_NPC_1")
+        self.assertEqual(pool.untouched, 11)
+        self.assertIs(self.level2_stronghold.get_all_defending_sets()[0], defending_sets[0])
+
+        self.level2_stronghold.remove_defeated_npc_team(defending_sets[0], 1)
+        self.assertEqual(self.level2_stronghold.count_active_npc_teams(), 11)
+        self.assertEqual(self.level2_stronghold.get_all_defending_sets()[0].id, "S10-10_NPC_2")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
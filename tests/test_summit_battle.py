@@ -2,11 +2,13 @@
 import unittest
 import sys
 import os
+import copy
 
 # Add the parent directory to the path so we can import game modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from game_simulator.entities.summit_battle import SummitBattle
+from game_simulator.entities.summit_battle import SummitBattle, SubsetTable, LIVING_SLOTS, alive_mask, EXPECTED
+from game_simulator.entities.battle_log import LOG_NONE, LOG_OUTCOME
 from game_simulator.entities.hero_set import HeroSet
 from game_simulator.entities.hero import Hero
 
@@ -126,6 +128,63 @@ class TestSummitBattle(unittest.TestCase):
         self.assertFalse(battle2.is_active)
         self.assertEqual(battle2.winner, "defender")
     
+    def test_subset_table_lookups(self):
+        """Test that the alive-bitmask table matches the living hero calculations"""
+        table = SubsetTable(self.attacking_set, self.defending_set)
+        
+        # Kill defenders one at a time and compare against the set's own methods
+        for hero in self.defending_heroes[:4]:
+            hero.take_damage(hero.max_hp + 100)
+            mask = alive_mask(self.defending_set)
+            living = [self.defending_heroes[slot] for slot in LIVING_SLOTS[mask]]
+            avg_defense = self.defending_set.get_average_defense()
+            
+            self.assertEqual(living, self.defending_set.get_living_heroes())
+            self.assertEqual(table.average_defense[mask], avg_defense)
+            for slot, attacker in enumerate(self.attacking_heroes):
+                self.assertEqual(table.damage_per_hit[slot][mask], max(0, attacker.attack - avg_defense))
+    
+    def test_expected_mode(self):
+        """Test that expected-value battles finish without drawing random numbers"""
+        rng_state = self.battle.rng.bit_generator.state
+        
+        self.battle.simulate_to_completion(mode=EXPECTED)
+        
+        self.assertFalse(self.battle.is_active)
+        self.assertIn(self.battle.winner, ["attacker", "defender", "draw"])
+        self.assertLessEqual(self.battle.current_step, self.battle.max_steps)
+        self.assertEqual(self.battle.rng.bit_generator.state, rng_state)
+        self.assertIn("deals expected", self.battle.battle_log[1])
+    
+    def test_stalemate_short_circuit(self):
+        """Test that a battle neither side can damage jumps to the step limit"""
+        for hero in self.attacking_heroes + self.defending_heroes:
+            hero.attack = 1
+        
+        self.battle.execute_turn()
+        
+        self.assertFalse(self.battle.is_active)
+        self.assertEqual(self.battle.current_step, self.battle.max_steps)
+        self.assertEqual(self.battle.winner, "defender")
+    
+    def test_short_circuit_keeps_result(self):
+        """Test that skipping harmless turns reaches the same result as playing them"""
+        # The defenders cannot get through the attackers' defense
+        for hero in self.defending_heroes:
+            hero.attack = 1
+        full_battle = copy.deepcopy(self.battle)
+        full_battle.short_circuit = False
+        
+        self.battle.simulate_to_completion()
+        full_battle.simulate_to_completion()
+        
+        self.assertEqual(self.battle.winner, full_battle.winner)
+        self.assertEqual(self.battle.current_step, full_battle.current_step)
+        self.assertEqual(self.battle.attacker_total_damage, full_battle.attacker_total_damage)
+        self.assertEqual([h.current_hp for h in self.defending_heroes],
+                         [h.current_hp for h in full_battle.defending_set.heroes])
+        self.assertLess(len(self.battle.battle_log), len(full_battle.battle_log))
+    
     def test_battle_step_limit(self):
         """Test battle ending due to step limit"""
         # Advance battle to step limit
@@ -186,6 +245,24 @@ class TestSummitBattle(unittest.TestCase):
             log_entry = self.battle.battle_log[1]  # Skip initial entry
             self.assertIsInstance(log_entry, str)
     
+    def test_battle_log_levels(self):
+        """Test that lower verbosity levels keep fewer records"""
+        outcome_battle = SummitBattle("outcome", self.attacking_set, self.defending_set, "S1", log_level=LOG_OUTCOME)
+        outcome_battle.simulate_to_completion()
+        
+        # Start, result and end only
+        self.assertEqual(len(outcome_battle.battle_log), 3)
+        self.assertIn("Battle started", outcome_battle.battle_log[0])
+        self.assertIn("Battle ended", outcome_battle.get_recent_log_entries(1)[0])
+        
+        self.attacking_set.heal_all_heroes()
+        self.defending_set.heal_all_heroes()
+        silent_battle = SummitBattle("silent", self.attacking_set, self.defending_set, "S1", log_level=LOG_NONE)
+        silent_battle.simulate_to_completion()
+        
+        self.assertFalse(silent_battle.is_active)
+        self.assertEqual(silent_battle.battle_log, [])
+    
     def test_hero_set_hp_tracking(self):
         """Test tracking of hero set HP percentages"""
         # Calculate HP percentages manually
@@ -0,0 +1,63 @@
+# tests/test_surrogate.py
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the parent directory to the path so we can import game modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_simulator.entities.hero_set import HeroSet
+from game_simulator.simulation.batch_battle import BattleArrays
+from game_simulator.simulation.surrogate import SurrogateModel, calibration_report
+
+class TestSurrogateModel(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Train one small model for all tests"""
+        cls.model = SurrogateModel.train(battles=4000, rng=0)
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.attacking_set = HeroSet("atk", "player_1")
+        self.defending_set = HeroSet("def", "NPC", is_npc=True, stronghold_level=2)
+
+    def test_predict_matches_batch_path(self):
+        """Test that the scalar and vectorized predictions agree"""
+        probability = self.model.predict(self.attacking_set, self.defending_set)
+        battles = BattleArrays.from_hero_sets([self.attacking_set], [self.defending_set])
+
+        self.assertTrue(0 <= probability <= 1)
+        self.assertAlmostEqual(probability, self.model.predict_arrays(battles)[0])
+
+    def test_predicts_obvious_outcomes(self):
+        """Test that stronger NPC levels lower the predicted win probability"""
+        weak = HeroSet("weak", "NPC", is_npc=True, stronghold_level=1)
+        strong = HeroSet("strong", "NPC", is_npc=True, stronghold_level=3)
+
+        self.assertGreater(self.model.predict(self.attacking_set, weak), 0.9)
+        self.assertLess(self.model.predict(self.attacking_set, strong), 0.1)
+
+    def test_save_and_load(self):
+        """Test that a saved model predicts the same after loading"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "surrogate.npz")
+            self.model.save(path)
+            loaded = SurrogateModel.load(path)
+
+        self.assertAlmostEqual(loaded.predict(self.attacking_set, self.defending_set),
+                               self.model.predict(self.attacking_set, self.defending_set))
+
+    def test_calibration_report(self):
+        """Test the calibration report on held out battles"""
+        report = self.model.calibration(battles=1000, rng=1)
+
+        self.assertLess(report["brier"], 0.15)
+        self.assertEqual(sum(b["count"] for b in report["bins"]), 1000)
+
+        perfect = calibration_report([0.0, 1.0], [0, 1])
+        self.assertEqual(perfect["brier"], 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
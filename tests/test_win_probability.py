@@ -0,0 +1,114 @@
+# tests/test_win_probability.py
+import unittest
+import sys
+import os
+import math
+
+# Add the parent directory to the path so we can import game modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_simulator.entities.hero_set import HeroSet
+from game_simulator.simulation.win_probability import WinProbabilityEstimator, wilson_interval, compare_attacks
+
+class TestWinProbability(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.attacking_set = HeroSet("atk", "player_1")
+        self.defending_set = HeroSet("def", "NPC", is_npc=True, stronghold_level=2)
+        self.estimator = WinProbabilityEstimator(cache_size=2, batch_size=128, max_samples=1024, rng=1)
+
+    def test_estimate_fields(self):
+        """Test that an estimate has a probability inside its interval"""
+        result = self.estimator.estimate(self.attacking_set, self.defending_set)
+
+        low, high = result["confidence_interval"]
+        self.assertTrue(0 <= low <= result["win_probability"] <= high <= 1)
+        self.assertGreater(result["expected_attacker_damage"], 0)
+        self.assertGreater(result["expected_defender_damage"], 0)
+        self.assertLessEqual(result["samples"], 1024)
+
+        # Estimating never touches the real heroes
+        self.assertEqual(self.defending_set.get_total_hp(), self.defending_set.get_max_hp())
+
+    def test_memoized_until_state_changes(self):
+        """Test that repeat queries hit the cache and damage invalidates them"""
+        first = self.estimator.estimate(self.attacking_set, self.defending_set)
+        second = self.estimator.estimate(self.attacking_set, self.defending_set)
+        self.assertEqual(first, second)
+        self.assertEqual(self.estimator.hits, 1)
+
+        self.defending_set.heroes[0].take_damage(1000)
+        self.estimator.estimate(self.attacking_set, self.defending_set)
+        self.assertEqual(self.estimator.misses, 2)
+
+    def test_cache_is_bounded(self):
+        """Test that the least recently used entry is evicted"""
+        for level in (1, 2, 3):
+            defenders = HeroSet(f"def_{level}", "NPC", is_npc=True, stronghold_level=level)
+            self.estimator.estimate(self.attacking_set, defenders)
+
+        self.assertEqual(len(self.estimator), 2)
+
+    def test_certain_outcome_stops_early(self):
+        """Test that a decided matchup needs only one batch"""
+        for hero in self.defending_set.heroes:
+            hero.take_damage(hero.max_hp + 100)
+
+        result = self.estimator.estimate(self.attacking_set, self.defending_set)
+
+        self.assertEqual(result["win_probability"], 1.0)
+        self.assertEqual(result["samples"], 128)
+
+    def test_wilson_interval(self):
+        """Test the interval of a known proportion"""
+        low, high = wilson_interval(50, 100)
+        self.assertAlmostEqual((low + high) / 2, 0.5)
+        self.assertAlmostEqual(high - low, 0.1923, places=3)
+
+    def test_compare_identical_options(self):
+        """Test that common random numbers give identical options no difference at all"""
+        twin = HeroSet("def_twin", "NPC", is_npc=True, stronghold_level=2)
+        result = compare_attacks([(self.attacking_set, self.defending_set), (self.attacking_set, twin)],
+                                 samples=64, rng=1)
+
+        self.assertEqual(result["options"][0], result["options"][1])
+        self.assertEqual(result["differences"][1 - result["best"]]["expected_points_interval"], (0.0, 0.0))
+        self.assertEqual(result["samples"], 64)
+
+    def test_bad_sample_counts(self):
+        """Test that sample counts that cannot give an estimate are refused"""
+        with self.assertRaises(ValueError):
+            WinProbabilityEstimator(max_samples=0)
+        with self.assertRaises(ValueError):
+            WinProbabilityEstimator(batch_size=0)
+        with self.assertRaises(ValueError):
+            compare_attacks([(self.attacking_set, self.defending_set)], samples=0)
+        with self.assertRaises(ValueError):
+            compare_attacks([], samples=8)
+
+        # An odd count is rounded up to whole antithetic pairs
+        result = compare_attacks([(self.attacking_set, self.defending_set)], samples=1, rng=1)
+        self.assertEqual(result["samples"], 2)
+        self.assertFalse(math.isnan(result["options"][0]["win_probability"]))
+
+    def test_compare_reduces_variance(self):
+        """Test that pairing separates close options with fewer battles"""
+        stronger = HeroSet("def_l3", "NPC", is_npc=True, stronghold_level=3)
+        weaker = HeroSet("def_l3_hurt", "NPC", is_npc=True, stronghold_level=3)
+        weaker.heroes[0].take_damage(weaker.heroes[0].max_hp // 5)
+        # A mirror of the full-HP team wins about half the time
+        attackers = HeroSet("atk_mirror", "player_1")
+        for hero, npc in zip(attackers.heroes, stronger.heroes):
+            hero.attack, hero.defense, hero.max_hp, hero.current_hp = npc.attack, npc.defense, npc.max_hp, npc.max_hp
+
+        result = compare_attacks([(attackers, stronger, 80), (attackers, weaker, 80)], samples=512, rng=1)
+        difference = result["differences"][0]
+
+        self.assertEqual(result["best"], 1)
+        self.assertLessEqual(difference["expected_points"], 0)
+        self.assertGreater(difference["variance_reduction"], 3)
+        self.assertIsNone(result["differences"][1]["variance_reduction"])
+
+if __name__ == '__main__':
+    unittest.main()